@@ -0,0 +1,96 @@
+"""
+Helper for the benchmarks that run the integration itself: a minimal
+in-process Home Assistant (no HTTP server, no frontend, no recorder) in a
+temporary config directory, loading this integration from the repository's
+custom_components, and a config entry pointing at a (fake) hub.
+
+The integration is set up exactly as in production (async_setup_entry:
+SinumHubCoordinator, the platforms' _entities_for, the entity registry and
+the state machine), so these benchmarks need the homeassistant package
+(see hacs.json for the minimum version).
+"""
+import contextlib
+import logging
+import sys
+import tempfile
+from types import MappingProxyType
+
+from homeassistant import config_entries, loader
+from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.helpers import (
+    area_registry,
+    category_registry,
+    device_registry,
+    entity,
+    entity_registry,
+    floor_registry,
+    issue_registry,
+    label_registry,
+    translation,
+)
+
+from _loader import INTEGRATION_DIR
+
+DOMAIN = "sinum"
+
+# A HA a custom_components csomagból tölti be az integrációt: a repó saját könyvtárából
+sys.path.insert(0, str(INTEGRATION_DIR.parent.parent))
+
+# A "nem tesztelt egyedi integráció" figyelmeztetés ne keveredjen a kimenetbe
+logging.getLogger("homeassistant.loader").setLevel(logging.ERROR)
+
+
+@contextlib.asynccontextmanager
+async def running_hass(config_dir: str | None = None):
+    """
+    Egy futó HomeAssistant példány; config_dir nélkül ideiglenes könyvtárban.
+    Ugyanazzal a config_dir-rel újraindítva a mentett adatok (Store) megmaradnak.
+    """
+    with contextlib.ExitStack() as stack:
+        if config_dir is None:
+            config_dir = stack.enter_context(tempfile.TemporaryDirectory())
+        hass = HomeAssistant(config_dir)
+        hass.config.skip_pip = True
+        hass.config_entries = config_entries.ConfigEntries(hass, {})
+        entity.async_setup(hass)
+        loader.async_setup(hass)
+        translation.async_setup(hass)
+        for registry in (area_registry, category_registry, device_registry, entity_registry,
+                         floor_registry, issue_registry, label_registry):
+            await registry.async_load(hass)
+        hass.set_state(CoreState.running)
+        try:
+            yield hass
+        finally:
+            for entry in hass.config_entries.async_entries(DOMAIN):
+                await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_stop(force=True)
+
+
+async def async_setup_hub(hass: HomeAssistant, address: str, token: str = "bench", entry_id: str | None = None,
+                          options: dict | None = None, pref_disable_polling: bool = False) -> config_entries.ConfigEntry:
+    """
+    A hub config entry-jének felvétele és beállítása (mint a config flow után).
+    Azonos entry_id-vel a korábban mentett eszközlista (Store) is betöltődik.
+    """
+    entry = config_entries.ConfigEntry(
+        data={"ip": address, "token": token},
+        discovery_keys=MappingProxyType({}),
+        domain=DOMAIN,
+        entry_id=entry_id,
+        minor_version=1,
+        options=options or {},
+        pref_disable_polling=pref_disable_polling,
+        source=config_entries.SOURCE_USER,
+        title=address,
+        unique_id=address,
+        version=1,
+    )
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    return entry
+
+
+def entity_count(hass: HomeAssistant) -> int:
+    """A létrehozott entitások száma (a példányban csak ez az integráció fut)."""
+    return len(hass.states.async_entity_ids())
@@ -0,0 +1,46 @@
+"""
+Helpers for the benchmark scripts: the fake hub (tools/fake_hub.py) in a
+separate process, so the CPU numbers only contain the integration side.
+"""
+import asyncio
+import socket
+import sys
+from pathlib import Path
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+
+from fake_hub import FakeHub, generate_devices  # noqa: E402
+
+
+def serve_hub(port: int, devices: int, latency: float):
+    """A multiprocessing.Process célfüggvénye: egy fake hub a megadott porton."""
+    from aiohttp import web
+
+    hub = FakeHub(generate_devices(devices), latency=latency, event_interval=0)
+    web.run_app(hub.app, host="127.0.0.1", port=port, access_log=None, print=None, handle_signals=False)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_hub(address: str):
+    async with aiohttp.ClientSession() as session:
+        for _ in range(200):
+            try:
+                async with session.get(f"http://{address}/_stats") as resp:
+                    if resp.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.05)
+    raise RuntimeError(f"fake hub at {address} did not start")
+
+
+def percentile(values: list, percent: int) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))]
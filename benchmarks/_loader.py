@@ -0,0 +1,20 @@
+"""
+Helper for the benchmark scripts: makes the integration importable as the
+``sinum`` package without running its ``__init__.py``.
+
+Only the Home Assistant independent modules (api, snapshot, scheduler, ...)
+can be imported this way, which is exactly what the benchmarks exercise.
+"""
+import sys
+import types
+from pathlib import Path
+
+INTEGRATION_DIR = Path(__file__).resolve().parent.parent / "custom_components" / "sinum"
+
+
+def load_integration(package: str = "sinum") -> types.ModuleType:
+    if package not in sys.modules:
+        module = types.ModuleType(package)
+        module.__path__ = [str(INTEGRATION_DIR)]
+        sys.modules[package] = module
+    return sys.modules[package]
@@ -0,0 +1,114 @@
+"""
+Micro-benchmark: decoding the /devices/* payloads.
+
+Compares the old decode loop of get_virtual_devices (try up to five
+encodings with the stdlib json on every poll) with SinumAPI._decode_json
+(strict UTF-8 first, a non-UTF-8 encoding cached per endpoint, optional
+orjson/msgspec backend).
+
+Usage: python benchmarks/bench_json_decode.py [--devices 500] [--rounds 200] [--json]
+"""
+import argparse
+import json
+import time
+
+from _loader import load_integration
+
+load_integration()
+
+from sinum import api as api_module  # noqa: E402
+from sinum.api import SinumAPI  # noqa: E402
+
+NAMES = ("Nappali", "Hálószoba", "Fürdőszoba", "Konyha", "Gyerekszoba", "Előszoba", "Dolgozószoba")
+TYPES = ("thermostat", "relay", "temperature_sensor", "blind_controller", "rgb_controller", "motion_sensor")
+
+
+def build_payload(devices: int) -> dict:
+    data = []
+    for i in range(devices):
+        data.append({
+            "id": i,
+            "name": f"{NAMES[i % len(NAMES)]} {TYPES[i % len(TYPES)]} {i}",
+            "type": TYPES[i % len(TYPES)],
+            "room_id": i % 12,
+            "temperature": 215 + i % 30,
+            "humidity": 450 + i % 100,
+            "target_temperature": 220,
+            "target_temperature_minimum": 50,
+            "target_temperature_maximum": 350,
+            "mode": "heating",
+            "state": bool(i % 2),
+            "current_opening": i % 101,
+            "led_color": "#0072c3",
+            "brightness": 80,
+            "battery": 90,
+            "address": f"{i:08x}",
+            "software_version": "1.4.2",
+        })
+    return {"data": data}
+
+
+def legacy_decode(raw: bytes):
+    for enc in ("utf-8", "utf-8-sig", "latin-1", "cp1250", "cp1252"):
+        try:
+            return json.loads(raw.decode(enc))
+        except Exception:
+            continue
+    return None
+
+
+def cached_decoder():
+    api = SinumAPI("127.0.0.1", "bench")
+    return lambda raw: api._decode_json("virtual", raw)
+
+
+def timed(func, raw: bytes, rounds: int) -> float:
+    func(raw)  # warm-up (és a kódolás eltárolása)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func(raw)
+    return (time.perf_counter() - started) / rounds * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--devices", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--json", action="store_true", help="machine-readable output")
+    args = parser.parse_args()
+
+    text = json.dumps(build_payload(args.devices), ensure_ascii=False)
+    payloads = {
+        "utf-8": text.encode("utf-8"),
+        "utf-8-sig": text.encode("utf-8-sig"),
+        "cp1250": text.encode("cp1250"),
+    }
+
+    fast_backend = (api_module.json_loads, api_module.JSON_BACKEND)
+    results = []
+    for encoding, raw in payloads.items():
+        row = {"encoding": encoding, "bytes": len(raw), "backend": fast_backend[1]}
+        row["legacy_ms"] = timed(legacy_decode, raw, args.rounds)
+
+        api_module.json_loads, api_module.JSON_BACKEND = json.loads, "json"
+        row["cached_stdlib_ms"] = timed(cached_decoder(), raw, args.rounds)
+        api_module.json_loads, api_module.JSON_BACKEND = fast_backend
+        row["cached_fast_ms"] = timed(cached_decoder(), raw, args.rounds)
+        row["speedup"] = row["legacy_ms"] / row["cached_fast_ms"]
+        results.append(row)
+
+    if args.json:
+        print(json.dumps({"devices": args.devices, "rounds": args.rounds, "results": results}, indent=2))
+        return
+
+    print(f"{args.devices} devices, {args.rounds} rounds, fast backend: {fast_backend[1]}")
+    print(f"{'encoding':<10} {'bytes':>8} {'legacy':>10} {'cached':>10} {'cached+fast':>12} {'speedup':>8}")
+    for row in results:
+        print(
+            f"{row['encoding']:<10} {row['bytes']:>8} {row['legacy_ms']:>8.2f}ms "
+            f"{row['cached_stdlib_ms']:>8.2f}ms {row['cached_fast_ms']:>10.2f}ms {row['speedup']:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
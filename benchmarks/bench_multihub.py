@@ -0,0 +1,160 @@
+"""
+Benchmark: many SINUM hubs polled by one Home Assistant instance.
+
+Every hub gets its own SinumAPI with its own RequestBudget (--rate), as in
+async_setup_entry, and all budgets share one SharedRequestLimit (the global
+concurrency cap, --cap). In one round every hub polls all of its endpoints at the same
+time (the worst case: every coordinator fires together), as the coordinators do:
+
+  - SinumAPI.fetch_devices(("virtual", "sbus", "wtp"))
+  - SinumSnapshot.from_lists(..., previous=...)
+
+The fake hubs (tools/fake_hub.py) run in a separate process, one port each,
+with --latency of delay per request, so the numbers only contain the
+integration side.
+
+Reported per hub count (machine-readable with --json):
+  round_ms        wall time until every hub finished its round (mean / p95)
+  cpu_ms          CPU time of this process per round
+  hub_ms          time of a single hub's poll within the round (mean / max)
+  requests_per_s  HTTP requests per second of round time
+  peak_in_flight  most requests running at once across all hubs (<= --cap)
+
+Usage: python benchmarks/bench_multihub.py [--hubs 1 5 10 20] [--devices 200] [--cap 16] [--rate 100] [--json]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from _loader import load_integration
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+load_integration()
+
+from _hub import free_port, percentile, wait_for_hub  # noqa: E402
+from fake_hub import FakeHub, generate_devices  # noqa: E402
+from sinum.api import SinumAPI  # noqa: E402
+from sinum.limiter import RequestBudget, SharedRequestLimit  # noqa: E402
+from sinum.scheduler import ENDPOINTS  # noqa: E402
+from sinum.snapshot import SinumSnapshot  # noqa: E402
+
+DEFAULT_HUBS = (1, 5, 10, 20)
+
+
+def _serve_hubs(ports: list, devices: int, latency: float):
+    async def _run():
+        runners = []
+        for index, port in enumerate(ports):
+            hub = FakeHub(generate_devices(devices, seed=index), latency=latency, event_interval=0)
+            runners.append(await hub.start(port=port))
+        await asyncio.Event().wait()
+
+    asyncio.run(_run())
+
+
+async def poll_hub(api: SinumAPI, previous) -> tuple[SinumSnapshot, float]:
+    started = time.perf_counter()
+    lists = await api.fetch_devices(ENDPOINTS)
+    snapshot = SinumSnapshot.from_lists(lists["virtual"], lists["sbus"], lists["wtp"], previous=previous)
+    return snapshot, time.perf_counter() - started
+
+
+async def bench_hubs(hubs: int, devices: int, rounds: int, latency: float, cap: int, rate: float) -> dict:
+    ports = [free_port() for _ in range(hubs)]
+    server = multiprocessing.Process(target=_serve_hubs, args=(ports, devices, latency), daemon=True)
+    server.start()
+    try:
+        for port in ports:
+            await wait_for_hub(f"127.0.0.1:{port}")
+        shared = SharedRequestLimit(cap)
+        apis = [
+            SinumAPI(f"127.0.0.1:{port}", "bench", budget=RequestBudget(rate=rate, shared=shared))
+            for port in ports
+        ]
+
+        # Első kör: kapcsolatfelvétel, kódolás-detektálás (nem mérjük)
+        results = await asyncio.gather(*(poll_hub(api, None) for api in apis))
+        snapshots = [snapshot for snapshot, _ in results]
+        shared.peak_in_flight = 0
+
+        round_times, cpus, hub_times = [], [], []
+        for _ in range(rounds):
+            wall_started, cpu_started = time.perf_counter(), time.process_time()
+            results = await asyncio.gather(*(
+                poll_hub(api, previous) for api, previous in zip(apis, snapshots)
+            ))
+            round_times.append(time.perf_counter() - wall_started)
+            cpus.append(time.process_time() - cpu_started)
+            snapshots = [snapshot for snapshot, _ in results]
+            hub_times.extend(duration for _, duration in results)
+
+        errors = sum(api.fetch_errors for api in apis)
+        for api in apis:
+            await api.async_close()
+    finally:
+        server.terminate()
+        server.join()
+
+    round_mean = statistics.fmean(round_times)
+    return {
+        "hubs": hubs,
+        "devices_per_hub": devices,
+        "rounds": rounds,
+        "round_ms": {"mean": round_mean * 1000, "p95": percentile(round_times, 95) * 1000},
+        "cpu_ms": {"mean": statistics.fmean(cpus) * 1000, "p95": percentile(cpus, 95) * 1000},
+        "hub_ms": {"mean": statistics.fmean(hub_times) * 1000, "max": max(hub_times) * 1000},
+        "requests_per_s": hubs * len(ENDPOINTS) / round_mean,
+        "peak_in_flight": shared.peak_in_flight,
+        "waited_for_cap": shared.waited,
+        "fetch_errors": errors,
+    }
+
+
+async def main_async(args) -> list:
+    results = []
+    for hubs in args.hubs:
+        results.append(await bench_hubs(hubs, args.devices, args.rounds, args.latency / 1000, args.cap, args.rate))
+        if not args.json:
+            row = results[-1]
+            print(
+                f"{row['hubs']:>4} hubs x {row['devices_per_hub']} dev | "
+                f"round {row['round_ms']['mean']:>8.1f}ms (p95 {row['round_ms']['p95']:>8.1f}) | "
+                f"cpu {row['cpu_ms']['mean']:>7.1f}ms | hub {row['hub_ms']['mean']:>7.1f}ms "
+                f"(max {row['hub_ms']['max']:>7.1f}) | {row['requests_per_s']:>7.1f} req/s | "
+                f"peak in flight {row['peak_in_flight']}/{args.cap}"
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hubs", type=int, nargs="+", default=list(DEFAULT_HUBS))
+    parser.add_argument("--devices", type=int, default=200, help="devices per hub")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=50.0, help="fake hub response delay in ms")
+    parser.add_argument("--cap", type=int, default=16, help="global concurrency cap (SharedRequestLimit)")
+    parser.add_argument("--rate", type=float, default=100.0,
+                        help="per-hub request budget (requests/s); the rounds run back to back, "
+                             "so the default of the integration would throttle them")
+    parser.add_argument("--json", action="store_true", help="machine-readable output")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    if args.json:
+        print(json.dumps({
+            "benchmark": "multi_hub",
+            "python": sys.version.split()[0],
+            "latency_ms": args.latency,
+            "cap": args.cap,
+            "rate": args.rate,
+            "results": results,
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
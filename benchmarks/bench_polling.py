@@ -0,0 +1,204 @@
+"""
+Benchmark: one polling cycle of the hub coordinator against the local fake hub.
+
+For every device count the fake hub (tools/fake_hub.py) runs in a separate
+process, so the CPU numbers only contain the integration side. The
+integration is set up in a minimal in-process Home Assistant (see _hass.py)
+exactly as in production, and each cycle is one SinumHubCoordinator refresh:
+
+  - SinumHubCoordinator._async_poll: SinumAPI.fetch_devices(endpoints)
+    (one HTTP request per endpoint), SinumSnapshot.from_lists(..., previous=...)
+    (freeze + index + diff), inventory tracking, scheduler bookkeeping
+  - the coordinator's listeners: every entity the platforms created with
+    their _entities_for; SinumEntity._handle_coordinator_update skips unchanged
+    devices and writes the state of the changed ones into the state machine
+
+Every cycle polls all endpoints (AdaptivePollScheduler.mark_due, as a bulk
+command's refresh does), so the cycles are comparable. The scheduled polls
+are switched off (pref_disable_polling) and the push event stream is stopped,
+so neither delivers the changes outside the measured cycles. Between cycles
+--change-rate of the devices are modified on the hub (not timed). The
+request budget of the hub is --rate requests per second (the entry option).
+
+Reported per device count (machine-readable with --json):
+  wall_ms        wall time per cycle (mean / p95)
+  cpu_ms         CPU time of this process (the event loop) per cycle
+  requests_per_s HTTP requests per second of cycle time
+  state_writes   entity state writes per cycle (the rest are suppressed)
+  peak_kib       peak memory of one cycle (tracemalloc)
+  lookup_us      one snapshot.find() vs one linear scan of the old
+                 _find_device_in_coordinator, per lookup
+
+Requires the homeassistant package.
+
+Usage: python benchmarks/bench_polling.py [--devices 10 100 1000 5000] [--cycles 20] [--rate 100] [--json]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+import aiohttp
+
+from _hass import DOMAIN, async_setup_hub, entity_count, running_hass
+from _hub import free_port, percentile, serve_hub, wait_for_hub
+
+DEFAULT_COUNTS = (10, 100, 1000, 5000)
+# sinum.scheduler.ENDPOINTS
+ENDPOINTS = ("virtual", "sbus", "wtp")
+
+
+def legacy_find(snapshot, device_class: str, device_id):
+    """A korábbi _find_device_in_coordinator: lineáris keresés."""
+    for dev in snapshot.virtual + snapshot.sbus_wtp:
+        if dev.get("class") == device_class and dev.get("id") == device_id:
+            return dev
+    return None
+
+
+async def _mutate(session: aiohttp.ClientSession, address: str, keys: list, tick: int):
+    """Néhány eszköz módosítása a hubon két ciklus között (nem mérjük)."""
+    await asyncio.gather(*(
+        session.patch(f"http://{address}/api/v1/devices/{device_class}/{device_id}", json={"bench_tick": tick})
+        for device_class, device_id in keys
+    ))
+
+
+# ---------- mérés ----------
+
+async def run_cycle(coordinator) -> int:
+    """Egy lekérdezés minden végponton; az entitások állapotírásainak száma."""
+    writes = coordinator.state_writes
+    coordinator.scheduler.mark_due(ENDPOINTS)
+    await coordinator.async_refresh()
+    return coordinator.state_writes - writes
+
+
+def _lookup_us(snapshot, keys: list, func, limit: int) -> float:
+    sample = keys[:limit] or [("virtual", -1)]
+    started = time.perf_counter()
+    for key in sample:
+        func(snapshot, *key)
+    return (time.perf_counter() - started) / len(sample) * 1e6
+
+
+async def bench_count(devices: int, cycles: int, change_rate: float, latency: float, rate: float) -> dict:
+    port = free_port()
+    address = f"127.0.0.1:{port}"
+    hub = multiprocessing.Process(target=serve_hub, args=(port, devices, latency), daemon=True)
+    hub.start()
+    try:
+        await wait_for_hub(address)
+        async with running_hass() as hass:
+            # Beállítás és első lekérdezés: kapcsolatfelvétel, kódolás-detektálás, entitások (nem mérjük)
+            entry = await async_setup_hub(hass, address, options={"max_requests_per_second": rate},
+                                          pref_disable_polling=True)
+            coordinator = hass.data[DOMAIN][entry.entry_id]
+            # Az eseményfolyam leállítása frissítést kér; azt elvetjük, hogy ne fusson a mért ciklusok közé
+            await coordinator.event_stream.async_stop()
+            await hass.async_block_till_done()
+            coordinator._debounced_refresh.async_cancel()
+            # Az entitások első frissítése mindig ír (elérhetőség), ezt sem mérjük
+            await run_cycle(coordinator)
+            api = coordinator.api
+            entities = entity_count(hass)
+            all_keys = list(coordinator.data._index)
+            entity_keys = [(entity._device_class, entity._device_id) for entity in coordinator.device_entities()]
+            per_cycle = max(1, round(len(all_keys) * change_rate)) if change_rate > 0 else 0
+            rng = random.Random(devices)
+
+            walls, cpus, writes = [], [], []
+            requests = api.metrics.totals()["requests"]
+            async with aiohttp.ClientSession() as control:
+                for tick in range(cycles):
+                    if per_cycle:
+                        await _mutate(control, address, rng.sample(all_keys, min(per_cycle, len(all_keys))), tick)
+                    wall_started, cpu_started = time.perf_counter(), time.process_time()
+                    cycle_writes = await run_cycle(coordinator)
+                    walls.append(time.perf_counter() - wall_started)
+                    cpus.append(time.process_time() - cpu_started)
+                    writes.append(cycle_writes)
+                requests = api.metrics.totals()["requests"] - requests
+
+                # Memóriacsúcs egy külön ciklusban (a tracemalloc lassít, ezért nem az időmérés alatt)
+                if per_cycle:
+                    await _mutate(control, address, rng.sample(all_keys, min(per_cycle, len(all_keys))), cycles)
+                tracemalloc.start()
+                await run_cycle(coordinator)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+            snapshot = coordinator.data
+            fetch_errors = api.fetch_errors
+    finally:
+        hub.terminate()
+        hub.join()
+
+    wall_mean = statistics.fmean(walls)
+    return {
+        "devices": devices,
+        "entities": entities,
+        "cycles": cycles,
+        "changed_per_cycle": per_cycle,
+        "wall_ms": {"mean": wall_mean * 1000, "p95": percentile(walls, 95) * 1000},
+        "cpu_ms": {"mean": statistics.fmean(cpus) * 1000, "p95": percentile(cpus, 95) * 1000},
+        "requests_per_s": requests / sum(walls),
+        "state_writes": {"mean": statistics.fmean(writes), "max": max(writes)},
+        "peak_kib": peak / 1024,
+        "fetch_errors": fetch_errors,
+        "lookup_us": {
+            "snapshot_find": _lookup_us(snapshot, entity_keys, type(snapshot).find, 5000),
+            "linear_scan": _lookup_us(snapshot, entity_keys, legacy_find, 200),
+        },
+    }
+
+
+async def main_async(args) -> list:
+    results = []
+    for devices in args.devices:
+        results.append(await bench_count(devices, args.cycles, args.change_rate, args.latency / 1000, args.rate))
+        if not args.json:
+            _print_row(results[-1])
+    return results
+
+
+def _print_row(row: dict):
+    print(
+        f"{row['devices']:>6} dev {row['entities']:>6} ent | "
+        f"wall {row['wall_ms']['mean']:>8.2f}ms (p95 {row['wall_ms']['p95']:>8.2f}) | "
+        f"cpu {row['cpu_ms']['mean']:>8.2f}ms | {row['requests_per_s']:>7.1f} req/s | "
+        f"writes {row['state_writes']['mean']:>7.1f} | peak {row['peak_kib']:>8.0f} KiB | "
+        f"find {row['lookup_us']['snapshot_find']:.2f}us vs scan {row['lookup_us']['linear_scan']:.1f}us"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--devices", type=int, nargs="+", default=list(DEFAULT_COUNTS))
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--change-rate", type=float, default=0.01,
+                        help="share of devices modified between cycles")
+    parser.add_argument("--latency", type=float, default=0.0, help="fake hub response delay in ms")
+    parser.add_argument("--rate", type=float, default=100.0, help="request budget of the hub, requests per second")
+    parser.add_argument("--json", action="store_true", help="machine-readable output")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    if args.json:
+        print(json.dumps({
+            "benchmark": "polling_cycle",
+            "python": sys.version.split()[0],
+            "change_rate": args.change_rate,
+            "latency_ms": args.latency,
+            "rate": args.rate,
+            "results": results,
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
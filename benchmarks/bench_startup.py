@@ -0,0 +1,129 @@
+"""
+Benchmark: time to first entity at integration startup.
+
+The integration is set up in a minimal in-process Home Assistant (see
+_hass.py) exactly as in production: async_setup_entry, then the platforms
+create their entities with their _entities_for. Timed from adding the config
+entry until the setup returned with the entities in the state machine.
+
+  cold     no stored inventory: async_config_entry_first_refresh has to reach
+           the hub (SinumAPI.fetch_devices -> SinumSnapshot.from_lists) first
+  restored the inventory the coordinator saved in the previous run (HA Store,
+           written when Home Assistant stops) is loaded from disk; the hub is
+           reconciled in the background (restored_refreshed_ms: until that
+           first refresh finished)
+  offline  like cold, but the hub does not answer (the entry goes to setup
+           retry, ConfigEntryNotReady); the restored path is unaffected
+
+The fake hub (tools/fake_hub.py) runs in-process with --latency of delay per request.
+Requires the homeassistant package.
+
+Usage: python benchmarks/bench_startup.py [--devices 10 100 1000 5000] [--latency 300] [--json]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from _hass import DOMAIN, async_setup_hub, entity_count, running_hass
+from _hub import FakeHub, generate_devices
+
+DEFAULT_COUNTS = (10, 100, 1000, 5000)
+
+
+async def start(address: str, config_dir: str | None = None, entry_id: str | None = None) -> tuple[float, int, float]:
+    """
+    Egy indulás: a config entry beállításáig eltelt idő, a létrehozott entitások
+    száma, és az idő, amíg a hub adatai is megérkeztek (a mentett adatból indulva
+    ez a háttérben fut; megvárjuk, mielőtt a HA leáll).
+    """
+    async with running_hass(config_dir) as hass:
+        started = time.perf_counter()
+        entry = await async_setup_hub(hass, address, entry_id=entry_id)
+        elapsed, entities = time.perf_counter() - started, entity_count(hass)
+        coordinator = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+        if coordinator is None:
+            return elapsed, entities, elapsed
+        if coordinator.restored_from_store:
+            refreshed = hass.loop.create_future()
+            unsubscribe = coordinator.async_add_listener(lambda: refreshed.done() or refreshed.set_result(None))
+            await asyncio.wait_for(refreshed, 60)
+            unsubscribe()
+        refreshed_after = time.perf_counter() - started
+        # A push kapcsolat felépülését is megvárjuk, hogy a leállítás ne a kézfogás közben szakítsa meg
+        for _ in range(100):
+            if coordinator.event_stream.healthy:
+                break
+            await asyncio.sleep(0.01)
+        return elapsed, entities, refreshed_after
+
+
+async def bench_count(devices: int, latency: float, rounds: int) -> dict:
+    hub = FakeHub(generate_devices(devices), latency=latency, event_interval=0)
+    runner = await hub.start()
+    with tempfile.TemporaryDirectory() as config_dir:
+        # Az első indulás menti az eszközlistát (a HA leállításakor), ebből indul a többi
+        entry_id = uuid.uuid4().hex
+        try:
+            await start(hub.address, config_dir, entry_id)
+            cold = [await start(hub.address) for _ in range(rounds)]
+            restored = [await start(hub.address, config_dir, entry_id) for _ in range(rounds)]
+        finally:
+            await runner.cleanup()
+        inventory = Path(config_dir, ".storage", f"{DOMAIN}.{entry_id}.inventory")
+
+        # A hub leállt: a hideg indulás elakad, a mentett adatból indulás nem
+        offline_cold = await start(hub.address)
+        offline_restored = await start(hub.address, config_dir, entry_id)
+
+        return {
+            "devices": devices,
+            "entities": restored[0][1],
+            "inventory_bytes": inventory.stat().st_size,
+            "cold_ms": statistics.median(t for t, _, _ in cold) * 1000,
+            "restored_ms": statistics.median(t for t, _, _ in restored) * 1000,
+            "restored_refreshed_ms": statistics.median(t for _, _, t in restored) * 1000,
+            "offline": {"cold_ms": offline_cold[0] * 1000, "cold_entities": offline_cold[1],
+                        "restored_ms": offline_restored[0] * 1000, "restored_entities": offline_restored[1]},
+        }
+
+
+async def main_async(args) -> list:
+    results = []
+    for devices in args.devices:
+        results.append(await bench_count(devices, args.latency / 1000, args.rounds))
+        if not args.json:
+            row = results[-1]
+            print(
+                f"{row['devices']:>6} dev {row['entities']:>6} ent | cold {row['cold_ms']:>8.1f}ms | "
+                f"restored {row['restored_ms']:>7.2f}ms (hub data {row['restored_refreshed_ms']:>8.1f}ms) | offline: cold gives "
+                f"{row['offline']['cold_entities']} entities, restored {row['offline']['restored_entities']}"
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--devices", type=int, nargs="+", default=list(DEFAULT_COUNTS))
+    parser.add_argument("--latency", type=float, default=300.0, help="fake hub response delay in ms")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="machine-readable output")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    if args.json:
+        print(json.dumps({
+            "benchmark": "startup",
+            "python": sys.version.split()[0],
+            "latency_ms": args.latency,
+            "results": results,
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
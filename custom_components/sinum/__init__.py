@@ -1,21 +1,109 @@
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from .const import DOMAIN
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.helpers.typing import ConfigType
+
+from .api import SinumAPI
+from .const import (
+    CONF_IP,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_REQUESTS_PER_SECOND,
+    CONF_TOKEN,
+    DATA_SHARED_LIMIT,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_REQUESTS_PER_SECOND,
+    DOMAIN,
+    LEGACY_HUB_IDENTIFIER,
+    PLATFORMS,
+)
+from .coordinator import SinumHubCoordinator, inventory_store
+from .limiter import RequestBudget, SharedRequestLimit
+from .scheduler import tier_intervals_from_options
+from .services import async_setup_services
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """A szolgáltatások egyszer, az összes hubra közösen (lásd services.py)."""
+    async_setup_services(hass)
+    return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up the integration from a config entry."""
-    # Ha több platformot is használsz, mindet ide tedd:
-    await hass.config_entries.async_forward_entry_setups(
-        entry,
-        ["sensor", "select", "number", "climate", "switch", "cover", "light", "binary_sensor"]   # <--- LÉNYEGES
+    # Hubonkénti kérés-keret; több hub esetén a kéréseik együtt sem lépik túl a közös korlátot
+    budget = RequestBudget(
+        rate=entry.options.get(CONF_MAX_REQUESTS_PER_SECOND, DEFAULT_MAX_REQUESTS_PER_SECOND),
+        max_concurrency=entry.options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS),
+        shared=hass.data.setdefault(DATA_SHARED_LIMIT, SharedRequestLimit()),
     )
+    api = SinumAPI(entry.data[CONF_IP], entry.data[CONF_TOKEN], budget=budget)
+
+    # Egyetlen hub-szintű koordinátor: minden végpontot ciklusonként egyszer kérdez le,
+    # a platformok ennek a pillanatképéből olvasnak.
+    coordinator = SinumHubCoordinator(hass, entry, api)
+    # Ha van mentett eszközlista, abból azonnal indulunk (lassú vagy elérhetetlen hub
+    # esetén is), és a hubbal a háttérben egyeztetünk; különben megvárjuk az első lekérdezést.
+    restored = await coordinator.async_load_inventory()
+    if not restored:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            await api.async_close()
+            raise
+
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    _async_migrate_hub_device(hass, entry)
+
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    if restored:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), name=f"sinum initial refresh {entry.title}"
+        )
+
+    # Push eseményfolyam; amíg nem elérhető, a lekérdezés megy tovább a szokásos módon
+    coordinator.event_stream.start()
+
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
     return True
 
+async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """
+    A lekérdezési szintek azonnal, újratöltés nélkül érvényesek;
+    a kérés-keret módosításához újratöltjük az integrációt.
+    """
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    budget = coordinator.api.budget
+    if (
+        float(entry.options.get(CONF_MAX_REQUESTS_PER_SECOND, DEFAULT_MAX_REQUESTS_PER_SECOND)) != budget.rate
+        or entry.options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS) != budget.max_concurrency
+    ):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    coordinator.async_set_tier_intervals(tier_intervals_from_options(entry.options))
+
+def _async_migrate_hub_device(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """
+    A korábbi, minden hubnál azonos azonosítójú ('all_in_one') eszközt a hub
+    saját azonosítójára nevezzük át (a terület, név stb. megmarad).
+    """
+    registry = dr.async_get(hass)
+    device = registry.async_get_device(identifiers={(DOMAIN, LEGACY_HUB_IDENTIFIER)})
+    if device is not None and entry.entry_id in device.config_entries:
+        registry.async_update_device(device.id, new_identifiers={(DOMAIN, entry.entry_id)})
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload integration."""
-    return await hass.config_entries.async_unload_platforms(
-        entry,
-        ["sensor", "select", "number", "climate", "switch", "cover", "light", "binary_sensor"]   # <--- LÉNYEGES
-    )
-
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if coordinator is not None:
+            await coordinator.event_stream.async_stop()
+            await coordinator.writer.async_flush()
+            await coordinator.async_save_inventory()
+            await coordinator.api.async_close()
+    return unload_ok
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Az integráció törlésekor a mentett eszközlistát is töröljük."""
+    await inventory_store(hass, entry.entry_id).async_remove()
@@ -1,16 +1,60 @@
 import aiohttp
+import asyncio
 import logging
 import json
+import time
+
+from .circuit import CircuitBreaker, CircuitOpenError
+from .const import EVENTS_PATH
+from .limiter import RequestBudget
+from .metrics import ApiMetrics
 
 _LOGGER = logging.getLogger(__name__)
 
+# Gyors JSON backend, ha elérhető (orjson vagy msgspec), különben a stdlib json.
+# Mindhárom elfogad bytes-ot és str-t is.
+try:
+    import orjson
+
+    json_loads = orjson.loads
+    JSON_BACKEND = "orjson"
+except ImportError:
+    try:
+        import msgspec
+
+        json_loads = msgspec.json.Decoder().decode
+        JSON_BACKEND = "msgspec"
+    except ImportError:
+        json_loads = json.loads
+        JSON_BACKEND = "json"
+
+# A hub válaszainak lehetséges kódolásai, próbálkozási sorrendben. Az UTF-8-at
+# mindig elsőként (szigorúan) próbáljuk; a latin-1 minden bájtsort elfogad, ezért
+# csak végső eset, és nem jegyezzük meg (különben a későbbi UTF-8 válaszok is elromlanának)
+CANDIDATE_ENCODINGS = ("utf-8", "utf-8-sig", "cp1250", "cp1252", "latin-1")
+FALLBACK_ENCODING = "latin-1"
+
+# Egy hubhoz egyszerre nyitott kapcsolatok száma (a beágyazott hub kevés párhuzamos kérést bír)
+MAX_CONNECTIONS_PER_HOST = 4
+# Ennyi ideig tartjuk nyitva a tétlen keep-alive kapcsolatot
+KEEPALIVE_TIMEOUT = 30
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=5)
+# Egy lekérdezési ciklusban egyszerre futó listalekérések felső korlátja
+MAX_PARALLEL_FETCHES = 3
+
 class SinumAPI:
     """A SINUM rendszer API-hívásainak kezelője."""
 
-    def __init__(self, ip: str, token: str):
+    def __init__(self, ip: str, token: str, session: aiohttp.ClientSession | None = None,
+                 budget: RequestBudget | None = None):
         """
         :param ip: pl. '192.168.22.22'
         :param token: A cURL-ből ismert hitelesítési token
+        :param session: Opcionális, kívülről kapott session (pl. a HA közös session-je).
+                        Ha nincs megadva, saját keep-alive session-t nyitunk, amit
+                        az async_close() zár le.
+        :param budget: A hub kérés-kerete (kérés / s és párhuzamosság); alapból
+                       az alapértelmezett értékekkel.
         """
         self.base_url = f"http://{ip}/api/v1"
         self.headers = {
@@ -18,116 +62,229 @@ class SinumAPI:
             "Content-Type": "application/json",
             "Accept": "application/json",
         }
+        self._session = session
+        self._owns_session = session is None
+        self._fetch_semaphore = asyncio.Semaphore(MAX_PARALLEL_FETCHES)
+        # Sikertelen listalekérések száma; csak diagnosztika (és a benchmarkok) olvassa.
+        # Az adaptív ütemező a hibát ciklusonként kapja meg (note_poll: nem jött meg minden lista)
+        self.fetch_errors = 0
+        # Végpontonként a legutóbb működő, nem UTF-8 kódolás (ha az UTF-8 nem működik)
+        self._encodings = {}
+        # Végpontonkénti késleltetés, méret és hibaszámlálók (diagnosztika)
+        self.metrics = ApiMetrics()
+        # Elérhetetlen hubnál nem küldünk kéréseket (lásd CircuitBreaker)
+        self.breaker = CircuitBreaker(f"SINUM hub {ip}")
+        # Minden HTTP kérés ezen a kereten megy át (lásd RequestBudget)
+        self.budget = budget if budget is not None else RequestBudget()
 
-    #
-    # ========== Virtuális eszközök (thermostat) ==========
-    #
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Hosszú életű, keep-alive session: a kapcsolatokat a hívások között
+        újrahasznosítjuk, így egy meleg kapcsolaton egyetlen körút egy kérés.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                # A kérés-keret párhuzamossága + az eseményfolyam kapcsolata
+                limit_per_host=max(MAX_CONNECTIONS_PER_HOST, self.budget.max_concurrency + 1),
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=REQUEST_TIMEOUT,
+            )
+            self._owns_session = True
+        return self._session
 
-    async def get_virtual_devices(self):
-        url = f"{self.base_url}/devices/virtual"
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(url, headers=self.headers) as resp:
-                    resp.raise_for_status()
+    async def async_close(self):
+        """A saját session lezárása (a kívülről kapott session-t nem zárjuk)."""
+        if self._owns_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
-                    # Mindig nyers bájtokat olvasunk, majd több kódolással próbálunk JSON-t pars-olni.
+    async def _request(self, method: str, url: str, endpoint: str, payload=None):
+        """
+        Minden HTTP kérés innen indul a hub felé, a kérés-kereten belül
+        (self.budget; a várakozás nem számít bele a késleltetésbe). Itt mérjük a végpontonkénti
+        késleltetést, válaszméretet, dekódolási időt és a hibákat (self.metrics).
+        A választ nyers bájtként olvassuk, a dekódolást a _decode_json végzi,
+        így a parancsok válaszai is bármely támogatott kódolásban érkezhetnek.
+        :param endpoint: a statisztika és a kódolás-gyorsítótár kulcsa, pl. 'GET devices/virtual'
+        :return: a dekódolt JSON; sikeres, de üres válasznál (pl. 204) üres dict, így a
+                 hívók a sikert a None-tól (hiba) különböztetik meg, nem a válasz tartalmától
+        :raises aiohttp.ClientResponseError: hibás státusznál (a message a válasz szövege)
+        :raises CircuitOpenError: ha a hub elérhetetlen, és a kérést el sem küldtük
+        """
+        self.breaker.before_request()
+        session = self._get_session()
+        async with self.budget:
+            started = time.monotonic()
+            try:
+                async with session.request(method, url, headers=self.headers, json=payload) as resp:
                     raw = await resp.read()
-                    raw_data = None
-                    for enc in ("utf-8", "utf-8-sig", "latin-1", "cp1250", "cp1252"):
-                        try:
-                            raw_text = raw.decode(enc)
-                            raw_data = json.loads(raw_text)
-                            break
-                        except Exception:
-                            continue
-
-                    if raw_data is None:
-                        _LOGGER.error(
-                            "Virtual devices: JSON dekódolás sikertelen "
-                            "(content_type=%s, charset=%s, size=%dB, first200=%r)",
-                            getattr(resp, "content_type", None),
-                            getattr(resp, "charset", None),
-                            len(raw),
-                            raw[:200],
+                    if resp.status >= 400:
+                        raise aiohttp.ClientResponseError(
+                            resp.request_info,
+                            resp.history,
+                            status=resp.status,
+                            message=raw[:500].decode("utf-8", "replace") or (resp.reason or ""),
+                            headers=resp.headers,
                         )
-                        return []
-
-                    # Kimenet normalizálás (dict-ben 'data' lista, vagy top-level lista)
-                    if isinstance(raw_data, dict):
-                        if isinstance(raw_data.get("data"), list):
-                            return raw_data["data"]
-                        for k in ("items", "results", "devices"):
-                            if isinstance(raw_data.get(k), list):
-                                return raw_data[k]
-                        return []
-                    elif isinstance(raw_data, list):
-                        return raw_data
-                    return []
             except Exception as e:
-                _LOGGER.error("Error fetching virtual devices: %s", e)
-                return []
+                self.metrics.record_error(
+                    endpoint, time.monotonic() - started, e, timeout=isinstance(e, asyncio.TimeoutError)
+                )
+                if _is_hub_failure(e):
+                    self.breaker.record_failure(e)
+                else:
+                    # A hub válaszolt (pl. 4xx), tehát elérhető
+                    self.breaker.record_success()
+                raise
+        self.metrics.record_response(endpoint, time.monotonic() - started, len(raw))
+        self.breaker.record_success()
 
-    async def set_thermostat_mode(self, device_id: int, new_mode: str):
-        url = f"{self.base_url}/devices/virtual/{device_id}"
-        payload = {
-            "id": device_id,
-            "mode": new_mode
-        }
-        async with aiohttp.ClientSession() as session:
+        if not raw.strip():
+            return {}
+        decode_started = time.monotonic()
+        data = self._decode_json(endpoint, raw)
+        self.metrics.record_decode(endpoint, time.monotonic() - decode_started)
+        if data is None:
+            raise ValueError(
+                f"JSON dekódolás sikertelen ({endpoint}, content_type={resp.content_type}, "
+                f"charset={resp.charset}, size={len(raw)}B, first200={raw[:200]!r})"
+            )
+        return data
+
+    def _decode_json(self, endpoint: str, raw: bytes):
+        """
+        JSON dekódolás: mindig szigorú UTF-8-cal kezdünk (gyors út). Ha az nem megy,
+        a végponthoz eltárolt kódolással, végül sorban a CANDIDATE_ENCODINGS listával;
+        a működőt eltároljuk, kivéve a mindig "működő" latin-1-et.
+        :return: a dekódolt objektum, vagy None, ha egyik kódolás sem működött
+        """
+        try:
+            return _loads_with_encoding(raw, "utf-8")
+        except Exception:
+            pass
+
+        cached = self._encodings.get(endpoint)
+        if cached is not None:
             try:
-                async with session.patch(url, headers=self.headers, json=payload) as resp:
-                    resp.raise_for_status()
-                    return await resp.json()
-            except Exception as e:
-                _LOGGER.error("Error setting thermostat mode: %s", e)
-                return None
+                return _loads_with_encoding(raw, cached)
+            except Exception:
+                _LOGGER.debug("Cached encoding %s failed for %s, redetecting", cached, endpoint)
+                del self._encodings[endpoint]
 
-    async def set_thermostat_target_temperature(self, device_id: int, new_target: int):
-        url = f"{self.base_url}/devices/virtual/{device_id}"
-        payload = {
-            "id": device_id,
-            "target_temperature": new_target
-        }
-        async with aiohttp.ClientSession() as session:
+        for enc in CANDIDATE_ENCODINGS:
+            if enc in ("utf-8", cached):
+                continue
             try:
-                async with session.patch(url, headers=self.headers, json=payload) as resp:
-                    resp.raise_for_status()
-                    return await resp.json()
+                raw_data = _loads_with_encoding(raw, enc)
+            except Exception:
+                continue
+            if enc != FALLBACK_ENCODING:
+                self._encodings[endpoint] = enc
+            return raw_data
+        return None
+
+    async def _fetch_device_list(self, endpoint: str):
+        """
+        GET /devices/<endpoint> -> eszközlista.
+        Hiba esetén kivételt dob; a hívó ezt naplózza.
+        :raises ValueError: ha a válasz nem eszközlista (pl. hibaüzenet 200-as státusszal);
+                            üres listát ilyenkor nem adunk, mert az minden eszköz eltűnését jelentené
+        """
+        url = f"{self.base_url}/devices/{endpoint}"
+        raw_data = await self._request("GET", url, f"GET devices/{endpoint}")
+
+        # Kimenet normalizálás (dict-ben 'data' lista, vagy top-level lista)
+        if isinstance(raw_data, dict):
+            if isinstance(raw_data.get("data"), list):
+                return raw_data["data"]
+            for k in ("items", "results", "devices"):
+                if isinstance(raw_data.get(k), list):
+                    return raw_data[k]
+        elif isinstance(raw_data, list):
+            return raw_data
+        raise ValueError(f"Unexpected device list response from {endpoint}: {str(raw_data)[:200]}")
+
+    async def get_device(self, device_class: str, device_id: int):
+        """
+        GET /devices/<class>/<id> -> egyetlen eszköz mezői (pl. parancs utáni visszaolvasáshoz,
+        a teljes lista helyett). Hiba esetén None.
+        """
+        url = f"{self.base_url}/devices/{device_class}/{device_id}"
+        try:
+            raw_data = await self._request("GET", url, f"GET devices/{device_class}/<id>")
+        except Exception as e:
+            _LOGGER.debug("Error reading back device %s (%s): %s", device_id, device_class, e)
+            return None
+
+        # Kimenet normalizálás (dict-ben 'data' objektum, vagy maga az eszköz)
+        if isinstance(raw_data, dict) and isinstance(raw_data.get("data"), dict):
+            raw_data = raw_data["data"]
+        if not isinstance(raw_data, dict) or raw_data.get("id") != device_id:
+            return None
+        return {k: v for k, v in raw_data.items() if k != "class"}
+
+    def _fetch_failed(self, endpoint: str, error: Exception):
+        """
+        Sikertelen listalekérés naplózása. Ha a hub elérhetetlen, az állapotváltást
+        és az összegzést a CircuitBreaker naplózza, itt nem írunk kérésenként hibát.
+        """
+        self.fetch_errors += 1
+        if isinstance(error, CircuitOpenError) or not self.breaker.is_closed:
+            _LOGGER.debug("Error fetching %s devices: %s", endpoint, error)
+        else:
+            _LOGGER.error("Error fetching %s devices: %s", endpoint, error)
+
+    def _command_failed(self, error: Exception, message: str, *args):
+        """
+        Sikertelen parancs naplózása. Ha a hub elérhetetlen (nyitott megszakító),
+        az állapotváltást és az összegzést a CircuitBreaker naplózza, itt csak
+        debug szinten írunk (mint _fetch_failed), hogy a parancsok ne árasszák el a naplót.
+        """
+        if isinstance(error, CircuitOpenError) or not self.breaker.is_closed:
+            _LOGGER.debug(message, *args)
+        else:
+            _LOGGER.error(message, *args)
+
+    async def _bounded(self, fetch):
+        """Egy listalekérés futtatása a párhuzamossági korláton belül."""
+        async with self._fetch_semaphore:
+            return await fetch()
+
+    async def fetch_devices(self, endpoints):
+        """
+        Csak a megadott végpontok ('virtual', 'sbus', 'wtp') párhuzamos lekérése.
+        :return: {végpont: eszközlista}; sikertelen lekérésnél a lista helyett None,
+                 így a hívó megtarthatja a végpont előző adatait
+        """
+        async def _fetch(endpoint):
+            try:
+                return await self._fetch_device_list(endpoint)
             except Exception as e:
-                _LOGGER.error("Error setting target temperature: %s", e)
+                self._fetch_failed(endpoint, e)
                 return None
 
+        results = await asyncio.gather(*(self._bounded(lambda ep=ep: _fetch(ep)) for ep in endpoints))
+        return dict(zip(endpoints, results))
+
     #
-    # ========== SBUS + WTP -> relék, redőnyök, stb. ==========
+    # ========== Virtuális eszközök (thermostat) ==========
     #
 
-    async def get_sbus_devices(self):
-        url = f"{self.base_url}/devices/sbus"
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(url, headers=self.headers) as resp:
-                    resp.raise_for_status()
-                    raw_data = await resp.json()
-                    if isinstance(raw_data, dict) and "data" in raw_data:
-                        return raw_data["data"]
-                    return []
-            except Exception as e:
-                _LOGGER.error("Error fetching sbus devices: %s", e)
-                return []
-
-    async def get_wtp_devices(self):
-        url = f"{self.base_url}/devices/wtp"
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(url, headers=self.headers) as resp:
-                    resp.raise_for_status()
-                    raw_data = await resp.json()
-                    if isinstance(raw_data, dict) and "data" in raw_data:
-                        return raw_data["data"]
-                    return []
-            except Exception as e:
-                _LOGGER.error("Error fetching wtp devices: %s", e)
-                return []
+    async def patch_virtual_device(self, device_id: int, fields: dict):
+        """
+        Több mező módosítása egyetlen PATCH-csel (pl. mode + target_temperature).
+        PATCH /devices/virtual/<device_id>
+        """
+        url = f"{self.base_url}/devices/virtual/{device_id}"
+        payload = {"id": device_id, **fields}
+        try:
+            return await self._request("PATCH", url, "PATCH devices/virtual", payload)
+        except Exception as e:
+            self._command_failed(e, "Error updating virtual device %s (%s): %s", device_id, fields, e)
+            return None
 
     #
     # ========== ÚJ: Analog Output ==========
@@ -141,18 +298,14 @@ class SinumAPI:
         """
         url = f"{self.base_url}/devices/sbus/{device_id}/command/set_value"
         payload = {"set_value": value}
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(url, headers=self.headers, json=payload) as resp:
-                    resp.raise_for_status()
-                    return await resp.json()
-            except aiohttp.ClientResponseError as e:
-                error_body = await e.response.text()
-                _LOGGER.error(f"Error setting analog output value for device {device_id}: {e.status}, body='{error_body}', url='{url}'")
-                return None
-            except Exception as e:
-                _LOGGER.error(f"Error setting analog output value for device {device_id}: {e}")
-                return None
+        try:
+            return await self._request("POST", url, "POST command/set_value", payload)
+        except aiohttp.ClientResponseError as e:
+            _LOGGER.error(f"Error setting analog output value for device {device_id}: {e.status}, body='{e.message}', url='{url}'")
+            return None
+        except Exception as e:
+            self._command_failed(e, "Error setting analog output value for device %s: %s", device_id, e)
+            return None
 
     #
     # ========== ÚJ: PWM Duty Cycle Beállítása ==========
@@ -166,89 +319,44 @@ class SinumAPI:
         """
         url = f"{self.base_url}/devices/{device_class}/{device_id}/command/set_duty_cycle"
         payload = {"set_duty_cycle": duty_cycle}  # "set_duty_cycle" várható
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(url, headers=self.headers, json=payload) as resp:
-                    if resp.status == 422:
-                        # Részletes hibaüzenet naplózása
-                        error_details = await resp.text()
-                        _LOGGER.error(f"Unprocessable Entity when setting PWM duty cycle for device {device_id} ({device_class}): {error_details}")
-                        return None
-                    resp.raise_for_status()
-                    return await resp.json()
-            except aiohttp.ClientResponseError as e:
-                error_body = await e.response.text()
-                _LOGGER.error(f"Client response error setting PWM duty cycle for device {device_id} ({device_class}): {e.status}, body='{error_body}', url='{url}'")
-                return None
-            except Exception as e:
-                _LOGGER.error(f"Error setting PWM duty cycle for device {device_id} ({device_class}): {e}")
+        try:
+            return await self._request("POST", url, "POST command/set_duty_cycle", payload)
+        except aiohttp.ClientResponseError as e:
+            if e.status == 422:
+                # Részletes hibaüzenet naplózása
+                _LOGGER.error(f"Unprocessable Entity when setting PWM duty cycle for device {device_id} ({device_class}): {e.message}")
                 return None
+            _LOGGER.error(f"Client response error setting PWM duty cycle for device {device_id} ({device_class}): {e.status}, body='{e.message}', url='{url}'")
+            return None
+        except Exception as e:
+            self._command_failed(e, "Error setting PWM duty cycle for device %s (%s): %s", device_id, device_class, e)
+            return None
 
     #
     # ========== Egyéb eszközkezelések ==========
     #
 
-    async def get_all_relays(self):
-        sbus_list = await self.get_sbus_devices()
-        wtp_list = await self.get_wtp_devices()
-
-        sbus_relays = [d for d in sbus_list if d.get("type") == "relay"]
-        for dev in sbus_relays:
-            dev["class"] = "sbus"
-
-        wtp_relays = [d for d in wtp_list if d.get("type") == "relay"]
-        for dev in wtp_relays:
-            dev["class"] = "wtp"
-
-        return sbus_relays + wtp_relays
-
     async def relay_turn_on(self, device_class: str, device_id: int):
         url = f"{self.base_url}/devices/{device_class}/{device_id}/command/turn_on"
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(url, headers=self.headers, json={}) as resp:
-                    resp.raise_for_status()
-                    return await resp.json()
-            except aiohttp.ClientResponseError as e:
-                error_body = await e.response.text()
-                _LOGGER.error(f"Client response error turning relay ON for device {device_id} ({device_class}): {e.status}, body='{error_body}', url='{url}'")
-                return None
-            except Exception as e:
-                _LOGGER.error("Error turning relay ON: %s", e)
-                return None
+        try:
+            return await self._request("POST", url, "POST command/turn_on", {})
+        except aiohttp.ClientResponseError as e:
+            _LOGGER.error(f"Client response error turning relay ON for device {device_id} ({device_class}): {e.status}, body='{e.message}', url='{url}'")
+            return None
+        except Exception as e:
+            self._command_failed(e, "Error turning relay ON: %s", e)
+            return None
 
     async def relay_turn_off(self, device_class: str, device_id: int):
         url = f"{self.base_url}/devices/{device_class}/{device_id}/command/turn_off"
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(url, headers=self.headers, json={}) as resp:
-                    resp.raise_for_status()
-                    return await resp.json()
-            except aiohttp.ClientResponseError as e:
-                error_body = await e.response.text()
-                _LOGGER.error(f"Client response error turning relay OFF for device {device_id} ({device_class}): {e.status}, body='{error_body}', url='{url}'")
-                return None
-            except Exception as e:
-                _LOGGER.error("Error turning relay OFF: %s", e)
-                return None
-
-    async def get_all_blind_controllers(self):
-        sbus_list = await self.get_sbus_devices()
-        wtp_list = await self.get_wtp_devices()
-
-        sbus_covers = [
-            dev for dev in sbus_list if dev.get("type") == "blind_controller"
-        ]
-        for dev in sbus_covers:
-            dev["class"] = "sbus"
-
-        wtp_covers = [
-            dev for dev in wtp_list if dev.get("type") == "blind_controller"
-        ]
-        for dev in wtp_covers:
-            dev["class"] = "wtp"
-
-        return sbus_covers + wtp_covers
+        try:
+            return await self._request("POST", url, "POST command/turn_off", {})
+        except aiohttp.ClientResponseError as e:
+            _LOGGER.error(f"Client response error turning relay OFF for device {device_id} ({device_class}): {e.status}, body='{e.message}', url='{url}'")
+            return None
+        except Exception as e:
+            self._command_failed(e, "Error turning relay OFF: %s", e)
+            return None
 
     async def set_cover_position(self, device_class: str, device_id: int, position: int):
         url = f"{self.base_url}/devices/{device_class}/{device_id}"
@@ -256,15 +364,121 @@ class SinumAPI:
             "id": device_id,
             "target_opening": position
         }
-        async with aiohttp.ClientSession() as session:
+        try:
+            return await self._request("PATCH", url, f"PATCH devices/{device_class}", payload)
+        except aiohttp.ClientResponseError as e:
+            _LOGGER.error(f"Client response error setting cover position for device {device_id} ({device_class}): {e.status}, body='{e.message}', url='{url}'")
+            return None
+        except Exception as e:
+            self._command_failed(e, "Error setting cover position: %s", e)
+            return None
+
+    #
+    # ========== Push: eseményfolyam (WebSocket) ==========
+    #
+
+    async def async_listen_events(self, on_connected, on_event):
+        """
+        Feliratkozás a hub eseményfolyamára (WebSocket: <base_url>/events).
+        Minden eszközváltozásra meghívja az on_event(device_class, device_id, fields)
+        függvényt. Addig fut, amíg a kapcsolat él; bontáskor visszatér,
+        hibánál kivételt dob (az újrakapcsolódás a hívó dolga).
+        A kapcsolódás a többi kéréshez hasonlóan a megszakítón és a kérés-kereten
+        megy át, így az újrakapcsolódási próbák sem terhelik az elérhetetlen hubot.
+        :raises CircuitOpenError: ha a hub elérhetetlen, és nem is próbálkoztunk
+        """
+        url = f"{self.base_url}{EVENTS_PATH}"
+        endpoint = "WS events"
+        self.breaker.before_request()
+        session = self._get_session()
+        async with self.budget:
+            started = time.monotonic()
             try:
-                async with session.patch(url, headers=self.headers, json=payload) as resp:
-                    resp.raise_for_status()
-                    return await resp.json()
-            except aiohttp.ClientResponseError as e:
-                error_body = await e.response.text()
-                _LOGGER.error(f"Client response error setting cover position for device {device_id} ({device_class}): {e.status}, body='{error_body}', url='{url}'")
-                return None
+                ws = await session.ws_connect(
+                    url, headers={"Authorization": self.headers["Authorization"]}, heartbeat=30
+                )
             except Exception as e:
-                _LOGGER.error("Error setting cover position: %s", e)
-                return None
\ No newline at end of file
+                self.metrics.record_error(
+                    endpoint, time.monotonic() - started, e, timeout=isinstance(e, asyncio.TimeoutError)
+                )
+                if _is_hub_failure(e):
+                    self.breaker.record_failure(e)
+                else:
+                    # A hub válaszolt (pl. nincs eseményfolyama), tehát elérhető
+                    self.breaker.record_success()
+                raise
+        self.metrics.record_response(endpoint, time.monotonic() - started, 0)
+        self.breaker.record_success()
+
+        async with ws:
+            on_connected()
+            async for msg in ws:
+                if msg.type in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                    self.metrics.record_message(endpoint, len(msg.data))
+                    decode_started = time.monotonic()
+                    try:
+                        message = json_loads(msg.data)
+                    except Exception as e:
+                        _LOGGER.debug("Invalid event message %r: %s", msg.data[:200], e)
+                        continue
+                    self.metrics.record_decode(endpoint, time.monotonic() - decode_started)
+                    for device_class, device_id, fields in parse_events(message):
+                        on_event(device_class, device_id, fields)
+                elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                    break
+
+    #
+    # ========== Általános eszközparancs (pl. rgb_controller) ==========
+    #
+
+    async def send_device_command(self, device_class: str, device_id: int, command: str, body: dict):
+        """
+        POST /devices/<class>/<id>/command/<command>, body=...
+        """
+        url = f"{self.base_url}/devices/{device_class}/{device_id}/command/{command}"
+        try:
+            return await self._request("POST", url, f"POST command/{command}", body)
+        except Exception as e:
+            _LOGGER.debug("Error sending %s command: %s", command, e)
+            return None
+
+
+def parse_events(message):
+    """
+    Egy eseményüzenetből (device_class, device_id, mezők) hármasok.
+    Elfogadott alakok (egyenként vagy listában):
+      {"class": "sbus", "id": 5, "data": {...}}
+      {"class": "sbus", "id": 5, "state": true, ...}
+      {"event": "...", "device": {"class": "sbus", "id": 5, ...}}
+    """
+    items = message if isinstance(message, list) else [message]
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        if isinstance(item.get("device"), dict):
+            item = item["device"]
+        device_class = item.get("class")
+        device_id = item.get("id")
+        if device_class is None or device_id is None:
+            continue
+        if isinstance(item.get("data"), dict):
+            fields = item["data"]
+        else:
+            fields = {k: v for k, v in item.items() if k not in ("class", "id", "event")}
+        if fields:
+            yield device_class, device_id, fields
+
+
+def _is_hub_failure(error: Exception) -> bool:
+    """Hálózati hiba, időtúllépés vagy 5xx: a hub (vagy az út odáig) nem működik."""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status >= 500
+    return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError, OSError))
+
+
+def _loads_with_encoding(raw: bytes, encoding: str):
+    """A nyers választ a megadott kódolással dekódolja és JSON-ként értelmezi."""
+    if encoding == "utf-8" and JSON_BACKEND != "json":
+        # Gyors út: az orjson / msgspec közvetlenül a bájtokból dolgozik
+        return json_loads(raw)
+    return json_loads(raw.decode(encoding))
\ No newline at end of file
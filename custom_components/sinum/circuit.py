@@ -0,0 +1,129 @@
+import logging
+import random
+import time
+
+from .const import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RETRY_MAX,
+    CIRCUIT_RETRY_MIN,
+    CIRCUIT_SUMMARY_INTERVAL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """A hub elérhetetlen (a megszakító nyitva van), a kérést el sem küldtük."""
+
+
+class CircuitBreaker:
+    """
+    Hubonkénti áramkör-megszakító a SinumAPI előtt.
+
+    - CLOSED: a kérések mennek; CIRCUIT_FAILURE_THRESHOLD egymás utáni hiba után OPEN.
+    - OPEN: a kéréseket azonnal elutasítjuk (CircuitOpenError), a hubot nem terheljük.
+      A várakozás CIRCUIT_RETRY_MIN-től duplázódik CIRCUIT_RETRY_MAX-ig, véletlen
+      szórással, hogy több hub / példány ne egyszerre próbálkozzon.
+    - HALF_OPEN: a várakozás letelte után a következő kérések próbaként mennek;
+      az első siker lezárja (CLOSED), az első hiba újra nyitja hosszabb várakozással.
+
+    Naplózás csak állapotváltáskor történik, nyitott állapotban pedig legfeljebb
+    CIRCUIT_SUMMARY_INTERVAL-onként egy összegzés az elutasított kérésekről.
+    """
+
+    def __init__(self, name: str, clock=time.monotonic):
+        self._name = name
+        self._clock = clock
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self._retry_delay = CIRCUIT_RETRY_MIN.total_seconds()
+        self._open_until = 0.0
+        self._opened_at = 0.0
+        self._last_summary = 0.0
+        self._last_error = None
+        # Statisztika
+        self.rejected = 0
+        self._rejected_since_summary = 0
+        self.trips = 0
+
+    @property
+    def is_closed(self) -> bool:
+        return self.state == STATE_CLOSED
+
+    def retry_in(self) -> float:
+        """A következő próbáig hátralévő idő másodpercben (0, ha most is mehet kérés)."""
+        if self.state != STATE_OPEN:
+            return 0.0
+        return max(0.0, self._open_until - self._clock())
+
+    def before_request(self):
+        """
+        Kérés előtt hívandó.
+        :raises CircuitOpenError: ha a megszakító nyitva van
+        """
+        if self.state != STATE_OPEN:
+            return
+        now = self._clock()
+        if now >= self._open_until:
+            self.state = STATE_HALF_OPEN
+            _LOGGER.debug("%s: probing the hub", self._name)
+            return
+
+        self.rejected += 1
+        self._rejected_since_summary += 1
+        if now - self._last_summary >= CIRCUIT_SUMMARY_INTERVAL.total_seconds():
+            _LOGGER.warning(
+                "%s still unreachable for %.0fs: %d request(s) skipped, next probe in %.0fs (last error: %s)",
+                self._name, now - self._opened_at, self._rejected_since_summary,
+                self._open_until - now, self._last_error,
+            )
+            self._last_summary = now
+            self._rejected_since_summary = 0
+        raise CircuitOpenError(f"{self._name} unreachable, next probe in {self._open_until - now:.0f}s")
+
+    def record_success(self):
+        if self.state != STATE_CLOSED:
+            _LOGGER.info(
+                "%s reachable again after %.0fs (%d request(s) skipped)",
+                self._name, self._clock() - self._opened_at, self.rejected,
+            )
+            self.state = STATE_CLOSED
+            self.rejected = 0
+        self.consecutive_failures = 0
+        self._retry_delay = CIRCUIT_RETRY_MIN.total_seconds()
+
+    def record_failure(self, error: BaseException):
+        self.consecutive_failures += 1
+        self._last_error = f"{type(error).__name__}: {error}"[:200]
+        if self.state == STATE_HALF_OPEN:
+            # Sikertelen próba: hosszabb várakozás
+            self._retry_delay = min(self._retry_delay * 2, CIRCUIT_RETRY_MAX.total_seconds())
+            self._open()
+        elif self.state == STATE_CLOSED and self.consecutive_failures >= CIRCUIT_FAILURE_THRESHOLD:
+            self.trips += 1
+            self._opened_at = self._clock()
+            self._open()
+            _LOGGER.warning(
+                "%s unreachable after %d failed requests (%s), pausing requests for %.0fs",
+                self._name, self.consecutive_failures, self._last_error, self.retry_in(),
+            )
+
+    def _open(self):
+        now = self._clock()
+        self.state = STATE_OPEN
+        self._open_until = now + self._retry_delay * random.uniform(0.8, 1.2)
+        self._last_summary = now
+
+    def as_dict(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+            "retry_in_s": round(self.retry_in(), 1),
+            "last_error": self._last_error,
+        }
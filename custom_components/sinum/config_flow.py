@@ -1,7 +1,22 @@
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
-from .const import DOMAIN, CONF_IP, CONF_TOKEN
+from .const import (
+    DOMAIN,
+    CONF_IP,
+    CONF_TOKEN,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_REQUESTS_PER_SECOND,
+    CONF_FAST_POLL_INTERVAL,
+    CONF_MEDIUM_POLL_INTERVAL,
+    CONF_SLOW_POLL_INTERVAL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_REQUESTS_PER_SECOND,
+    DEFAULT_TIER_INTERVALS,
+    TIER_FAST,
+    TIER_MEDIUM,
+    TIER_SLOW,
+)
 
 class SinumThermostatConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for SINUM Thermostat integration."""
@@ -17,8 +32,11 @@ class SinumThermostatConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             if not self._is_valid_ip(user_input[CONF_IP]):
                 errors["base"] = "invalid_ip"
             else:
+                # Egy hubot csak egyszer lehet felvenni; több hub külön bejegyzés
+                await self.async_set_unique_id(user_input[CONF_IP])
+                self._abort_if_unique_id_configured()
                 return self.async_create_entry(
-                    title="SINUM Thermostat",
+                    title=f"SINUM {user_input[CONF_IP]}",
                     data=user_input
                 )
 
@@ -42,16 +60,28 @@ class SinumThermostatConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return SinumThermostatOptionsFlowHandler(config_entry)
 
     def _is_valid_ip(self, ip):
-        """Check if the provided IP address is valid."""
+        """Check if the provided IP address (optionally with a port, e.g. '127.0.0.1:8080') is valid."""
         import ipaddress
         try:
             ipaddress.ip_address(ip)
             return True
+        except ValueError:
+            pass
+        # IPv4 cím porttal (pl. a tools/fake_hub.py szimulátorhoz)
+        host, _, port = ip.rpartition(":")
+        if not host or not port.isdigit() or not 0 < int(port) < 65536:
+            return False
+        try:
+            return ipaddress.ip_address(host).version == 4
         except ValueError:
             return False
 
 class SinumThermostatOptionsFlowHandler(config_entries.OptionsFlow):
-    """Ha töröljük a felesleges opciókat, üresen is hagyhatjuk, vagy akár törölhetjük is."""
+    """
+    A lekérdezési szintek időközei (gyors: mozgás, bináris bemenet, relé;
+    közepes: redőny, fény, kimenetek, termosztát; lassú: környezeti szenzorok)
+    és a hub kérés-kerete (kérés / másodperc, egyszerre futó kérések).
+    """
 
     def __init__(self, config_entry):
         self.config_entry = config_entry
@@ -59,7 +89,24 @@ class SinumThermostatOptionsFlowHandler(config_entries.OptionsFlow):
     async def async_step_init(self, user_input=None):
         """Handle the options configuration."""
         if user_input is not None:
-            # Ha nincsenek opciók, akár rögtön létre is hozhatjuk:
-            return self.async_create_entry(title="", data={})
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
 
-        return self.async_show_form(step_id="init", data_schema=vol.Schema({}))
\ No newline at end of file
+        def _interval(option, tier):
+            return vol.Required(option, default=options.get(option, DEFAULT_TIER_INTERVALS[tier].total_seconds()))
+
+        schema = vol.Schema({
+            _interval(CONF_FAST_POLL_INTERVAL, TIER_FAST): vol.All(vol.Coerce(float), vol.Range(min=1, max=60)),
+            _interval(CONF_MEDIUM_POLL_INTERVAL, TIER_MEDIUM): vol.All(vol.Coerce(float), vol.Range(min=1, max=600)),
+            _interval(CONF_SLOW_POLL_INTERVAL, TIER_SLOW): vol.All(vol.Coerce(float), vol.Range(min=1, max=3600)),
+            vol.Required(
+                CONF_MAX_REQUESTS_PER_SECOND,
+                default=options.get(CONF_MAX_REQUESTS_PER_SECOND, DEFAULT_MAX_REQUESTS_PER_SECOND),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=100)),
+            vol.Required(
+                CONF_MAX_CONCURRENT_REQUESTS,
+                default=options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
+        })
+        return self.async_show_form(step_id="init", data_schema=schema)
\ No newline at end of file
@@ -1,3 +1,137 @@
+from datetime import timedelta
+
 DOMAIN = "sinum"
 CONF_IP = "ip"
-CONF_TOKEN = "token"
\ No newline at end of file
+CONF_TOKEN = "token"
+# Opciók: hubonkénti kérés-keret
+CONF_MAX_REQUESTS_PER_SECOND = "max_requests_per_second"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+# Opciók: lekérdezési szintek időközei (másodperc)
+CONF_FAST_POLL_INTERVAL = "fast_poll_interval"
+CONF_MEDIUM_POLL_INTERVAL = "medium_poll_interval"
+CONF_SLOW_POLL_INTERVAL = "slow_poll_interval"
+
+PLATFORMS = ["sensor", "select", "number", "climate", "switch", "cover", "light", "binary_sensor"]
+
+# A közös hub koordinátor lekérdezési ideje (minden platform ebből olvas).
+# Az AdaptivePollScheduler a szintek időközeiből indul: parancs / változás után
+# gyorsít (de legfeljebb FAST-ig), csendes időszakban minden szint időközét
+# QUIET_INTERVAL_FACTOR-szorosára lassítja (legfeljebb MAX-ig; a szint saját, hosszabb
+# időközét nem rövidíti), lassú vagy hibázó hubnál legfeljebb MAX-ig vesz vissza.
+DEFAULT_SCAN_INTERVAL = timedelta(seconds=2)
+FAST_SCAN_INTERVAL = timedelta(seconds=1)
+QUIET_INTERVAL_FACTOR = 3
+MAX_SCAN_INTERVAL = timedelta(seconds=30)
+# Lekérdezési szintek eszköztípus szerint. A hub végpontonként (virtual / sbus / wtp)
+# adja az eszközlistát, így egy végpont a rajta lévő leggyorsabb szint szerint frissül.
+TIER_FAST = "fast"
+TIER_MEDIUM = "medium"
+TIER_SLOW = "slow"
+TIERS = (TIER_FAST, TIER_MEDIUM, TIER_SLOW)
+DEVICE_TYPE_TIERS = {
+    "motion_sensor": TIER_FAST,
+    "two_state_input_sensor": TIER_FAST,
+    "relay": TIER_FAST,
+    "blind_controller": TIER_MEDIUM,
+    "rgb_controller": TIER_MEDIUM,
+    "analog_output": TIER_MEDIUM,
+    "pulse_width_modulation": TIER_MEDIUM,
+    "thermostat": TIER_MEDIUM,
+    "temperature_sensor": TIER_SLOW,
+    "humidity_sensor": TIER_SLOW,
+    "light_sensor": TIER_SLOW,
+}
+# Ismeretlen típus esetén
+DEFAULT_DEVICE_TIER = TIER_MEDIUM
+DEFAULT_TIER_INTERVALS = {
+    TIER_FAST: DEFAULT_SCAN_INTERVAL,
+    TIER_MEDIUM: timedelta(seconds=10),
+    TIER_SLOW: timedelta(seconds=60),
+}
+# Parancs után ennyi ideig kérdezünk gyorsan, észlelt állapotváltozás után rövidebb ideig
+BOOST_DURATION = timedelta(seconds=15)
+CHANGE_BOOST_DURATION = timedelta(seconds=4)
+# Gyorsításkor a végpont a saját szintje időközének ekkora részével frissül (legalább FAST)
+BOOST_INTERVAL_FACTOR = 0.25
+# Ennyi változás nélküli idő után tekintjük csendesnek a rendszert
+QUIET_AFTER = timedelta(seconds=60)
+# Ennél lassabb ciklus már a hub túlterhelésére utal
+SLOW_RESPONSE_TIME = timedelta(seconds=1)
+
+# Redőny mozgásmodell (lásd travel.py): a teljes út kezdeti becslése és határai,
+# a tanulás mértéke, és a mozgás közbeni becsült helyzet frissítése
+COVER_DEFAULT_TRAVEL_TIME = timedelta(seconds=30)
+COVER_MIN_TRAVEL_TIME = timedelta(seconds=5)
+COVER_MAX_TRAVEL_TIME = timedelta(seconds=180)
+COVER_TRAVEL_LEARNING_RATE = 0.3
+# Ennél rövidebb (százalékpont) szakaszból nem tanulunk
+COVER_MIN_LEARN_DISTANCE = 5
+COVER_ESTIMATE_INTERVAL = timedelta(seconds=1)
+# A várható érkezés után ennyivel olvassuk vissza a redőnyt (megerősítés); ha a
+# visszaolvasás nem hoz új helyzetet, duplázódó várakozással legfeljebb ennyiszer,
+# utána a becslést befejezzük és a jelentett helyzetet mutatjuk
+COVER_CONFIRM_MARGIN = timedelta(seconds=2)
+COVER_CONFIRM_ATTEMPTS = 3
+
+# Frissítéskérések összevonása: az ablakon belül érkező kérésekből egyetlen lekérdezés lesz
+REFRESH_REQUEST_WINDOW = timedelta(milliseconds=500)
+
+# Parancs utáni visszaolvasás: ennyit várunk előtte (a hubnak idő kell a végrehajtáshoz),
+# és ha még nem a parancsolt értéket mutatja, egyre ritkábban újra olvassuk. Az optimista
+# érték addig marad, amíg a hub meg nem erősíti, de legfeljebb OPTIMISTIC_TIMEOUT ideig.
+READ_BACK_DELAY = timedelta(milliseconds=500)
+OPTIMISTIC_TIMEOUT = timedelta(seconds=10)
+
+# Csúszkás írások összevonása: ennyi ideig gyűjtjük az azonos eszközre érkező értékeket
+WRITE_COALESCE_WINDOW = timedelta(milliseconds=300)
+MAX_IN_FLIGHT_WRITES_PER_DEVICE = 1
+
+# Push (WebSocket eseményfolyam) a hubról: amíg egészséges, csak ritkán egyeztetünk lekérdezéssel
+EVENTS_PATH = "/events"
+PUSH_RECONCILE_INTERVAL = timedelta(seconds=60)
+# Újrakapcsolódás exponenciális várakozással (és véletlen szórással)
+PUSH_RECONNECT_MIN = timedelta(seconds=5)
+PUSH_RECONNECT_MAX = timedelta(minutes=5)
+
+# Áramkör-megszakító: ennyi egymás utáni hiba után a hubot elérhetetlennek tekintjük,
+# és a próbálkozások között CIRCUIT_RETRY_MIN-től CIRCUIT_RETRY_MAX-ig duplázódó ideig várunk
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_RETRY_MIN = timedelta(seconds=5)
+CIRCUIT_RETRY_MAX = timedelta(minutes=5)
+# Nyitott megszakítónál legfeljebb ilyen időközönként naplózunk összegzést
+CIRCUIT_SUMMARY_INTERVAL = timedelta(minutes=5)
+
+# Hubonkénti kérés-keret (token bucket + párhuzamossági korlát), az opciókban módosítható
+DEFAULT_MAX_REQUESTS_PER_SECOND = 10
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+# Az összes hub együtt legfeljebb ennyi kérést futtat egyszerre
+MAX_GLOBAL_CONCURRENT_REQUESTS = 16
+# hass.data kulcs: a hubok közös párhuzamossági korlátja (SharedRequestLimit)
+DATA_SHARED_LIMIT = f"{DOMAIN}_shared_limit"
+
+# sinum.bulk_command: egyszerre legfeljebb ennyi parancs fut (a hubok kérés-kerete ezen felül is érvényes)
+BULK_COMMAND_PARALLELISM = 8
+
+# A hub eszköz korábbi, minden hubnál azonos azonosítója (migráláshoz)
+LEGACY_HUB_IDENTIFIER = "all_in_one"
+
+# Egy eszköz entitásait csak akkor vesszük el, ha ennyi egymás utáni sikeres lekérdezésben
+# hiányzott a végpontja listájából (egy hibás válasz ne törölje az entitásokat)
+INVENTORY_REMOVE_AFTER_POLLS = 3
+
+# A legutóbbi eszközlista mentése (HA Store), hogy induláskor ne kelljen a hubra várni.
+# Új vagy eltűnt eszköz után rövid késleltetéssel mentünk; a puszta állapotváltozásokat
+# legfeljebb ennyi időnként írjuk ki (a HA leállásakor és az integráció kiürítésekor úgyis)
+STORAGE_VERSION = 1
+INVENTORY_SAVE_DELAY = timedelta(seconds=30)
+INVENTORY_STATE_SAVE_INTERVAL = timedelta(minutes=15)
+
+# Származtatott szenzorstatisztikák (trend, 15 perces átlag, napi min/max) mezőnkénti
+# gyűrűpufferből: legfeljebb HISTORY_SAMPLE_INTERVAL-onként egy minta, így a puffer a
+# teljes trendablakot lefedi (3600 / 30 = 120 <= 128), és mezőnként ~2 KB marad
+HISTORY_BUFFER_SIZE = 128
+HISTORY_SAMPLE_INTERVAL = timedelta(seconds=30)
+HISTORY_TREND_WINDOW = timedelta(hours=1)
+HISTORY_MEAN_WINDOW = timedelta(minutes=15)
+# Ennél rövidebb idősorból nem számolunk trendet (két közeli minta túl zajos)
+HISTORY_MIN_TREND_SPAN = timedelta(minutes=5)
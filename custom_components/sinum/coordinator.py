@@ -0,0 +1,592 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import timedelta
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback, split_entity_id
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .api import SinumAPI
+from .entity import SinumEntity
+from .push import SinumEventStream
+from .const import (
+    CONF_IP,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    INVENTORY_REMOVE_AFTER_POLLS,
+    INVENTORY_SAVE_DELAY,
+    INVENTORY_STATE_SAVE_INTERVAL,
+    OPTIMISTIC_TIMEOUT,
+    READ_BACK_DELAY,
+    REFRESH_REQUEST_WINDOW,
+    STORAGE_VERSION,
+)
+from .scheduler import AdaptivePollScheduler, tier_intervals_from_options
+from .snapshot import SinumSnapshot
+from .writer import WriteCoalescer
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SinumHubCoordinator(DataUpdateCoordinator):
+    """
+    Hub-szintű koordinátor: ciklusonként egyszer kérdezi le a
+    /devices/virtual, /devices/sbus és /devices/wtp végpontokat, és egy közös
+    SinumSnapshot-ot publikál, amiből minden platform entitásai olvasnak.
+
+    A lekérdezési időközt az AdaptivePollScheduler állítja ciklusonként.
+
+    A pillanatkép tartalmazza a megváltozott eszközök halmazát; az entitások
+    csak akkor írnak állapotot, ha a saját eszközük változott. A kihagyott
+    írások számát a 'suppressed_writes' számláló mutatja.
+
+    Sikeres parancs után a várható állapotot azonnal beírjuk a pillanatképbe
+    (optimista állapot), így a felület nem vár egy teljes újralekérdezésre.
+    A megerősítéshez csak az érintett eszközt olvassuk vissza (GET /devices/<class>/<id>),
+    a teljes listák lekérdezése marad a szokásos ütemezésén. Az optimista érték
+    addig marad, amíg a hub a parancsolt értéket nem mutatja, de legfeljebb
+    OPTIMISTIC_TIMEOUT ideig; utána a hub értéke érvényes (visszagörgetés).
+
+    Ha a hub eseményfolyama (push) elérhető, az eszközváltozások azonnal
+    bekerülnek a pillanatképbe, a lekérdezés pedig csak egyeztet. Az egy
+    eseményhurok-ütemben érkező eseményekből egyetlen új pillanatkép és
+    egyetlen listener-értesítés lesz.
+
+    A legutóbbi eszközlistát és állapotot a HA Store-ba mentjük; induláskor
+    ebből azonnal létrejönnek az entitások, a hubbal a háttérben egyeztetünk.
+
+    A platformok az entitásgyártójukat regisztrálják (async_add_platform_entities);
+    ha a hubon új eszköz jelenik meg vagy eltűnik, az entitásait újratöltés nélkül
+    adjuk hozzá, illetve vesszük el. Eltűntnek csak az az eszköz számít, amelyik
+    INVENTORY_REMOVE_AFTER_POLLS egymás utáni sikeres lekérdezésben hiányzott.
+
+    A frissítéskérések (async_request_refresh: tömeges parancs, entitásfrissítés,
+    push újrakapcsolódás) REFRESH_REQUEST_WINDOW ablakon belül egyetlen lekérdezéssé
+    vonódnak össze, és egy hubon egyszerre legfeljebb egy lekérdezés fut
+    (az ütemezett és a kért frissítés sem fedi át egymást).
+
+    Több hub esetén mindegyiknek saját koordinátora és eszköze van (device_info),
+    a kéréseiket a közös SharedRequestLimit fogja össze.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, api: SinumAPI):
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=entry,
+            name=f"SINUM Hub {entry.title}",
+            update_interval=DEFAULT_SCAN_INTERVAL,
+            # Nem azonnali: az ablakon belüli összes kérés a végén egyetlen lekérdezés
+            request_refresh_debouncer=Debouncer(
+                hass, _LOGGER, cooldown=REFRESH_REQUEST_WINDOW.total_seconds(), immediate=False
+            ),
+        )
+        self.api = api
+        self.scheduler = AdaptivePollScheduler(tier_intervals=tier_intervals_from_options(entry.options))
+        self.writer = WriteCoalescer()
+        self.event_stream = SinumEventStream(hass, entry, self)
+        # Statisztika: elvégzett és (változás hiányában) kihagyott állapotírások
+        self.state_writes = 0
+        self.suppressed_writes = 0
+        # Optimista, még meg nem erősített mezők: (class, id) -> (mezők, beírás ideje)
+        self._optimistic = {}
+        self.optimistic_rollbacks = 0
+        # Egy hubon egyszerre egy lekérdezés; statisztika a kért és a lefutott frissítésekről
+        self._poll_lock = asyncio.Lock()
+        # Folyamatban lévő visszaolvasások: (class, id) -> kell-e utána újra olvasni
+        self._read_backs = {}
+        self.read_backs = 0
+        # Eszközök, amelyeknél a parancs utáni visszaolvasás el van hagyva (tömeges parancs alatt)
+        self._read_back_suppressed = Counter()
+        # Mozgó redőnyök (class, id): a helyzetüket a mozgásmodell becsli, a változásuk
+        # nem gyorsítja a végpont lekérdezését (lásd SinumCoverEntity)
+        self.moving_covers = set()
+        self.refresh_requests = 0
+        self.polls = 0
+        self._store = inventory_store(hass, entry.entry_id)
+        # A függőben lévő mentés esedékessége (loop idő), None: nincs mentetlen változás
+        self._save_due = None
+        self.restored_from_store = False
+        # A hub eszköze; minden entitása ehhez tartozik
+        self.device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=f"SINUM All-in-One ({entry.data[CONF_IP]})",
+            manufacturer="SINUM",
+            model="All-in-One Integration",
+        )
+        # Régi (hub nélküli) unique_id -> entity_id, az első migráláskor töltjük fel
+        self._legacy_entities = None
+        # Platformonként (async_add_entities, entitásgyártó), és eszközönként az entitások
+        self._platforms = []
+        self._device_entities = {}
+        # A legutóbbi lekérdezésben megjelent / véglegesen eltűnt eszközök (class, id) kulcsai
+        self._inventory_delta = None
+        # Push események, amiket a következő ütemben egyben írunk be: (class, id) -> mezők
+        self._pending_events = {}
+        self._flush_events_handle = None
+        # A hub listájából hiányzó, de még nem eltávolított eszközök: (class, id) -> hiányzó lekérdezések
+        self._missing = {}
+
+    async def async_load_inventory(self) -> bool:
+        """
+        A legutóbb mentett eszközlista betöltése pillanatképként.
+        :return: True, ha volt használható mentett adat
+        """
+        stored = await self._store.async_load()
+        if not stored:
+            return False
+        try:
+            self.data = SinumSnapshot.from_inventory(stored)
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Ignoring invalid stored SINUM inventory: %s", err)
+            return False
+        self.restored_from_store = True
+        self.scheduler.assign_tiers(self.data)
+        return True
+
+    @callback
+    def async_migrate_unique_id(self, legacy_unique_id: str, unique_id: str) -> None:
+        """
+        A hub nélküli unique_id-vel regisztrált entitás átnevezése az új azonosítóra.
+        Csak a saját config entry bejegyzéseit nézzük, így egy másik hub
+        azonos régi azonosítójú entitását nem vesszük el.
+        """
+        registry = er.async_get(self.hass)
+        if self._legacy_entities is None:
+            prefix = f"{DOMAIN}_{self.config_entry.entry_id}_"
+            self._legacy_entities = {
+                reg.unique_id: reg.entity_id
+                for reg in er.async_entries_for_config_entry(registry, self.config_entry.entry_id)
+                if not reg.unique_id.startswith(prefix)
+            }
+        entity_id = self._legacy_entities.pop(legacy_unique_id, None)
+        if entity_id is None:
+            return
+        domain = split_entity_id(entity_id)[0]
+        if registry.async_get_entity_id(domain, DOMAIN, unique_id) is not None:
+            return
+        _LOGGER.debug("Migrating unique_id of %s: %s -> %s", entity_id, legacy_unique_id, unique_id)
+        registry.async_update_entity(entity_id, new_unique_id=unique_id)
+
+    @callback
+    def async_add_platform_entities(self, async_add_entities, entities_for) -> None:
+        """
+        Egy platform entitásainak létrehozása a jelenlegi pillanatképből, és a
+        platform megjegyzése: később megjelenő eszközöknél ugyanígy hozzuk létre
+        az entitásaikat (entities_for egy csak az új eszközöket tartalmazó pillanatképet kap).
+        """
+        self._platforms.append((async_add_entities, entities_for))
+        self._add_entities(async_add_entities, entities_for(self.data))
+
+    def _add_entities(self, async_add_entities, entities) -> None:
+        for entity in entities:
+            if isinstance(entity, SinumEntity):
+                key = (entity._device_class, entity._device_id)
+                self._device_entities.setdefault(key, []).append(entity)
+        async_add_entities(entities)
+
+    def device_entities(self):
+        """Az eszközökhöz tartozó entitások (a hub diagnosztikai szenzorai nélkül)."""
+        for entities in self._device_entities.values():
+            yield from entities
+
+    @callback
+    def async_update_listeners(self) -> None:
+        if self._inventory_delta is not None:
+            added, removed = self._inventory_delta
+            self._inventory_delta = None
+            self._async_sync_entities(added, removed)
+        super().async_update_listeners()
+
+    @callback
+    def _async_sync_entities(self, added: set, removed: set) -> None:
+        """Új eszközök entitásainak létrehozása, eltűnt eszközökéinek eltávolítása."""
+        if added:
+            new_devices = self.data.subset(added)
+            _LOGGER.info("New SINUM device(s) found: %s", sorted(added, key=str))
+            for async_add_entities, entities_for in self._platforms:
+                self._add_entities(async_add_entities, entities_for(new_devices))
+        registered = None
+        for key in removed:
+            entities = self._device_entities.pop(key, ())
+            if not entities:
+                continue
+            _LOGGER.info("SINUM device %s/%s removed from the hub", *key)
+            if registered is None:
+                registry = er.async_get(self.hass)
+                registered = {
+                    reg.unique_id: reg.entity_id
+                    for reg in er.async_entries_for_config_entry(registry, self.config_entry.entry_id)
+                }
+            for entity in entities:
+                # A registry-ből töröljük (a letiltott entitásét is, ne maradjon árva bejegyzés);
+                # a futó entitás erre magát is eltávolítja
+                entity_id = registered.get(entity.unique_id)
+                if entity_id is not None:
+                    registry.async_remove(entity_id)
+                elif entity.hass is not None and entity.platform is not None:
+                    self.config_entry.async_create_task(self.hass, entity.async_remove())
+
+    @callback
+    def async_set_tier_intervals(self, tier_intervals: dict) -> None:
+        """A lekérdezési szintek módosítása futás közben (opciók), újratöltés nélkül."""
+        self.scheduler.set_tier_intervals(tier_intervals)
+        self.update_interval = timedelta(seconds=self.scheduler.next_interval())
+        # Az új időközzel ütemezzük újra a következő lekérdezést
+        self._schedule_refresh()
+
+    @callback
+    def _schedule_inventory_save(self, delay: timedelta = INVENTORY_SAVE_DELAY):
+        """
+        Késleltetett mentés. A Store minden async_delay_save hívásnál újraindítaná
+        az időzítőt (folyamatos változásnál sosem mentene), ezért egy függőben lévő
+        mentést csak akkor ütemezünk át, ha az új hamarabb esedékes (állapotváltozás
+        után INVENTORY_STATE_SAVE_INTERVAL, új/eltűnt eszköz után INVENTORY_SAVE_DELAY);
+        mentéskor úgyis a legfrissebb adat kerül ki. A függő mentést a Store a HA
+        leállásakor kiírja.
+        """
+        due = self.hass.loop.time() + delay.total_seconds()
+        if self._save_due is None or due < self._save_due:
+            self._save_due = due
+            self._store.async_delay_save(self._inventory_to_save, delay.total_seconds())
+
+    @callback
+    def _inventory_to_save(self) -> dict:
+        self._save_due = None
+        return self.data.to_inventory()
+
+    async def async_save_inventory(self) -> None:
+        """A mentetlen változások azonnali kiírása (az integráció kiürítésekor)."""
+        if self._save_due is not None and self.data is not None:
+            await self._store.async_save(self._inventory_to_save())
+
+    async def async_request_refresh(self) -> None:
+        """A parancsok után hívják: gyors lekérdezésre váltunk, majd (összevonva) frissítünk."""
+        self.refresh_requests += 1
+        self.scheduler.note_activity()
+        await super().async_request_refresh()
+
+    async def async_refresh_devices(self, keys) -> None:
+        """
+        Egyetlen (összevont) lekérdezés a megadott eszközök végpontjaira, a gyors
+        lekérdezés (boost) elindítása nélkül. A sinum.bulk_command hívja a végén.
+        """
+        self.refresh_requests += 1
+        self.scheduler.mark_due({device_class for device_class, _ in keys})
+        await super().async_request_refresh()
+
+    @contextmanager
+    def suppress_read_backs(self, keys):
+        """
+        A blokk alatt a megadott eszközök parancsai nem indítanak visszaolvasást;
+        a megerősítést a hívó kéri (async_refresh_devices), egyben.
+        """
+        keys = list(keys)
+        self._read_back_suppressed.update(keys)
+        try:
+            yield
+        finally:
+            self._read_back_suppressed.subtract(keys)
+            self._read_back_suppressed = +self._read_back_suppressed
+
+    @callback
+    def async_apply_optimistic(self, device_class: str, device_id, fields: dict, response=None) -> None:
+        """
+        Egy sikeres parancs eredményének beírása a közös pillanatképbe.
+        Ha a hub válasza tartalmazza az eszközt, annak mezőit is átvesszük.
+        """
+        if self.data is None or not fields:
+            return
+
+        key = (device_class, device_id)
+        pending = self._optimistic.get(key, ({}, 0.0))[0]
+        self._optimistic[key] = ({**pending, **fields}, time.monotonic())
+
+        response_fields = _device_fields_from_response(response, device_id)
+        patch = {**response_fields, **fields}
+        snapshot = self.data.with_device_fields(device_class, device_id, patch)
+        if snapshot is not self.data:
+            self.data = snapshot
+            self.async_update_listeners()
+
+        # Megerősítés: ha a válasz nem tartalmazta az eszközt, és push esemény sem jön,
+        # csak ezt az egy eszközt olvassuk vissza (tömeges parancsnál a végén egyben)
+        if not response_fields and not self.scheduler.push_active and key not in self._read_back_suppressed:
+            self._schedule_read_back(key)
+
+    @callback
+    def async_read_back(self, device_class: str, device_id) -> None:
+        """Egyetlen eszköz visszaolvasása a hubról (pl. redőny a várható érkezéskor)."""
+        self._schedule_read_back((device_class, device_id))
+
+    @callback
+    def _schedule_read_back(self, key: tuple) -> None:
+        """Egy eszköz visszaolvasása; ha már folyamatban van, utána még egyszer."""
+        if key in self._read_backs:
+            self._read_backs[key] = True
+            return
+        self._read_backs[key] = False
+        self.config_entry.async_create_background_task(
+            self.hass, self._async_read_back(key), name=f"sinum read back {key[0]}/{key[1]}"
+        )
+
+    async def _async_read_back(self, key: tuple) -> None:
+        delay = READ_BACK_DELAY.total_seconds()
+        try:
+            while True:
+                self._read_backs[key] = False
+                # A hubnak idő kell a parancs végrehajtásához; azonnal olvasva még a régi értéket adná
+                await asyncio.sleep(delay)
+                fields = await self.api.get_device(*key)
+                if fields is None:
+                    # Nem sikerült: csak ennek az eszköznek a végpontját kérdezzük le, gyorsítás nélkül
+                    await self.async_refresh_devices([key])
+                    return
+                self.read_backs += 1
+                unconfirmed = self._apply_read_back(key, fields)
+                if self._read_backs.get(key):
+                    # Közben újabb parancs ment az eszköznek: annak is kivárjuk a végrehajtását
+                    delay = READ_BACK_DELAY.total_seconds()
+                elif unconfirmed:
+                    delay *= 2
+                else:
+                    return
+        finally:
+            self._read_backs.pop(key, None)
+
+    def _apply_read_back(self, key: tuple, fields: dict) -> bool:
+        """
+        A visszaolvasott eszköz beírása a pillanatképbe. Azokat az optimista mezőket,
+        amelyeket a hub még nem a parancsolt értékkel mutat, OPTIMISTIC_TIMEOUT-ig
+        megtartjuk (a visszaolvasott értékük nem kerül be), utána visszagörgetjük.
+        :return: True, ha maradt megerősítetlen mező (újra visszaolvassuk)
+        """
+        unconfirmed = {}
+        pending = self._optimistic.get(key)
+        if pending is not None:
+            unconfirmed = {k: v for k, v in pending[0].items() if k in fields and fields[k] != v}
+            if unconfirmed and time.monotonic() - pending[1] >= OPTIMISTIC_TIMEOUT.total_seconds():
+                self.optimistic_rollbacks += 1
+                _LOGGER.debug("Optimistic state of %s/%s not confirmed by read-back (%s), rolled back",
+                              *key, unconfirmed)
+                unconfirmed = {}
+        self.async_apply_event(*key, {k: v for k, v in fields.items() if k not in unconfirmed})
+        return bool(unconfirmed)
+
+    @callback
+    def async_apply_event(self, device_class: str, device_id, fields: dict) -> None:
+        """
+        A hub eseményfolyamából kapott változás beírása a pillanatképbe.
+        Ez a hub saját adata, így az eszköz függő optimista mezőit is lezárja.
+        Az eseményeket a következő eseményhurok-ütemig gyűjtjük (egy eseménycsomag
+        egy új pillanatkép és egy listener-értesítés, nem eseményenként egy-egy).
+        """
+        key = (device_class, device_id)
+        pending = self._pending_events.get(key)
+        self._pending_events[key] = {**pending, **fields} if pending else dict(fields)
+        if self._flush_events_handle is None:
+            self._flush_events_handle = self.hass.loop.call_soon(self._flush_events)
+
+    @callback
+    def _flush_events(self) -> None:
+        self._flush_events_handle = None
+        updates, self._pending_events = self._pending_events, {}
+        if self.data is None:
+            return
+        for key, fields in updates.items():
+            pending = self._optimistic.get(key)
+            if pending is None:
+                continue
+            remaining = {k: v for k, v in pending[0].items() if k not in fields}
+            if remaining:
+                self._optimistic[key] = (remaining, pending[1])
+            else:
+                del self._optimistic[key]
+
+        snapshot = self.data.with_devices_fields(updates)
+        if snapshot is not self.data:
+            self.data = snapshot
+            self._schedule_inventory_save(INVENTORY_STATE_SAVE_INTERVAL)
+            self.async_update_listeners()
+
+    async def async_command(self, device_class: str, device_id, command, fields: dict):
+        """
+        Egy parancs (coroutine) végrehajtása; siker esetén (nem None válasz, üres
+        is lehet) a 'fields' várható állapotot optimistán beírjuk. Teljes
+        újralekérdezést nem kérünk, a megerősítés az eszköz visszaolvasásával jön.
+        """
+        result = await command
+        if result is not None:
+            self.async_apply_optimistic(device_class, device_id, fields, result)
+        return result
+
+    async def async_write(self, device_class: str, device_id, operation: str, fields: dict, send,
+                          state_fields=None):
+        """
+        Összevont írás egy eszközre (lásd WriteCoalescer).
+        Sikeres küldés után az összefésült értékeket optimistán beírjuk;
+        a 'state_fields' a küldött mezőkből az eszköz állapotmezőit képzi.
+        """
+        async def _send_and_apply(merged: dict):
+            result = await send(merged)
+            if result is not None:
+                expected = state_fields(merged) if state_fields else merged
+                self.async_apply_optimistic(device_class, device_id, expected, result)
+            return result
+
+        return await self.writer.submit((device_class, device_id, operation), fields, _send_and_apply)
+
+    def _split_optimistic(self, poll_started: float, lists: dict) -> dict:
+        """
+        Az optimista mezők szétválogatása egy lekérdezés után:
+        - a lekérdezés indulása után beírtakat a friss adatra is rátesszük (még függőben),
+        - a korábbiakat a hub friss adata megerősíti; amit még nem a parancsolt értékkel
+          mutat, az OPTIMISTIC_TIMEOUT-ig függőben marad, utána visszagörgetjük,
+        - a most nem lekérdezett végpontok eszközeinél minden marad függőben.
+        :return: a friss adatra írandó mezők {(class, id): mezők}
+        """
+        now = time.monotonic()
+        overrides = {}
+        remaining = {}
+        fetched = {}
+        for key, (fields, applied_at) in self._optimistic.items():
+            device_class, device_id = key
+            if lists.get(device_class) is None:
+                remaining[key] = (fields, applied_at)
+                continue
+            if applied_at > poll_started:
+                overrides[key] = fields
+                remaining[key] = (fields, applied_at)
+                continue
+            # Csak optimista mező esetén keresünk a nyers listában (ritka, és kevés eszköz)
+            if device_class not in fetched:
+                fetched[device_class] = {
+                    dev.get("id"): dev for dev in lists[device_class] if isinstance(dev, dict)
+                }
+            dev = fetched[device_class].get(device_id)
+            unconfirmed = {k: v for k, v in fields.items() if dev is None or dev.get(k) != v}
+            if not unconfirmed:
+                continue
+            if dev is not None and now - applied_at < OPTIMISTIC_TIMEOUT.total_seconds():
+                overrides[key] = unconfirmed
+                remaining[key] = (unconfirmed, applied_at)
+                continue
+            self.optimistic_rollbacks += 1
+            _LOGGER.debug(
+                "Optimistic state of %s/%s not confirmed by the hub (%s), rolled back",
+                device_class, device_id, unconfirmed,
+            )
+        self._optimistic = remaining
+        return overrides
+
+    async def _async_update_data(self) -> SinumSnapshot:
+        # Ha épp fut egy lekérdezés, megvárjuk, és utána friss adatot kérünk (nem fedik át egymást)
+        async with self._poll_lock:
+            self.polls += 1
+            return await self._async_poll()
+
+    async def _async_poll(self) -> SinumSnapshot:
+        # Csak az esedékes végpontokat kérdezzük le (lásd AdaptivePollScheduler szintek)
+        endpoints = self.scheduler.due_endpoints()
+        started = time.monotonic()
+        lists = await self.api.fetch_devices(endpoints)
+        duration = time.monotonic() - started
+
+        fetched = [endpoint for endpoint, devices in lists.items() if devices is not None]
+        if not fetched or not self.api.breaker.is_closed:
+            # Elérhetetlen hub: az entitások elérhetetlenek lesznek, az utolsó adat megmarad.
+            # A következő próbát a megszakító várakozásához igazítjuk.
+            self.scheduler.note_poll(duration, False, endpoints=endpoints)
+            self.update_interval = timedelta(
+                seconds=max(self.scheduler.next_interval(), self.api.breaker.retry_in())
+            )
+            raise UpdateFailed(f"SINUM hub unreachable ({self.api.breaker.state})")
+
+        # Üres lista egy eddig nem üres végponton inkább hibás válasz, mint minden eszköz
+        # törlése: a végpont előző adatai maradnak
+        for endpoint in fetched:
+            if not lists[endpoint] and self.data is not None and self.data.devices_of_class(endpoint):
+                _LOGGER.debug("Ignoring empty %s device list, keeping the previous devices", endpoint)
+                lists[endpoint] = None
+        fetched = [endpoint for endpoint in fetched if lists[endpoint] is not None]
+
+        pending = self._split_optimistic(started, lists)
+        snapshot = SinumSnapshot.from_lists(
+            lists.get("virtual"), lists.get("sbus"), lists.get("wtp"),
+            previous=self.data, overrides=pending,
+        )
+        if snapshot.changed is None:
+            changed_endpoints = set(fetched)
+        else:
+            # A mozgó redőnyök helyzetét a mozgásmodell követi, miattuk nem kérdezünk gyorsabban
+            changed_endpoints = {key[0] for key in snapshot.changed if key not in self.moving_covers}
+            _LOGGER.debug(
+                "Poll cycle %s: %d changed device(s), %d state writes suppressed so far",
+                endpoints,
+                len(snapshot.changed),
+                self.suppressed_writes,
+            )
+        if self.data is None:
+            self.scheduler.assign_tiers(snapshot)
+            self._schedule_inventory_save()
+        else:
+            added, removed = self._track_inventory(self.data, snapshot, fetched)
+            if added or removed:
+                self._inventory_delta = (added, removed)
+                self.scheduler.assign_tiers(snapshot)
+                self._schedule_inventory_save()
+            elif snapshot.changed is None or snapshot.changed:
+                self._schedule_inventory_save(INVENTORY_STATE_SAVE_INTERVAL)
+        self.scheduler.note_poll(duration, len(fetched) == len(endpoints), changed_endpoints, endpoints)
+        self.update_interval = timedelta(seconds=self.scheduler.next_interval())
+        return snapshot
+
+
+    def _track_inventory(self, previous: SinumSnapshot, snapshot: SinumSnapshot, fetched) -> tuple[set, set]:
+        """
+        Az új és a véglegesen eltűnt eszközök kulcsai. Egy eszköz akkor tűnt el,
+        ha INVENTORY_REMOVE_AFTER_POLLS egymás utáni lekérdezésben hiányzott a
+        végpontja listájából; ha közben visszatér, az entitásai megmaradtak.
+        """
+        # Csak a változott kulcsokat nézzük, így változatlan eszközlistánál ez olcsó
+        appeared, disappeared = _inventory_changes(previous, snapshot)
+        added = {key for key in appeared if self._missing.pop(key, None) is None}
+        for key in disappeared:
+            self._missing.setdefault(key, 0)
+        removed = set()
+        for key in [key for key in self._missing if key[0] in fetched]:
+            self._missing[key] += 1
+            if self._missing[key] >= INVENTORY_REMOVE_AFTER_POLLS:
+                del self._missing[key]
+                removed.add(key)
+        return added, removed
+
+
+def inventory_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """A hub mentett eszközlistájának tárolója."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.inventory")
+
+
+def _inventory_changes(previous: SinumSnapshot, snapshot: SinumSnapshot) -> tuple[set, set]:
+    """Az új és az eltűnt eszközök (class, id) kulcsai (a változott kulcsok közül)."""
+    changed = snapshot.changed if snapshot.changed is not None else set(snapshot._index) | set(previous._index)
+    added = {key for key in changed if previous.find(*key) is None and snapshot.find(*key) is not None}
+    removed = {key for key in changed if snapshot.find(*key) is None}
+    return added, removed
+
+
+def _device_fields_from_response(response, device_id) -> dict:
+    """A parancs válaszából az eszköz mezői, ha a hub visszaküldte az eszközt."""
+    data = response
+    if isinstance(response, dict) and isinstance(response.get("data"), dict):
+        data = response["data"]
+    if isinstance(data, dict) and data.get("id") == device_id:
+        return {k: v for k, v in data.items() if k != "class"}
+    return {}
@@ -1,20 +1,18 @@
 import logging
-from datetime import timedelta
+import time
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import (
-    DataUpdateCoordinator,
-    CoordinatorEntity,
-)
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.components.cover import (
     CoverEntity,
     CoverEntityFeature,
 )
-from homeassistant.helpers.device_registry import DeviceInfo
 
 from .api import SinumAPI
-from .const import DOMAIN
+from .const import COVER_CONFIRM_ATTEMPTS, COVER_CONFIRM_MARGIN, COVER_ESTIMATE_INTERVAL, DOMAIN
+from .entity import SinumEntity, snapshot_property
+from .travel import CoverTravelModel
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,92 +22,84 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback
 ):
     """Set up cover platform: blind_controller from sbus/wtp."""
-    ip = config_entry.data["ip"]
-    token = config_entry.data["token"]
-    api = SinumAPI(ip, token)
-
-    update_interval = timedelta(seconds=2)
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name="SINUM Blind Controllers",
-        update_method=api.get_all_blind_controllers,  # Leszedi a type="blind_controller" eszközöket
-        update_interval=update_interval,
-    )
-
-    await coordinator.async_config_entry_first_refresh()
-    devices = coordinator.data or []
-
-    entities = []
-    for dev in devices:
-        # dev["type"] = "blind_controller", dev["class"] = "sbus"/"wtp"
-        device_class = dev.get("class") 
-        device_id = dev.get("id")
-        name_in_api = dev.get("name", "")
-        if not name_in_api:
-            name_in_api = "cover"
-
-        base_name = name_in_api.lower().replace(" ", "_")
-        entities.append(
-            SinumCoverEntity(coordinator, dev, device_class, device_id, base_name, api)
-        )
-
-    async_add_entities(entities)
-
-class SinumCoverEntity(CoordinatorEntity, CoverEntity):
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    api = coordinator.api
+
+    def _entities_for(snapshot):
+        entities = []
+        for dev in snapshot.devices_of_type("blind_controller"):
+            # dev["type"] = "blind_controller", dev["class"] = "sbus"/"wtp"
+            device_class = dev.get("class")
+            device_id = dev.get("id")
+            name_in_api = dev.get("name", "")
+            if not name_in_api:
+                name_in_api = "cover"
+
+            base_name = name_in_api.lower().replace(" ", "_")
+            entities.append(
+                SinumCoverEntity(coordinator, dev, device_class, device_id, base_name, api)
+            )
+        return entities
+
+    # Később megjelenő redőnyökhöz a koordinátor hívja újra (újratöltés nélkül)
+    coordinator.async_add_platform_entities(async_add_entities, _entities_for)
+
+class SinumCoverEntity(SinumEntity, CoverEntity):
     """
     Home Assistant cover entitás, ami a "current_opening" (0..100) alapján
     mutatja a redőny helyzetét, és "target_opening" PATCH-el állítja.
+
+    Mozgás közben a helyzetet a CoverTravelModel becsli (a redőny megfigyelt
+    mozgásából tanult menetidő alapján), és COVER_ESTIMATE_INTERVAL időközzel
+    helyben frissíti, hubkérés nélkül. A várható érkezés után csak ezt az
+    eszközt olvassuk vissza megerősítésként; a busz lekérdezése közben nem gyorsul.
     """
 
     def __init__(self, coordinator, device, device_class, device_id, base_name, api: SinumAPI):
-        super().__init__(coordinator)
+        super().__init__(coordinator, device)
         self._device = device
-        self._device_class = device_class
-        self._device_id = device_id
         self._api = api
 
         self._attr_name = f"{base_name}_cover"  # Pl. "blind_controller_1_cover"
-        self._attr_unique_id = f"{DOMAIN}_{self._device_class}_{self._device_id}_cover"
+        self._set_unique_id("cover", legacy=f"{DOMAIN}_{self._device_class}_{self._device_id}_cover")
 
         # Ezzel jelzed, hogy a user a Lovelace-ben open/close/set position akciókat is végezhet
         self._attr_supported_features = (
             CoverEntityFeature.OPEN | CoverEntityFeature.CLOSE | CoverEntityFeature.SET_POSITION
         )
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        """
-        Ugyanaz a "all_in_one" azonosító, mint a többi entitásnál:
-        => 1 eszközbe kerül minden.
-        """
-        return DeviceInfo(
-            identifiers={(DOMAIN, "all_in_one")},
-            name="SINUM All-in-One",
-            manufacturer="SINUM",
-            model="All-in-One Integration",
-        )
-
-    def _find_device_in_coordinator(self):
-        data = self.coordinator.data
-        if not data:
-            return None
-        for dev in data:
-            if dev.get("id") == self._device_id and dev.get("class") == self._device_class:
-                return dev
-        return None
+        self._travel = CoverTravelModel()
+        self._unsub_estimate = None
+        self._confirm_at = None
+        self._confirm_attempts = 0
 
     @property
     def current_cover_position(self) -> int | None:
         """
-        A 'current_opening' mező (0..100) mutatja a redőny jelenlegi állapotát.
+        A 'current_opening' mező (0..100) mutatja a redőny jelenlegi állapotát,
+        mozgás közben a mozgásmodell becslése.
         A HA-nak integer kerek szám kell: 0=totál zárt, 100=totál nyitott.
         """
+        estimate = self._travel.estimate()
+        if estimate is not None:
+            return round(estimate)
+        return self._reported_position
+
+    @snapshot_property
+    def _reported_position(self) -> int | None:
         dev = self._find_device_in_coordinator()
         if not dev:
             return None
         return dev.get("current_opening", 0)
 
+    @property
+    def extra_state_attributes(self) -> dict:
+        """A tanult menetidő (teljes út, másodperc) és a tanuláshoz használt minták száma."""
+        return {
+            "travel_time": round(self._travel.travel_time, 1),
+            "travel_time_samples": self._travel.samples,
+        }
+
     @property
     def is_closed(self) -> bool | None:
         """
@@ -120,26 +110,104 @@ class SinumCoverEntity(CoordinatorEntity, CoverEntity):
             return None
         return position <= 0
 
+    @snapshot_property
+    def is_opening(self) -> bool | None:
+        """Nyit, ha a cél (target_opening) a jelenlegi helyzet fölött van."""
+        dev = self._find_device_in_coordinator()
+        if not dev or dev.get("target_opening") is None:
+            return None
+        return dev["target_opening"] > dev.get("current_opening", 0)
+
+    @snapshot_property
+    def is_closing(self) -> bool | None:
+        """Zár, ha a cél (target_opening) a jelenlegi helyzet alatt van."""
+        dev = self._find_device_in_coordinator()
+        if not dev or dev.get("target_opening") is None:
+            return None
+        return dev["target_opening"] < dev.get("current_opening", 0)
+
     async def async_set_cover_position(self, **kwargs):
         """
         A user beírja: "go to 20%", HA -> cover.set_cover_position -> ez a metódus.
         """
         position = kwargs.get("position")  # int 0..100
         if position is None:
-            return
-        await self._api.set_cover_position(self._device_class, self._device_id, position)
-        await self.coordinator.async_request_refresh()
+            return None
+        return await self._async_set_target_opening(position)
 
     async def async_open_cover(self, **kwargs):
         """
         A user a Lovelace-ben 'open cover' -> 100%-ra nyit.
         """
-        await self._api.set_cover_position(self._device_class, self._device_id, 100)
-        await self.coordinator.async_request_refresh()
+        return await self._async_set_target_opening(100)
 
     async def async_close_cover(self, **kwargs):
         """
         A user a Lovelace-ben 'close cover' -> 0%-ra zár.
         """
-        await self._api.set_cover_position(self._device_class, self._device_id, 0)
-        await self.coordinator.async_request_refresh()
\ No newline at end of file
+        return await self._async_set_target_opening(0)
+
+    async def _async_set_target_opening(self, position: int):
+        """PATCH target_opening, a cél optimistán azonnal megjelenik (nyitás/zárás jelzés)."""
+        return await self.coordinator.async_command(
+            self._device_class, self._device_id,
+            self._api.set_cover_position(self._device_class, self._device_id, position),
+            {"target_opening": position},
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """A hub által jelentett helyzet átadása a mozgásmodellnek (csak ha az eszköz változott)."""
+        snapshot = self.coordinator.data
+        key = (self._device_class, self._device_id)
+        if snapshot is not None and (snapshot.changed is None or key in snapshot.changed):
+            dev = snapshot.find(*key)
+            if dev is not None:
+                self._travel.observe(dev.get("current_opening"), dev.get("target_opening"))
+                self._sync_estimate()
+        super()._handle_coordinator_update()
+
+    @callback
+    def _sync_estimate(self) -> None:
+        """A helyi becslés időzítőjének indítása / leállítása a mozgás szerint."""
+        key = (self._device_class, self._device_id)
+        if self._travel.moving:
+            self.coordinator.moving_covers.add(key)
+            self._confirm_at = time.monotonic() + self._travel.remaining() + COVER_CONFIRM_MARGIN.total_seconds()
+            self._confirm_attempts = 0
+            if self._unsub_estimate is None:
+                self._unsub_estimate = async_track_time_interval(
+                    self.hass, self._async_estimate_tick, COVER_ESTIMATE_INTERVAL
+                )
+        else:
+            self.coordinator.moving_covers.discard(key)
+            self._confirm_at = None
+            if self._unsub_estimate is not None:
+                self._unsub_estimate()
+                self._unsub_estimate = None
+
+    @callback
+    def _async_estimate_tick(self, _now) -> None:
+        """Mozgás közben: a becsült helyzet kiírása, a várható érkezés után visszaolvasás."""
+        confirm_due = self._confirm_at is not None and time.monotonic() >= self._confirm_at
+        if confirm_due and self._confirm_attempts >= COVER_CONFIRM_ATTEMPTS:
+            # Egyik visszaolvasás sem hozott új helyzetet: nem becslünk tovább,
+            # a hub által jelentett helyzet látszik (a lekérdezés újra a szokásos)
+            _LOGGER.debug("Cover %s/%s: position not confirmed, stopping the estimate",
+                          self._device_class, self._device_id)
+            self._travel.stop()
+            self._sync_estimate()
+        self.async_write_ha_state()
+        if confirm_due and self._confirm_at is not None:
+            # Ha a redőny még nem ért célba, a visszaolvasott helyzet újraindítja a becslést;
+            # addig ne kérdezzük újra minden ütemben, és egyre ritkábban
+            self._confirm_at = time.monotonic() + COVER_CONFIRM_MARGIN.total_seconds() * 2 ** self._confirm_attempts
+            self._confirm_attempts += 1
+            self.coordinator.async_read_back(self._device_class, self._device_id)
+
+    async def async_will_remove_from_hass(self) -> None:
+        self.coordinator.moving_covers.discard((self._device_class, self._device_id))
+        if self._unsub_estimate is not None:
+            self._unsub_estimate()
+            self._unsub_estimate = None
+        await super().async_will_remove_from_hass()
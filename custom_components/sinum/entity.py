@@ -0,0 +1,88 @@
+import functools
+
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+
+
+def snapshot_property(func):
+    """
+    Mint a @property, de az értéket pillanatképenként (generációnként)
+    legfeljebb egyszer számolja ki; a következő frissítésig a tárolt értéket adja.
+    Egy állapotírás így nem futtatja újra ugyanazt a keresést/konverziót.
+    """
+    name = func.__name__
+
+    @functools.wraps(func)
+    def getter(self):
+        snapshot = self.coordinator.data
+        generation = snapshot.generation if snapshot is not None else None
+        memo = self._snapshot_memo
+        if memo[0] != generation:
+            memo = self._snapshot_memo = (generation, {})
+        values = memo[1]
+        if name not in values:
+            values[name] = func(self)
+        return values[name]
+
+    return property(getter)
+
+
+class SinumEntity(CoordinatorEntity):
+    """
+    Közös alap a SINUM entitásokhoz.
+    A hub koordinátor pillanatképéből olvas, az eszközt (class, id) azonosítja.
+    A parancsmetódusok (async_turn_on, async_set_cover_position, ...) a hub
+    válaszát adják vissza (hibánál None); ebből látja a sinum.bulk_command az eredményt.
+    """
+
+    def __init__(self, coordinator, device):
+        super().__init__(coordinator)
+        self._device_class = device.get("class")  # 'virtual', 'sbus' vagy 'wtp'
+        self._device_id = device.get("id")
+        self._snapshot_memo = (None, {})
+        self._written_available = None
+
+    def _set_unique_id(self, suffix: str, legacy: str | None = None):
+        """
+        Hubonként egyedi azonosító: config entry, busz (class), eszköz id és szerep.
+        A 'legacy' a korábbi, hub nélküli azonosító; ha ilyen bejegyzés van a
+        registry-ben, átnevezzük, így az entity_id és az előzmények megmaradnak.
+        """
+        entry_id = self.coordinator.config_entry.entry_id
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_{self._device_class}_{self._device_id}_{suffix}"
+        if legacy is not None:
+            self.coordinator.async_migrate_unique_id(legacy, self._attr_unique_id)
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Minden entitás a saját hubjának eszközéhez tartozik."""
+        return self.coordinator.device_info
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """
+        Csak akkor írunk állapotot, ha a saját eszközünk adatai változtak
+        (vagy az elérhetőség változott). A többi frissítést csak számoljuk.
+        """
+        snapshot = self.coordinator.data
+        available = self.available
+        if (
+            snapshot is not None
+            and snapshot.changed is not None
+            and (self._device_class, self._device_id) not in snapshot.changed
+            and available == self._written_available
+        ):
+            self.coordinator.suppressed_writes += 1
+            return
+        self._written_available = available
+        self.coordinator.state_writes += 1
+        self.async_write_ha_state()
+
+    def _find_device_in_coordinator(self):
+        snapshot = self.coordinator.data
+        if snapshot is None:
+            return None
+        return snapshot.find(self._device_class, self._device_id)
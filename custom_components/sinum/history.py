@@ -0,0 +1,238 @@
+import time
+from array import array
+from collections import deque
+
+from .const import (
+    HISTORY_BUFFER_SIZE,
+    HISTORY_MEAN_WINDOW,
+    HISTORY_MIN_TREND_SPAN,
+    HISTORY_SAMPLE_INTERVAL,
+    HISTORY_TREND_WINDOW,
+)
+
+
+class RingBuffer:
+    """
+    Fix méretű gyűrűpuffer (időbélyeg, érték) mintákhoz, két array('d')-ben.
+
+    A minták abszolút, növekvő sorszámot kapnak; a puffer a [start, end)
+    tartományt tárolja. A memória a létrehozáskor lefoglalt 2 * capacity double,
+    a minták számától függetlenül. Betelt pufferbe írás előtt a hívó dobja el
+    a legrégebbi mintát (drop_oldest), különben az felülíródik.
+    """
+
+    __slots__ = ("capacity", "start", "end", "_times", "_values")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.start = 0
+        self.end = 0
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def append(self, timestamp: float, value: float) -> None:
+        slot = self.end % self.capacity
+        self._times[slot] = timestamp
+        self._values[slot] = value
+        self.end += 1
+
+    def drop_oldest(self) -> None:
+        self.start += 1
+
+    def time(self, index: int) -> float:
+        return self._times[index % self.capacity]
+
+    def value(self, index: int) -> float:
+        return self._values[index % self.capacity]
+
+
+class FieldHistory:
+    """
+    Egy számmező (pl. egy termosztát hőmérséklete) rövid előzménye és az abból
+    származtatott statisztikák, recorder (SQL) lekérdezés nélkül.
+
+    - A minták egy RingBuffer-be kerülnek, legfeljebb sample_interval-onként
+      egy, a lekérdezés sűrűségétől függetlenül; a trendablakon kívüli minták kiesnek.
+    - Trend (egység / óra): a trendablak mintáira illesztett egyenes meredeksége.
+      A szükséges összegeket (n, Σt, Σv, Σt², Σtv) minden új és kieső mintánál
+      frissítjük, így O(1).
+    - Átlag, minimum, maximum az átlagablakra (15 perc): futó összeg és monoton
+      sorok, amortizáltan O(1).
+    - Napi minimum / maximum: minden megfigyelt értékből (nem csak a mintákból),
+      a nap váltásakor újraindul.
+
+    A futó összegek lebegőpontos hibája ne halmozódjon: a puffer minden teljes
+    körbefordulása után újraszámoljuk őket (ez is amortizáltan O(1)).
+    A puffer az első mintánál foglalódik, így amíg senki nem etet egy mezőt
+    (pl. a statisztika-szenzorai le vannak tiltva), az nem foglal memóriát.
+    """
+
+    def __init__(self, capacity: int = HISTORY_BUFFER_SIZE,
+                 sample_interval: float = HISTORY_SAMPLE_INTERVAL.total_seconds(),
+                 trend_window: float = HISTORY_TREND_WINDOW.total_seconds(),
+                 mean_window: float = HISTORY_MEAN_WINDOW.total_seconds(),
+                 clock=time.monotonic):
+        self._capacity = capacity
+        self._sample_interval = sample_interval
+        self._trend_window = trend_window
+        self._mean_window = mean_window
+        self._clock = clock
+        self._buffer = None
+        # Az utoljára feldolgozott pillanatkép generációja (több entitás is etetheti ugyanazt a mezőt),
+        # és az, amelyiknél a statisztikák utoljára változtak
+        self.generation = None
+        self.updated = None
+        self.daily_min = None
+        self.daily_max = None
+        self._day = None
+        # Regresszió: az időt az _origin-hoz képest mérjük (kisebb számok, kisebb kerekítési hiba)
+        self._origin = 0.0
+        self._n = 0
+        self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = 0.0
+        # Átlagablak: [_mean_start, end) a pufferben
+        self._mean_start = 0
+        self._mean_sum = 0.0
+        self._mins = deque()
+        self._maxs = deque()
+        self._drops = 0
+
+    @property
+    def samples(self) -> int:
+        return 0 if self._buffer is None else len(self._buffer)
+
+    @property
+    def mean_samples(self) -> int:
+        """Az átlagablak (15 perc) mintáinak száma; ebből számol a mean(), minimum(), maximum()."""
+        return 0 if self._buffer is None else self._buffer.end - self._mean_start
+
+    def record(self, value, generation, day) -> None:
+        """
+        Egy frissítés értéke. Pillanatképenként (generation) csak az első hívás számít,
+        a 'day' (helyi dátum) váltásakor a napi szélsőértékek újraindulnak.
+        """
+        if generation == self.generation:
+            return
+        self.generation = generation
+        if value is None:
+            return
+        value = float(value)
+        now = self._clock()
+        changed = self._expire(now)
+
+        if day != self._day:
+            self._day = day
+            self.daily_min = self.daily_max = value
+            changed = True
+        elif value < self.daily_min:
+            self.daily_min = value
+            changed = True
+        elif value > self.daily_max:
+            self.daily_max = value
+            changed = True
+
+        if self._buffer is None:
+            self._buffer = RingBuffer(self._capacity)
+        buffer = self._buffer
+        if not len(buffer) or now - buffer.time(buffer.end - 1) >= self._sample_interval:
+            self._append(now, value)
+            changed = True
+
+        if changed:
+            self.updated = generation
+
+    def mean(self) -> float | None:
+        if self._buffer is None or self._mean_start >= self._buffer.end:
+            return None
+        return self._mean_sum / (self._buffer.end - self._mean_start)
+
+    def minimum(self) -> float | None:
+        return self._buffer.value(self._mins[0]) if self._mins else None
+
+    def maximum(self) -> float | None:
+        return self._buffer.value(self._maxs[0]) if self._maxs else None
+
+    def trend_per_hour(self) -> float | None:
+        """A trendablak mintáira illesztett egyenes meredeksége, egység / óra."""
+        buffer = self._buffer
+        if buffer is None or self._n < 2:
+            return None
+        if buffer.time(buffer.end - 1) - buffer.time(buffer.start) < HISTORY_MIN_TREND_SPAN.total_seconds():
+            return None
+        denominator = self._n * self._sum_tt - self._sum_t * self._sum_t
+        if denominator <= 0:
+            return None
+        return (self._n * self._sum_tv - self._sum_t * self._sum_v) / denominator * 3600
+
+    def _append(self, now: float, value: float) -> None:
+        buffer = self._buffer
+        if len(buffer) == buffer.capacity:
+            self._drop_oldest()
+        if not len(buffer):
+            self._origin = now
+        buffer.append(now, value)
+        self._add(now - self._origin, value)
+        self._mean_sum += value
+
+        index = buffer.end - 1
+        while self._mins and buffer.value(self._mins[-1]) >= value:
+            self._mins.pop()
+        self._mins.append(index)
+        while self._maxs and buffer.value(self._maxs[-1]) <= value:
+            self._maxs.pop()
+        self._maxs.append(index)
+
+    def _add(self, t: float, value: float, sign: int = 1) -> None:
+        self._n += sign
+        self._sum_t += sign * t
+        self._sum_v += sign * value
+        self._sum_tt += sign * t * t
+        self._sum_tv += sign * t * value
+
+    def _drop_oldest(self) -> None:
+        buffer = self._buffer
+        index = buffer.start
+        self._add(buffer.time(index) - self._origin, buffer.value(index), -1)
+        buffer.drop_oldest()
+        if self._mean_start <= index:
+            self._mean_sum -= buffer.value(index)
+            self._mean_start = index + 1
+            self._trim_extremes()
+        self._drops += 1
+        if self._drops >= buffer.capacity:
+            self._resync()
+
+    def _expire(self, now: float) -> bool:
+        """A trend- és az átlagablakból kiesett minták eldobása; True, ha volt ilyen."""
+        buffer = self._buffer
+        if buffer is None:
+            return False
+        changed = False
+        while len(buffer) and now - buffer.time(buffer.start) > self._trend_window:
+            self._drop_oldest()
+            changed = True
+        while self._mean_start < buffer.end and now - buffer.time(self._mean_start) > self._mean_window:
+            self._mean_sum -= buffer.value(self._mean_start)
+            self._mean_start += 1
+            changed = True
+        self._trim_extremes()
+        return changed
+
+    def _trim_extremes(self) -> None:
+        while self._mins and self._mins[0] < self._mean_start:
+            self._mins.popleft()
+        while self._maxs and self._maxs[0] < self._mean_start:
+            self._maxs.popleft()
+
+    def _resync(self) -> None:
+        """A futó összegek újraszámolása a pufferből (a kerekítési hiba nullázása)."""
+        buffer = self._buffer
+        self._drops = 0
+        self._origin = buffer.time(buffer.start) if len(buffer) else 0.0
+        self._n = 0
+        self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = 0.0
+        for index in range(buffer.start, buffer.end):
+            self._add(buffer.time(index) - self._origin, buffer.value(index))
+        self._mean_sum = sum(buffer.value(index) for index in range(self._mean_start, buffer.end))
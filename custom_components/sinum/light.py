@@ -1,15 +1,10 @@
 import logging
 import colorsys
-from datetime import timedelta
 from typing import Optional
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import (
-    DataUpdateCoordinator,
-    CoordinatorEntity,
-)
 from homeassistant.components.light import (
     LightEntity,
     ATTR_BRIGHTNESS,
@@ -20,11 +15,10 @@ from homeassistant.components.light import (
     LightEntityFeature,
 )
 
-from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers.device_registry import DeviceInfo
-
 from .api import SinumAPI
 from .const import DOMAIN
+from .coordinator import SinumHubCoordinator
+from .entity import SinumEntity, snapshot_property
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,71 +28,34 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up the 'light' platform for 'rgb_controller' devices."""
-    ip = config_entry.data["ip"]
-    token = config_entry.data["token"]
-    api = SinumAPI(ip, token)
-
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name="SINUM RGB Controllers",
-        update_method=_create_rgb_fetcher(api),
-        update_interval=timedelta(seconds=1),
-    )
-
-    try:
-        # Első frissítés
-        await coordinator.async_config_entry_first_refresh()
-    except Exception as err:
-        raise ConfigEntryNotReady(f"RGB controllers fetch failed: {err}") from err
-
-    devices = coordinator.data or []
-
-    entities = []
-    for dev in devices:
-        # dev["type"] == "rgb_controller"
-        device_class = dev.get("class")  # "wtp" / "sbus"
-        device_id = dev.get("id")
-        name_in_api = dev.get("name", "rgb_light")
-        base_name = name_in_api.lower().replace(" ", "_")
-
-        entities.append(
-            SinumRGBControllerLight(
-                coordinator=coordinator,
-                device=dev,
-                device_class=device_class,
-                device_id=device_id,
-                base_name=base_name,
-                api=api
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    api = coordinator.api
+
+    def _entities_for(snapshot):
+        entities = []
+        for dev in snapshot.devices_of_type("rgb_controller"):
+            device_class = dev.get("class")  # "wtp" / "sbus"
+            device_id = dev.get("id")
+            name_in_api = dev.get("name", "rgb_light")
+            base_name = name_in_api.lower().replace(" ", "_")
+
+            entities.append(
+                SinumRGBControllerLight(
+                    coordinator=coordinator,
+                    device=dev,
+                    device_class=device_class,
+                    device_id=device_id,
+                    base_name=base_name,
+                    api=api
+                )
             )
-        )
+        return entities
 
-    async_add_entities(entities)
+    # Később megjelenő RGB vezérlőkhöz a koordinátor hívja újra (újratöltés nélkül)
+    coordinator.async_add_platform_entities(async_add_entities, _entities_for)
 
 
-def _create_rgb_fetcher(api: SinumAPI):
-    """
-    Egy factory-függvény, ami visszaad egy aszinkron _fetch_rgb_controllers
-    függvényt, hogy a coordinator update_method-ként tudja használni.
-    """
-    async def _fetch_rgb_controllers():
-        sbus_list = await api.get_sbus_devices()
-        wtp_list = await api.get_wtp_devices()
-
-        sbus_lights = [d for d in sbus_list if d.get("type") == "rgb_controller"]
-        for dev in sbus_lights:
-            dev["class"] = "sbus"
-
-        wtp_lights = [d for d in wtp_list if d.get("type") == "rgb_controller"]
-        for dev in wtp_lights:
-            dev["class"] = "wtp"
-
-        return sbus_lights + wtp_lights
-
-    return _fetch_rgb_controllers
-
-
-class SinumRGBControllerLight(CoordinatorEntity, LightEntity):
+class SinumRGBControllerLight(SinumEntity, LightEntity):
     """
     LightEntity a "type": "rgb_controller" SBUS/WTP eszközökhöz.
     Fő különbség: a szerver a "led_color" mezőben tárolja a HEX színt,
@@ -107,22 +64,20 @@ class SinumRGBControllerLight(CoordinatorEntity, LightEntity):
 
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: SinumHubCoordinator,
         device: dict,
         device_class: str,
         device_id: int,
         base_name: str,
         api: SinumAPI
     ):
-        super().__init__(coordinator)
+        super().__init__(coordinator, device)
         self._device = device
-        self._device_class = device_class
-        self._device_id = device_id
         self._api = api
 
         # Entitás paraméterek
         self._attr_name = f"{base_name}_light"
-        self._attr_unique_id = f"{DOMAIN}_{device_class}_{device_id}_light"
+        self._set_unique_id("light", legacy=f"{DOMAIN}_{device_class}_{device_id}_light")
 
         # LED szalag típusa
         strip_type = device.get("led_strip_type", "rgb")  # "rgb", "rgbw", "rgbww"
@@ -133,33 +88,14 @@ class SinumRGBControllerLight(CoordinatorEntity, LightEntity):
         else:
             self._attr_supported_color_modes = {COLOR_MODE_HS, COLOR_MODE_COLOR_TEMP}
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Egyetlen eszközbe csoportosítjuk (all_in_one)."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, "all_in_one")},
-            name="SINUM All-in-One",
-            manufacturer="SINUM",
-            model="RGB Controller Integration",
-        )
-
-    def _find_device_in_coordinator(self):
-        data = self.coordinator.data
-        if not data:
-            return None
-        for dev in data:
-            if dev.get("id") == self._device_id and dev.get("class") == self._device_class:
-                return dev
-        return None
-
-    @property
+    @snapshot_property
     def is_on(self) -> bool:
         dev = self._find_device_in_coordinator()
         if not dev:
             return False
         return bool(dev.get("state", False))
 
-    @property
+    @snapshot_property
     def brightness(self) -> int | None:
         """
         0..255 (HA) <-> 0..100 (API)
@@ -170,7 +106,7 @@ class SinumRGBControllerLight(CoordinatorEntity, LightEntity):
         api_bri = dev.get("brightness", 100)
         return round(api_bri * 255 / 100)
 
-    @property
+    @snapshot_property
     def hs_color(self) -> tuple[float, float] | None:
         """
         Itt a lényeg: a JSON-ban a szín a "led_color" mezőben van.
@@ -191,7 +127,7 @@ class SinumRGBControllerLight(CoordinatorEntity, LightEntity):
             return (h*360, s*100)
         return None
 
-    @property
+    @snapshot_property
     def color_temp(self) -> int | None:
         """
         Kelvin => HA mired.
@@ -207,7 +143,7 @@ class SinumRGBControllerLight(CoordinatorEntity, LightEntity):
             return None
         return int(1_000_000 / kelvin)
 
-    @property
+    @snapshot_property
     def color_mode(self) -> str:
         """
         dev["color_mode"] == "temperature" => COLOR_MODE_COLOR_TEMP,
@@ -221,30 +157,61 @@ class SinumRGBControllerLight(CoordinatorEntity, LightEntity):
             return COLOR_MODE_COLOR_TEMP
         return COLOR_MODE_HS
 
-    async def async_turn_on(self, **kwargs) -> None:
-        """Bekapcsolás + paraméterek."""
-        # 1) Bekapcs
-        await self._send_command("turn_on", {})
+    async def async_turn_on(self, **kwargs):
+        """
+        Bekapcsolás + paraméterek.
+        Csak a ténylegesen szükséges parancsokat küldjük el (a pillanatkép alapján),
+        egymás után, a korábbi sorrendben (turn_on, fényerő, színhőmérséklet, szín):
+        a hub a fényerőt és a színt ugyanazon a kimeneten állítja, és a HEX szín
+        a fényerőből számolódik, így párhuzamosan küldve a később beérkező
+        parancs felülírhatná a másikat. Egy elutasított parancs után a többit nem küldjük.
+        :return: a hub utolsó válasza (üres dict, ha nem kellett parancs), vagy None,
+                 ha a hub egy parancsot nem fogadott el (mint a többi entitás parancsainál)
+        """
+        dev = self._find_device_in_coordinator() or {}
+        commands = self._plan_turn_on_commands(dev, kwargs)
+        if not commands:
+            _LOGGER.debug("turn_on for %s/%s is a no-op, nothing sent", self._device_class, self._device_id)
+            return {}
+
+        result = None
+        for command, payload in commands:
+            result = await self._send_command(command, payload)
+            if result is None:
+                return None
+        return result
+
+    def _plan_turn_on_commands(self, dev, kwargs) -> list:
+        """
+        A turn_on híváshoz szükséges minimális parancslista: (command, payload) párok.
+        Kihagyjuk azt, ami már a kért állapotban van (pl. bekapcsolt lámpa,
+        változatlan fényerő / szín).
+        """
+        commands = []
+        is_on = bool(dev.get("state", False))
+        if not is_on:
+            commands.append(("turn_on", {}))
 
-        # 2) Összerakjuk a brightness factor-t
+        # Brightness factor összerakása (a HEX színbe is ez kerül)
         new_ha_bri = kwargs.get(ATTR_BRIGHTNESS)
         if new_ha_bri is None:
-            old_dev_bri_100 = self._get_device_brightness_100()
+            old_dev_bri_100 = dev.get("brightness", 100)
             old_ha_bri_255 = round(old_dev_bri_100 * 255 / 100)
             brightness_factor = old_ha_bri_255 / 255
         else:
             brightness_factor = new_ha_bri / 255
-            # Elküldjük a set_brightness parancsot
             api_bri = round(new_ha_bri * 100 / 255)
-            await self._send_command("set_brightness", [api_bri])
+            if api_bri != dev.get("brightness"):
+                commands.append(("set_brightness", [api_bri]))
 
-        # 3) color_temp
+        # color_temp
         if ATTR_COLOR_TEMP in kwargs and COLOR_MODE_COLOR_TEMP in self._attr_supported_color_modes:
             mired = kwargs[ATTR_COLOR_TEMP]
             kelvin = round(1_000_000 / mired)
-            await self._send_command("set_temperature", [kelvin])
+            if kelvin != dev.get("white_temperature") or dev.get("color_mode") != "temperature":
+                commands.append(("set_temperature", [kelvin]))
 
-        # 4) hs_color
+        # hs_color
         if ATTR_HS_COLOR in kwargs:
             (hh, ss) = kwargs[ATTR_HS_COLOR]
             h = hh / 360.0
@@ -255,33 +222,21 @@ class SinumRGBControllerLight(CoordinatorEntity, LightEntity):
             bb = round(b*255)
             hex_str = f"#{rr:02x}{gg:02x}{bb:02x}"
 
-            await self._send_command("set_color", [hex_str])
+            current = str(dev.get("led_color", "")).lower()
+            if hex_str != current or dev.get("color_mode") == "temperature":
+                commands.append(("set_color", [hex_str]))
 
-        await self.coordinator.async_request_refresh()
+        return commands
 
-    async def async_turn_off(self, **kwargs) -> None:
+    async def async_turn_off(self, **kwargs):
         """Kikapcs."""
-        await self._send_command("turn_off", {})
-        await self.coordinator.async_request_refresh()
-
-    def _get_device_brightness_100(self) -> int:
-        """
-        Lekérdezzük a koordinátor adatából a brightness mezőt (0..100).
-        Ha nincs, 100 a default.
-        """
-        dev = self._find_device_in_coordinator()
-        if not dev:
-            return 100
-        return dev.get("brightness", 100)
+        return await self._send_command("turn_off", {})
 
     async def _send_command(self, command: str, payload_data):
         """
         POST /devices/<class>/<id>/command/<command>, body=...
+        (a SinumAPI közös, keep-alive session-jén keresztül)
         """
-        import aiohttp
-
-        url = f"{self._api.base_url}/devices/{self._device_class}/{self._device_id}/command/{command}"
-
         body = {}
         if command == "set_color":
             body = {"set_color": payload_data}
@@ -292,15 +247,23 @@ class SinumRGBControllerLight(CoordinatorEntity, LightEntity):
 
         _LOGGER.debug("Sending command=%s body=%s to device=%s/%s", command, body, self._device_class, self._device_id)
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(
-                    url,
-                    headers=self._api.headers,
-                    json=body
-                ) as resp:
-                    resp.raise_for_status()
-                    return await resp.json()
-            except Exception as e:
-                _LOGGER.debug("Error sending %s command: %s", command, e)
-                return None
\ No newline at end of file
+        return await self.coordinator.async_command(
+            self._device_class, self._device_id,
+            self._api.send_device_command(self._device_class, self._device_id, command, body),
+            _expected_state(command, payload_data),
+        )
+
+
+def _expected_state(command: str, payload_data) -> dict:
+    """Egy rgb_controller parancs után várható eszközmezők (optimista állapothoz)."""
+    if command == "turn_on":
+        return {"state": True}
+    if command == "turn_off":
+        return {"state": False}
+    if command == "set_brightness":
+        return {"brightness": payload_data[0]}
+    if command == "set_temperature":
+        return {"white_temperature": payload_data[0], "color_mode": "temperature"}
+    if command == "set_color":
+        return {"led_color": payload_data[0], "color_mode": "rgb"}
+    return {}
\ No newline at end of file
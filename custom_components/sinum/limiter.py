@@ -0,0 +1,152 @@
+import asyncio
+import time
+
+from .const import (
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_REQUESTS_PER_SECOND,
+    MAX_GLOBAL_CONCURRENT_REQUESTS,
+)
+
+# A kihasználtságot ilyen hosszú ablakokban számoljuk
+USAGE_WINDOW = 60.0
+
+
+class SharedRequestLimit:
+    """
+    Az összes hub közös párhuzamossági korlátja (egy HA példányon belül).
+
+    Több hub esetén a lekérdezések egymástól függetlenül, párhuzamosan futnak;
+    ez a korlát fogja össze, hogy egyszerre összesen legfeljebb
+    'max_concurrency' kérés legyen úton (a HA eseményhurka és a hálózat felé).
+    """
+
+    def __init__(self, max_concurrency: int = MAX_GLOBAL_CONCURRENT_REQUESTS):
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.waited = 0
+
+    async def acquire(self):
+        if self._semaphore.locked():
+            self.waited += 1
+        await self._semaphore.acquire()
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def release(self):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def as_dict(self) -> dict:
+        return {
+            "max_concurrent_requests": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "waited": self.waited,
+        }
+
+
+class RequestBudget:
+    """
+    Hubonkénti kérés-keret: token bucket (kérés / másodperc) és párhuzamossági korlát.
+
+    Minden HTTP kérés (lekérdezés és parancs) ezen megy át, így a platformok,
+    a lekérdezés és a parancsok együtt sem terhelik túl a beágyazott hubot.
+    A vödör 'rate' tokennel töltődik másodpercenként, legfeljebb 'burst' tokenig;
+    ha nincs token, a kérés megvárja a következőt (nem dobjuk el).
+    A 'shared' (SharedRequestLimit) a hubok közös korlátja, ha több hub van.
+
+    Használat: async with budget: ...
+    """
+
+    def __init__(self, rate: float = DEFAULT_MAX_REQUESTS_PER_SECOND,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+                 burst: float | None = None, clock=time.monotonic,
+                 shared: SharedRequestLimit | None = None):
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self.max_concurrency = max_concurrency
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.shared = shared
+        self._lock = asyncio.Lock()
+        # Statisztika
+        self.granted = 0
+        self.throttled = 0
+        self.wait_time = 0.0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._window_start = self._updated
+        self._window_count = 0
+        self._last_window_usage = None
+
+    async def __aenter__(self):
+        started = self._clock()
+        await self._take_token()
+        await self._semaphore.acquire()
+        if self.shared is not None:
+            try:
+                await self.shared.acquire()
+            except BaseException:
+                self._semaphore.release()
+                raise
+        waited = self._clock() - started
+        if waited > 0.001:
+            self.throttled += 1
+            self.wait_time += waited
+        self.granted += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        self._count_in_window()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.in_flight -= 1
+        if self.shared is not None:
+            self.shared.release()
+        self._semaphore.release()
+
+    async def _take_token(self):
+        # A zár sorba állítja a várakozókat, így a tokenek érkezési sorrendben fogynak
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _count_in_window(self):
+        now = self._clock()
+        if now - self._window_start >= USAGE_WINDOW:
+            self._last_window_usage = self._window_count / ((now - self._window_start) * self.rate)
+            self._window_start = now
+            self._window_count = 0
+        self._window_count += 1
+
+    @property
+    def usage(self) -> float | None:
+        """Az előző USAGE_WINDOW ablakban felhasznált keret aránya (0..1), ha már van ilyen."""
+        return self._last_window_usage
+
+    def as_dict(self) -> dict:
+        self._refill()
+        return {
+            "max_requests_per_second": self.rate,
+            "burst": self.burst,
+            "max_concurrent_requests": self.max_concurrency,
+            "tokens_available": round(self._tokens, 2),
+            "usage": None if self.usage is None else round(self.usage, 3),
+            "granted": self.granted,
+            "throttled": self.throttled,
+            "wait_time_s": round(self.wait_time, 3),
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+        }
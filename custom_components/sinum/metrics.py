@@ -0,0 +1,156 @@
+import bisect
+
+# A hisztogramok vödreinek felső határai ezredmásodpercben (az utolsó vödör: e fölött)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+DECODE_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100)
+
+
+class LatencyHistogram:
+    """
+    Fix vödrös késleltetés-hisztogram, állandó memóriával.
+    A percentiliseket a vödrön belüli lineáris interpolációval becsüli.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds: tuple = LATENCY_BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value_ms: float):
+        self.counts[bisect.bisect_left(self.bounds, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def percentile(self, percent: float) -> float | None:
+        if not self.count:
+            return None
+        rank = percent / 100 * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if not bucket_count:
+                continue
+            if seen + bucket_count >= rank:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                upper = min(upper, self.max)
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.max
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 3) if self.count else None,
+            "p50_ms": _round(self.percentile(50)),
+            "p95_ms": _round(self.percentile(95)),
+            "p99_ms": _round(self.percentile(99)),
+            "max_ms": round(self.max, 3),
+            "buckets": {
+                (f"<={bound}" if bound is not None else f">{self.bounds[-1]}"): count
+                for bound, count in zip(self.bounds + (None,), self.counts)
+            },
+        }
+
+
+class EndpointStats:
+    """
+    Egy végpont számlálói: kérések, push üzenetek, hibák, időtúllépések, méret,
+    dekódolási idő.
+    """
+
+    __slots__ = ("requests", "messages", "errors", "timeouts", "bytes", "last_bytes", "latency", "decode",
+                 "last_error")
+
+    def __init__(self):
+        self.requests = 0
+        # A hubtól kérés nélkül érkező (push) üzenetek; nem kérések
+        self.messages = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.bytes = 0
+        self.last_bytes = None
+        self.latency = LatencyHistogram()
+        self.decode = LatencyHistogram(DECODE_BUCKETS_MS)
+        self.last_error = None
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "messages": self.messages,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "bytes_received": self.bytes,
+            "last_response_bytes": self.last_bytes,
+            "latency": self.latency.as_dict(),
+            "decode": self.decode.as_dict(),
+            "last_error": self.last_error,
+        }
+
+
+class ApiMetrics:
+    """
+    Végpontonkénti teljesítménystatisztika egy hubhoz (SinumAPI.metrics).
+    A végpontok neve pl. 'GET devices/virtual', 'PATCH devices/virtual',
+    'POST command/turn_on'.
+    """
+
+    def __init__(self):
+        self.endpoints = {}
+
+    def endpoint(self, name: str) -> EndpointStats:
+        stats = self.endpoints.get(name)
+        if stats is None:
+            stats = self.endpoints[name] = EndpointStats()
+        return stats
+
+    def record_response(self, name: str, duration: float, size: int):
+        stats = self.endpoint(name)
+        stats.requests += 1
+        stats.bytes += size
+        stats.last_bytes = size
+        stats.latency.add(duration * 1000)
+
+    def record_message(self, name: str, size: int):
+        """Egy push üzenet (nincs hozzá kérés, így késleltetés sem)."""
+        stats = self.endpoint(name)
+        stats.messages += 1
+        stats.bytes += size
+        stats.last_bytes = size
+
+    def record_error(self, name: str, duration: float, error: BaseException, timeout: bool = False):
+        stats = self.endpoint(name)
+        stats.requests += 1
+        stats.errors += 1
+        if timeout:
+            stats.timeouts += 1
+        stats.latency.add(duration * 1000)
+        stats.last_error = f"{type(error).__name__}: {error}"[:200]
+
+    def record_decode(self, name: str, duration: float):
+        self.endpoint(name).decode.add(duration * 1000)
+
+    def totals(self) -> dict:
+        """Összesítés az összes végpontra."""
+        return {
+            "requests": sum(s.requests for s in self.endpoints.values()),
+            "messages": sum(s.messages for s in self.endpoints.values()),
+            "errors": sum(s.errors for s in self.endpoints.values()),
+            "timeouts": sum(s.timeouts for s in self.endpoints.values()),
+            "bytes_received": sum(s.bytes for s in self.endpoints.values()),
+        }
+
+    def as_dict(self) -> dict:
+        return {
+            "totals": self.totals(),
+            "endpoints": {name: stats.as_dict() for name, stats in sorted(self.endpoints.items())},
+        }
+
+
+def _round(value):
+    return None if value is None else round(value, 3)
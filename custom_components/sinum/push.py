@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import random
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+
+from .const import PUSH_RECONNECT_MAX, PUSH_RECONNECT_MIN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SinumEventStream:
+    """
+    A hub eseményfolyamának (push) kezelője.
+
+    A SinumAPI.async_listen_events-en keresztül kapott eszközváltozásokat
+    közvetlenül a koordinátor pillanatképébe írja. Amíg a kapcsolat él,
+    a koordinátor csak ritkán egyeztet lekérdezéssel; ha megszakad,
+    azonnal lekérdez és visszaáll a normál (adaptív) ütemezésre, közben
+    exponenciális várakozással (és szórással) próbál újrakapcsolódni.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, coordinator):
+        self._hass = hass
+        self._entry = entry
+        self._coordinator = coordinator
+        self._task = None
+        self.healthy = False
+        self.events_received = 0
+
+    def start(self):
+        if self._task is None:
+            self._task = self._entry.async_create_background_task(
+                self._hass, self._run(), name=f"sinum event stream {self._entry.title}"
+            )
+
+    async def async_stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Leállításkor nem kérünk új lekérdezést
+        self.healthy = False
+        self._coordinator.scheduler.push_active = False
+
+    async def _run(self):
+        delay = PUSH_RECONNECT_MIN.total_seconds()
+        while True:
+            try:
+                await self._coordinator.api.async_listen_events(self._on_connected, self._on_event)
+                _LOGGER.debug("Event stream closed by the hub")
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                _LOGGER.debug("Event stream unavailable: %s", err)
+
+            if self.healthy:
+                # Élő kapcsolat szakadt meg: kezdjük elölről a várakozást
+                delay = PUSH_RECONNECT_MIN.total_seconds()
+            self._set_healthy(False)
+
+            await asyncio.sleep(delay * random.uniform(0.8, 1.2))
+            delay = min(delay * 2, PUSH_RECONNECT_MAX.total_seconds())
+
+    @callback
+    def _on_connected(self):
+        self._set_healthy(True)
+
+    @callback
+    def _on_event(self, device_class: str, device_id, fields: dict):
+        self.events_received += 1
+        self._coordinator.async_apply_event(device_class, device_id, fields)
+
+    def _set_healthy(self, healthy: bool):
+        if healthy == self.healthy:
+            return
+        self.healthy = healthy
+        self._coordinator.scheduler.push_active = healthy
+        if healthy:
+            _LOGGER.info("Connected to the SINUM event stream, polling reduced to reconciliation")
+        else:
+            _LOGGER.info("SINUM event stream lost, resuming regular polling")
+            # Azonnal lekérdezünk, hogy a kiesés alatti változások se vesszenek el
+            self._hass.async_create_task(self._coordinator.async_request_refresh())
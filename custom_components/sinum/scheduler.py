@@ -0,0 +1,203 @@
+import logging
+import time
+
+from .const import (
+    BOOST_DURATION,
+    BOOST_INTERVAL_FACTOR,
+    CHANGE_BOOST_DURATION,
+    CONF_FAST_POLL_INTERVAL,
+    CONF_MEDIUM_POLL_INTERVAL,
+    CONF_SLOW_POLL_INTERVAL,
+    DEFAULT_DEVICE_TIER,
+    DEFAULT_TIER_INTERVALS,
+    DEVICE_TYPE_TIERS,
+    FAST_SCAN_INTERVAL,
+    MAX_SCAN_INTERVAL,
+    PUSH_RECONCILE_INTERVAL,
+    QUIET_AFTER,
+    QUIET_INTERVAL_FACTOR,
+    SLOW_RESPONSE_TIME,
+    TIER_FAST,
+    TIER_MEDIUM,
+    TIER_SLOW,
+    TIERS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# AIMD: hiba / lassú válasz esetén szorzással lassítunk, egészséges ciklus után lépésenként gyorsítunk vissza
+BACKOFF_MULTIPLIER = 2.0
+BACKOFF_RECOVERY_STEP = 0.25
+MAX_BACKOFF_FACTOR = 8.0
+
+# A hub végpontjai, amiket a koordinátor lekérdez
+ENDPOINTS = ("virtual", "sbus", "wtp")
+# Ennyivel korábban esedékes végpontot is vele kérdezünk (ne legyen külön kérés pár ms múlva)
+DUE_TOLERANCE = 0.25
+
+# Opció -> szint
+TIER_OPTIONS = {
+    CONF_FAST_POLL_INTERVAL: TIER_FAST,
+    CONF_MEDIUM_POLL_INTERVAL: TIER_MEDIUM,
+    CONF_SLOW_POLL_INTERVAL: TIER_SLOW,
+}
+
+
+def tier_intervals_from_options(options) -> dict:
+    """A config entry opcióiból a szintek időközei másodpercben (hiányzó opció: alapérték)."""
+    return {
+        tier: float(options.get(option, DEFAULT_TIER_INTERVALS[tier].total_seconds()))
+        for option, tier in TIER_OPTIONS.items()
+    }
+
+
+class AdaptivePollScheduler:
+    """
+    Adaptív, végpontonkénti lekérdezési ütemező a hub koordinátorhoz.
+
+    - Minden végpont (virtual / sbus / wtp) a rajta lévő eszköztípusok közül a
+      leggyorsabb szint (fast / medium / slow, lásd DEVICE_TYPE_TIERS) szerint
+      frissül; a szintek időközei az opciókban állíthatók.
+    - A végpontok fázisai el vannak tolva egymástól, hogy a kérések ne egyszerre érkezzenek.
+    - Frissítéskérés után minden végpontot azonnal lekérdez, majd rövid ideig
+      (BOOST_DURATION) gyorsabban; észlelt állapotváltozás után csak azt a végpontot,
+      amelyiken a változás volt. A gyorsítás a szinten belül marad: a végpont a saját
+      szintje időközének BOOST_INTERVAL_FACTOR-szorosával frissül (legalább FAST).
+    - Csendes időszakban (QUIET_AFTER óta nincs változás) minden végpont a szintje
+      időközének QUIET_INTERVAL_FACTOR-szorosával frissül, legfeljebb MAX_SCAN_INTERVAL-lal
+      (a szint ennél hosszabb saját időközét nem rövidíti).
+    - Ha a hub lassan válaszol vagy hibázik, AIMD szerint visszavesz:
+      a szorzó hibánként duplázódik, egészséges ciklusonként lépésenként csökken.
+    - Amíg a push eseményfolyam él (push_active), csak ritka egyeztető
+      lekérdezés kell (PUSH_RECONCILE_INTERVAL), minden végpontra.
+    """
+
+    def __init__(self, clock=time.monotonic, tier_intervals: dict | None = None):
+        self._clock = clock
+        now = clock()
+        self._boost_until = 0.0
+        self._last_change = now
+        self._backoff = 1.0
+        self.push_active = False
+        self._tier_intervals = {
+            tier: interval.total_seconds() for tier, interval in DEFAULT_TIER_INTERVALS.items()
+        }
+        self._endpoint_tiers = {endpoint: DEFAULT_DEVICE_TIER for endpoint in ENDPOINTS}
+        self._next_due = {endpoint: now for endpoint in ENDPOINTS}
+        self._endpoint_boost_until = {}
+        if tier_intervals:
+            self.set_tier_intervals(tier_intervals)
+
+    @property
+    def backoff_factor(self) -> float:
+        return self._backoff
+
+    @property
+    def endpoint_tiers(self) -> dict:
+        return dict(self._endpoint_tiers)
+
+    def set_tier_intervals(self, tier_intervals: dict):
+        """
+        A szintek időközeinek módosítása (másodperc), újraindítás nélkül.
+        A végpontok fázisait újra elosztjuk az új időközök szerint.
+        """
+        for tier in TIERS:
+            if tier in tier_intervals:
+                self._tier_intervals[tier] = float(tier_intervals[tier])
+        self._stagger()
+
+    def assign_tiers(self, snapshot):
+        """A végpontok szintjének frissítése a pillanatképben lévő eszköztípusok alapján."""
+        tiers = {}
+        for dev in snapshot.virtual + snapshot.sbus_wtp:
+            endpoint = dev.get("class")
+            tier = DEVICE_TYPE_TIERS.get(dev.get("type"), DEFAULT_DEVICE_TIER)
+            if endpoint not in tiers or TIERS.index(tier) < TIERS.index(tiers[endpoint]):
+                tiers[endpoint] = tier
+        # Üres végpontot is figyelünk (új eszköz), de csak a leglassabb szinten
+        tiers = {endpoint: tiers.get(endpoint, TIERS[-1]) for endpoint in ENDPOINTS}
+        if tiers != self._endpoint_tiers:
+            _LOGGER.debug("Polling tiers per endpoint: %s", tiers)
+            self._endpoint_tiers = tiers
+            self._stagger()
+
+    def _stagger(self):
+        """
+        Az azonos szintű végpontok első esedékességét egyenletesen elosztjuk az
+        időközön belül, a szinteket pedig egymáshoz képest is eltoljuk.
+        """
+        now = self._clock()
+        for tier_index, tier in enumerate(TIERS):
+            endpoints = [ep for ep in ENDPOINTS if self._endpoint_tiers[ep] == tier]
+            interval = self._tier_intervals[tier]
+            for i, endpoint in enumerate(endpoints):
+                phase = (i + tier_index / len(TIERS)) / len(endpoints)
+                self._next_due[endpoint] = min(self._next_due[endpoint], now + interval * phase)
+
+    def note_activity(self):
+        """Frissítéskérés: most minden végpont esedékes, utána BOOST_DURATION ideig gyorsabb lekérdezés."""
+        now = self._clock()
+        self._boost_until = now + BOOST_DURATION.total_seconds()
+        self.mark_due(ENDPOINTS)
+
+    def mark_due(self, endpoints):
+        """A megadott végpontok a következő lekérdezésben esedékesek (gyorsítás nélkül, pl. tömeges parancs után)."""
+        now = self._clock()
+        for endpoint in endpoints:
+            if endpoint in self._next_due:
+                self._next_due[endpoint] = now
+
+    def due_endpoints(self) -> list:
+        """A most lekérdezendő végpontok (legalább egy)."""
+        now = self._clock()
+        if self.push_active:
+            return list(ENDPOINTS)
+        due = [ep for ep in ENDPOINTS if self._next_due[ep] <= now + DUE_TOLERANCE]
+        return due or [min(ENDPOINTS, key=self._next_due.get)]
+
+    def note_poll(self, duration: float, ok: bool, changed_endpoints=(), endpoints=ENDPOINTS):
+        """
+        Egy lekérdezési ciklus eredménye.
+        :param duration: a ciklus ideje másodpercben
+        :param ok: sikeres volt-e minden kérés
+        :param changed_endpoints: azok a végpontok, amelyeken változott eszköz
+        :param endpoints: a ciklusban lekérdezett végpontok
+        """
+        now = self._clock()
+        for endpoint in changed_endpoints:
+            self._last_change = now
+            # A változás gyakran újabbat hoz (pl. mozgó redőny), egy rövid ideig ezt a
+            # végpontot gyorsan kérdezzük; a többi marad a saját szintjén
+            self._endpoint_boost_until[endpoint] = now + CHANGE_BOOST_DURATION.total_seconds()
+
+        if not ok or duration > SLOW_RESPONSE_TIME.total_seconds():
+            previous = self._backoff
+            self._backoff = min(MAX_BACKOFF_FACTOR, self._backoff * BACKOFF_MULTIPLIER)
+            if self._backoff != previous:
+                _LOGGER.debug(
+                    "Hub slow or failing (ok=%s, %.2fs), backing off x%.2f", ok, duration, self._backoff
+                )
+        else:
+            self._backoff = max(1.0, self._backoff - BACKOFF_RECOVERY_STEP)
+
+        for endpoint in endpoints:
+            self._next_due[endpoint] = now + self._endpoint_interval(endpoint, now)
+
+    def _endpoint_interval(self, endpoint: str, now: float) -> float:
+        tier = self._endpoint_tiers[endpoint]
+        interval = self._tier_intervals[tier]
+        if now < max(self._boost_until, self._endpoint_boost_until.get(endpoint, 0.0)):
+            # A szinten belül gyorsítunk: a lassú szint végpontja gyorsítva is ritkábban frissül
+            interval = min(interval, max(FAST_SCAN_INTERVAL.total_seconds(), interval * BOOST_INTERVAL_FACTOR))
+        elif now - self._last_change >= QUIET_AFTER.total_seconds():
+            interval = min(interval * QUIET_INTERVAL_FACTOR, max(interval, MAX_SCAN_INTERVAL.total_seconds()))
+        # A visszavett időköz legfeljebb MAX_SCAN_INTERVAL (vagy a szint saját, hosszabb időköze)
+        return min(max(interval, MAX_SCAN_INTERVAL.total_seconds()), interval * self._backoff)
+
+    def next_interval(self) -> float:
+        """A következő lekérdezésig hátralévő idő másodpercben."""
+        if self.push_active:
+            return PUSH_RECONCILE_INTERVAL.total_seconds()
+        now = self._clock()
+        next_due = min(self._next_due.values()) - now
+        return max(FAST_SCAN_INTERVAL.total_seconds(), next_due)
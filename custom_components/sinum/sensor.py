@@ -1,18 +1,15 @@
 import logging
-from datetime import timedelta
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-)
-from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
-from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, SensorStateClass
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
-from .api import SinumAPI
 from .const import DOMAIN
+from .entity import SinumEntity, snapshot_property
+from .history import FieldHistory
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,202 +20,134 @@ async def async_setup_entry(
 ) -> None:
     """Set up sensor platform from config entry."""
 
-    ip = config_entry.data["ip"]
-    token = config_entry.data["token"]
-    api = SinumAPI(ip, token)
-
-    #----------------------------------------------------------------
-    # 1) Thermostat coordinator (virtuális eszközök)
-    #----------------------------------------------------------------
-    thermostat_coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name="SINUM Thermostat Coordinator",
-        update_method=api.get_virtual_devices,  # -> /devices/virtual
-        update_interval=timedelta(seconds=2),
-    )
-
-    # Első frissítés (ha nem sikerül, ConfigEntryNotReady)
-    try:
-        await thermostat_coordinator.async_config_entry_first_refresh()
-    except Exception as err:
-        _LOGGER.warning("Thermostat devices fetch failed: %s", err)
-        raise ConfigEntryNotReady("Thermostat fetch error") from err
-
-    devices_thermostat = thermostat_coordinator.data or []
-
-    #----------------------------------------------------------------
-    # 2) SBUS + WTP coordinator
-    #----------------------------------------------------------------
-    sbus_wtp_coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name="SINUM SbusWtp Coordinator",
-        update_method=_fetch_sbus_wtp_sensors(api),
-        update_interval=timedelta(seconds=2),
-    )
-
-    try:
-        await sbus_wtp_coordinator.async_config_entry_first_refresh()
-    except Exception as err:
-        _LOGGER.warning("Sbus/WTP devices fetch failed: %s", err)
-        raise ConfigEntryNotReady("Sbus/WTP fetch error") from err
-
-    devices_sbus_wtp = sbus_wtp_coordinator.data or []
-    _LOGGER.debug(f"SBUS/WTP devices: {devices_sbus_wtp}")
-    #----------------------------------------------------------------
-    # 3) Építjük az entitáslistát
-    #----------------------------------------------------------------
-    entities = []
-
-    # 3/A) Thermostat-szenzorok
-    thermostat_count = 0
-    for device in devices_thermostat:
-        if device.get("type") == "thermostat":
-            thermostat_count += 1
-            name_in_api = device.get("name", "")
-            if not name_in_api:
-                name_in_api = f"thermostat{thermostat_count}"
-
+    # A közös hub koordinátor (lásd __init__.py) már lefutott az első frissítéssel
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    # A név nélküli termosztátok sorszáma eszközönként (id -> N): egy eltávolított,
+    # majd visszatérő termosztát ugyanazt a "thermostatN" nevet kapja
+    thermostat_numbers = {}
+
+    def _statistics_for(device, base_name, source):
+        """A mező statisztika-szenzorai, közös gyűrűpufferrel (lásd FieldStatisticSensor)."""
+        history = FieldHistory()
+        return [
+            FieldStatisticSensor(coordinator, device, base_name, source, history, *statistic)
+            for statistic in FIELD_STATISTICS
+        ]
+
+    def _entities_for(snapshot):
+        #----------------------------------------------------------------
+        # Építjük az entitáslistát
+        #----------------------------------------------------------------
+        entities = []
+
+        # A) Thermostat-szenzorok
+        for device in snapshot.virtual:
+            if device.get("type") == "thermostat":
+                number = thermostat_numbers.setdefault(device.get("id"), len(thermostat_numbers) + 1)
+                name_in_api = device.get("name", "")
+                if not name_in_api:
+                    name_in_api = f"thermostat{number}"
+
+                base_name = name_in_api.lower().replace(" ", "_")
+
+                # 4 szenzor: temp, humidity, mode, tempsetpoint
+                entities.append(ThermostatTempSensor(coordinator, device, base_name))
+                entities.append(ThermostatHumiditySensor(coordinator, device, base_name))
+                entities.append(ThermostatModeSensor(coordinator, device, base_name))
+                entities.append(ThermostatTempSetpointSensor(coordinator, device, base_name))
+
+                # Származtatott statisztikák (alapból letiltva)
+                entities.extend(_statistics_for(device, base_name, THERMOSTAT_TEMPERATURE))
+                entities.extend(_statistics_for(device, base_name, THERMOSTAT_HUMIDITY))
+
+        # B) SBUS/WTP-szenzorok (temperature_sensor, humidity_sensor, light_sensor)
+        for dev in snapshot.sbus_wtp:
+            dev_type = dev.get("type")
+            name_in_api = dev.get("name", "unknown_sensor")
             base_name = name_in_api.lower().replace(" ", "_")
 
-            # 4 szenzor: temp, humidity, mode, tempsetpoint
-            entities.append(ThermostatTempSensor(thermostat_coordinator, device, base_name))
-            entities.append(ThermostatHumiditySensor(thermostat_coordinator, device, base_name))
-            entities.append(ThermostatModeSensor(thermostat_coordinator, device, base_name))
-            entities.append(ThermostatTempSetpointSensor(thermostat_coordinator, device, base_name))
-
-    # 3/B) SBUS/WTP-szenzorok (temperature_sensor, humidity_sensor, light_sensor)
-    for dev in devices_sbus_wtp:
-        dev_type = dev.get("type")
-        name_in_api = dev.get("name", "unknown_sensor")
-        base_name = name_in_api.lower().replace(" ", "_")
-
-        if dev_type == "temperature_sensor":
-            entities.append(SbusWtpTemperatureSensor(sbus_wtp_coordinator, dev, base_name))
-        elif dev_type == "humidity_sensor":
-            entities.append(SbusWtpHumiditySensor(sbus_wtp_coordinator, dev, base_name))
-        elif dev_type == "light_sensor":
-            entities.append(SbusWtpLightSensor(sbus_wtp_coordinator, dev, base_name))
-        # Ha később bővülne, itt is folytathatod.
-
-    # 3/C) Battery-szenzorok hozzáadása
-    seen_addresses = set()
-    for dev in devices_sbus_wtp:
-        if "battery" not in dev:
-            continue  # Csak azok a szenzorok, amelyeknek van battery mezőjük
-
-        address = dev.get("address")
-        if address is None:
-            _LOGGER.warning(f"Device {dev.get('id')} missing 'address' field. Skipping battery sensor.")
-            continue  # 'address' mező hiányzik
-
-        if address in seen_addresses:
-            _LOGGER.debug(f"Skipping device with duplicate address: {address}")
-            continue  # Már létrehoztunk egy szenzort ehhez az address-hez
-
-        seen_addresses.add(address)
-
-        software_version = dev.get("software_version", "unknown_version")
-        # Az entitás nevéhez használhatjuk a 'name' mezőt is, ha egyedi
-        sensor_name = f"{software_version}_battery".lower().replace(" ", "_")
-
-        entities.append(
-            BatterySensor(sbus_wtp_coordinator, dev, sensor_name)
-        )
+            if dev_type == "temperature_sensor":
+                entities.append(SbusWtpTemperatureSensor(coordinator, dev, base_name))
+                entities.extend(_statistics_for(dev, base_name, SBUS_WTP_TEMPERATURE))
+            elif dev_type == "humidity_sensor":
+                entities.append(SbusWtpHumiditySensor(coordinator, dev, base_name))
+                entities.extend(_statistics_for(dev, base_name, SBUS_WTP_HUMIDITY))
+            elif dev_type == "light_sensor":
+                entities.append(SbusWtpLightSensor(coordinator, dev, base_name))
+                entities.extend(_statistics_for(dev, base_name, SBUS_WTP_ILLUMINANCE))
+            # Ha később bővülne, itt is folytathatod.
+
+        # C) Battery-szenzorok hozzáadása; címenként egy, a meglévő (el nem távolított) eszközökét is nézve
+        seen_addresses = {
+            entity._address for entity in coordinator.device_entities() if isinstance(entity, BatterySensor)
+        }
+        for dev in snapshot.sbus_wtp:
+            if "battery" not in dev:
+                continue  # Csak azok a szenzorok, amelyeknek van battery mezőjük
+
+            address = dev.get("address")
+            if address is None:
+                _LOGGER.warning(f"Device {dev.get('id')} missing 'address' field. Skipping battery sensor.")
+                continue  # 'address' mező hiányzik
+
+            if address in seen_addresses:
+                _LOGGER.debug(f"Skipping device with duplicate address: {address}")
+                continue  # Már létrehoztunk egy szenzort ehhez az address-hez
+
+            seen_addresses.add(address)
+
+            software_version = dev.get("software_version", "unknown_version")
+            # Az entitás nevéhez használhatjuk a 'name' mezőt is, ha egyedi
+            sensor_name = f"{software_version}_battery".lower().replace(" ", "_")
+
+            entities.append(
+                BatterySensor(coordinator, dev, sensor_name)
+            )
+
+        return entities
 
     #----------------------------------------------------------------
-    # 4) Regisztráljuk az entitásokat
+    # Regisztráljuk az entitásokat; később megjelenő eszközökhöz a
+    # koordinátor hívja újra (újratöltés nélkül)
     #----------------------------------------------------------------
-    async_add_entities(entities, update_before_add=True)
+    coordinator.async_add_platform_entities(async_add_entities, _entities_for)
 
-
-def _fetch_sbus_wtp_sensors(api: SinumAPI):
-    """
-    Egy factory-függvény, ami visszaad egy aszinkron '_async_fetch_sbus_wtp'
-    metódust, amit a DataUpdateCoordinator hív meg periodikusan.
-
-    Ebben gyűjtjük a sbus és wtp eszközöket, és visszaadjuk a listát,
-    amiben lehet "temperature_sensor", "humidity_sensor", "light_sensor", stb.
-    """
-    async def _async_fetch_sbus_wtp():
-        sbus_list = await api.get_sbus_devices()
-        wtp_list = await api.get_wtp_devices()
-        _LOGGER.debug(f"SBUS devices: {sbus_list}")
-        _LOGGER.debug(f"WTP devices: {wtp_list}")
-        # Összefésüljük a két listát
-        combined = sbus_list + wtp_list
-        _LOGGER.debug(f"Combined device list: {combined}")
-        return combined
-
-    return _async_fetch_sbus_wtp
+    # D) Hub diagnosztika (alapból letiltva, a hub eszköz alatt engedélyezhető)
+    diagnostics = []
+    for endpoint in ("virtual", "sbus", "wtp"):
+        diagnostics.append(HubEndpointLatencySensor(coordinator, config_entry, endpoint))
+    for description in HUB_COUNTER_SENSORS:
+        diagnostics.append(HubCounterSensor(coordinator, config_entry, *description))
+    diagnostics.append(HubBudgetUsageSensor(coordinator, config_entry))
+    async_add_entities(diagnostics)
 
 
 #----------------------------------------------------------------
 #                          BASE CLASSES
 #----------------------------------------------------------------
 
-class ThermostatBase(CoordinatorEntity, SensorEntity):
+class ThermostatBase(SinumEntity, SensorEntity):
     """Alap osztály a thermostat-szenzorokhoz (virtuális eszköz)."""
 
     def __init__(self, coordinator, device, base_name):
-        super().__init__(coordinator)
+        super().__init__(coordinator, device)
         self._device = device
-        self._device_id = device.get("id")
         self._base_name = base_name
 
-    def _find_device_in_coordinator(self):
-        data = self.coordinator.data
-        if not data:
-            return None
-        for dev in data:
-            if dev.get("id") == self._device_id:
-                return dev
-        return None
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Minden entitás a 'all_in_one' device-hoz tartozik."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, "all_in_one")},
-            name="SINUM All-in-One",
-            manufacturer="SINUM",
-            model="Thermostat Integration"
-        )
-
-
-class SbusWtpBase(CoordinatorEntity, SensorEntity):
+class SbusWtpBase(SinumEntity, SensorEntity):
     """
     Alap osztály az SBUS/WTP eszközök szenzoraihoz:
     - 'temperature_sensor', 'humidity_sensor', 'light_sensor', stb.
     """
 
     def __init__(self, coordinator, device, base_name):
-        super().__init__(coordinator)
+        super().__init__(coordinator, device)
         self._device = device
-        self._device_id = f"{device.get('class')}_{device.get('id')}"  # Egyedi azonosító: class_id
+        self._unique_key = f"{self._device_class}_{self._device_id}"  # Egyedi azonosító: class_id
         self._base_name = base_name
 
-    def _find_device_in_coordinator(self):
-        data = self.coordinator.data
-        if not data:
-            return None
-        for dev in data:
-            unique_id = f"{dev.get('class')}_{dev.get('id')}"
-            if unique_id == self._device_id:
-                return dev
-        return None
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Szintén a 'all_in_one' device-hoz soroljuk."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, "all_in_one")},
-            name="SINUM All-in-One",
-            manufacturer="SINUM",
-            model="SBUS/WTP Integration"
-        )
-
 
 #----------------------------------------------------------------
 #                  THERMOSTAT SENSOR ENTITIES
@@ -231,9 +160,9 @@ class ThermostatTempSensor(ThermostatBase):
     def __init__(self, coordinator, device, base_name):
         super().__init__(coordinator, device, base_name)
         self._attr_name = f"{base_name}_temp"
-        self._attr_unique_id = f"{DOMAIN}_{self._device_id}_temp"
+        self._set_unique_id("temp", legacy=f"{DOMAIN}_{self._device_id}_temp")
 
-    @property
+    @snapshot_property
     def native_value(self):
         dev = self._find_device_in_coordinator()
         if not dev:
@@ -251,9 +180,9 @@ class ThermostatHumiditySensor(ThermostatBase):
     def __init__(self, coordinator, device, base_name):
         super().__init__(coordinator, device, base_name)
         self._attr_name = f"{base_name}_humidity"
-        self._attr_unique_id = f"{DOMAIN}_{self._device_id}_humidity"
+        self._set_unique_id("humidity", legacy=f"{DOMAIN}_{self._device_id}_humidity")
 
-    @property
+    @snapshot_property
     def native_value(self):
         dev = self._find_device_in_coordinator()
         if not dev:
@@ -270,9 +199,9 @@ class ThermostatModeSensor(ThermostatBase):
     def __init__(self, coordinator, device, base_name):
         super().__init__(coordinator, device, base_name)
         self._attr_name = f"{base_name}_mode"
-        self._attr_unique_id = f"{DOMAIN}_{self._device_id}_mode"
+        self._set_unique_id("mode", legacy=f"{DOMAIN}_{self._device_id}_mode")
 
-    @property
+    @snapshot_property
     def native_value(self):
         dev = self._find_device_in_coordinator()
         if not dev:
@@ -288,9 +217,9 @@ class ThermostatTempSetpointSensor(ThermostatBase):
     def __init__(self, coordinator, device, base_name):
         super().__init__(coordinator, device, base_name)
         self._attr_name = f"{base_name}_tempsetpoint"
-        self._attr_unique_id = f"{DOMAIN}_{self._device_id}_tempsetpoint"
+        self._set_unique_id("tempsetpoint", legacy=f"{DOMAIN}_{self._device_id}_tempsetpoint")
 
-    @property
+    @snapshot_property
     def native_value(self):
         dev = self._find_device_in_coordinator()
         if not dev:
@@ -317,9 +246,9 @@ class SbusWtpTemperatureSensor(SbusWtpBase):
     def __init__(self, coordinator, device, base_name):
         super().__init__(coordinator, device, base_name)
         self._attr_name = f"{base_name}_temperature"
-        self._attr_unique_id = f"{DOMAIN}_{self._device_id}_temperature"
+        self._set_unique_id("temperature", legacy=f"{DOMAIN}_{self._unique_key}_temperature")
 
-    @property
+    @snapshot_property
     def native_value(self):
         dev = self._find_device_in_coordinator()
         if not dev:
@@ -342,9 +271,9 @@ class SbusWtpHumiditySensor(SbusWtpBase):
     def __init__(self, coordinator, device, base_name):
         super().__init__(coordinator, device, base_name)
         self._attr_name = f"{base_name}_humidity"
-        self._attr_unique_id = f"{DOMAIN}_{self._device_id}_humidity_sbuswtp"
+        self._set_unique_id("humidity_sbuswtp", legacy=f"{DOMAIN}_{self._unique_key}_humidity_sbuswtp")
 
-    @property
+    @snapshot_property
     def native_value(self):
         dev = self._find_device_in_coordinator()
         if not dev:
@@ -362,14 +291,14 @@ class SbusWtpLightSensor(SbusWtpBase):
     def __init__(self, coordinator, device, base_name):
         super().__init__(coordinator, device, base_name)
         self._attr_name = f"{base_name}_light"
-        self._attr_unique_id = f"{DOMAIN}_{self._device_id}_light"
+        self._set_unique_id("light", legacy=f"{DOMAIN}_{self._unique_key}_light")
 
     @staticmethod
     def debug_device(dev):
         """Log the entire device object for debugging."""
         _LOGGER.debug(f"Light Sensor Device Data: {dev}")
 
-    @property
+    @snapshot_property
     def native_value(self):
         dev = self._find_device_in_coordinator()
         if not dev:
@@ -397,13 +326,14 @@ class BatterySensor(SbusWtpBase):
 
     def __init__(self, coordinator, device, base_name):
         super().__init__(coordinator, device, base_name)
-        # Használjuk az 'address' és 'id' mezőket a unique_id biztosítására
+        # A korábbi unique_id az 'address' és 'id' mezőkből állt
         address = device.get("address", "unknown_address")
         device_id = device.get("id", "unknown_id")
+        self._address = address
         self._attr_name = f"{base_name}_battery"
-        self._attr_unique_id = f"{DOMAIN}_battery_{address}_{device_id}"
+        self._set_unique_id("battery", legacy=f"{DOMAIN}_battery_{address}_{device_id}")
 
-    @property
+    @snapshot_property
     def native_value(self):
         dev = self._find_device_in_coordinator()
         if not dev:
@@ -414,6 +344,200 @@ class BatterySensor(SbusWtpBase):
         return battery
 
 
+#----------------------------------------------------------------
+#                  DERIVED STATISTIC SENSOR ENTITIES
+#----------------------------------------------------------------
+
+# Statisztikázott mezők: (név utótag, eszközmező, osztó, mértékegység, device_class)
+THERMOSTAT_TEMPERATURE = ("temp", "temperature", 10.0, "°C", SensorDeviceClass.TEMPERATURE)
+THERMOSTAT_HUMIDITY = ("humidity", "humidity", 10.0, "%", SensorDeviceClass.HUMIDITY)
+SBUS_WTP_TEMPERATURE = ("temperature", "temperature", 10.0, "°C", SensorDeviceClass.TEMPERATURE)
+SBUS_WTP_HUMIDITY = ("humidity", "humidity", 10.0, "%", SensorDeviceClass.HUMIDITY)
+SBUS_WTP_ILLUMINANCE = ("light", "illuminance", 1.0, "lx", SensorDeviceClass.ILLUMINANCE)
+
+# (statisztika kulcs, érték a mező FieldHistory-jéből)
+FIELD_STATISTICS = (
+    ("trend", lambda history: history.trend_per_hour()),
+    ("avg_15m", lambda history: history.mean()),
+    ("daily_min", lambda history: history.daily_min),
+    ("daily_max", lambda history: history.daily_max),
+)
+
+
+class FieldStatisticSensor(SinumEntity, SensorEntity):
+    """
+    Egy számmező származtatott statisztikája: trend (egység / óra), 15 perces
+    átlag (a 15 perces min/max attribútumként), napi minimum és maximum.
+
+    A mező négy statisztika-szenzora közös FieldHistory gyűrűpuffert használ,
+    amit minden frissítéskor az első engedélyezett szenzor etet (a többinél a
+    generáció alapján kimarad). Alapból le vannak tiltva; amíg egyik sincs
+    engedélyezve, a mezőhöz nem tartozik puffer.
+    """
+
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, device, base_name, source, history: FieldHistory, statistic, value_fn):
+        super().__init__(coordinator, device)
+        suffix, self._field, self._divisor, unit, device_class = source
+        self._history = history
+        self._statistic = statistic
+        self._value_fn = value_fn
+        self._attr_name = f"{base_name}_{suffix}_{statistic}"
+        self._set_unique_id(f"{suffix}_{statistic}")
+        if statistic == "trend":
+            self._attr_native_unit_of_measurement = f"{unit}/h"
+        else:
+            self._attr_native_unit_of_measurement = unit
+            self._attr_device_class = device_class
+
+    @property
+    def native_value(self):
+        value = self._value_fn(self._history)
+        return None if value is None else round(value, 2)
+
+    @property
+    def extra_state_attributes(self):
+        if self._statistic != "avg_15m":
+            return None
+        return {
+            "min_15m": self._history.minimum(),
+            "max_15m": self._history.maximum(),
+            "samples": self._history.mean_samples,
+        }
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._record()
+
+    def _record(self) -> bool:
+        """A mező aktuális értéke a gyűrűpufferbe; True, ha a statisztikák változtak."""
+        snapshot = self.coordinator.data
+        if snapshot is None:
+            return False
+        dev = snapshot.find(self._device_class, self._device_id)
+        raw = dev.get(self._field) if dev else None
+        value = None if raw is None else raw / self._divisor
+        self._history.record(value, snapshot.generation, dt_util.now().date())
+        return self._history.updated == snapshot.generation
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Az átlag és a trend a mintavételtől is változik, nem csak az eszköz adataitól."""
+        if self._record():
+            self._written_available = self.available
+            self.coordinator.state_writes += 1
+            self.async_write_ha_state()
+            return
+        super()._handle_coordinator_update()
+
+
+#----------------------------------------------------------------
+#                  HUB DIAGNOSTIC SENSOR ENTITIES
+#----------------------------------------------------------------
+
+# (kulcs, mértékegység, device_class, érték a SinumAPI.metrics összesítéséből)
+HUB_COUNTER_SENSORS = (
+    ("requests", None, None, lambda totals: totals["requests"]),
+    ("messages", None, None, lambda totals: totals["messages"]),
+    ("errors", None, None, lambda totals: totals["errors"]),
+    ("timeouts", None, None, lambda totals: totals["timeouts"]),
+    ("bytes_received", UnitOfInformation.BYTES, SensorDeviceClass.DATA_SIZE, lambda totals: totals["bytes_received"]),
+)
+
+
+class HubDiagnosticBase(CoordinatorEntity, SensorEntity):
+    """
+    A hub és a hálózat teljesítményét mutató diagnosztikai szenzorok.
+    Nem egy eszközhöz tartoznak, hanem a hub API-statisztikájából olvasnak
+    (SinumAPI.metrics), ezért minden frissítéskor írnak állapotot.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator, config_entry, key):
+        super().__init__(coordinator)
+        self._attr_name = f"sinum_hub_{key}"
+        self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}_diagnostic_{key}"
+
+    @property
+    def device_info(self):
+        return self.coordinator.device_info
+
+
+class HubEndpointLatencySensor(HubDiagnosticBase):
+    """Egy lekérdezési végpont p95 késleltetése; a többi statisztika attribútumként."""
+
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, config_entry, endpoint):
+        super().__init__(coordinator, config_entry, f"{endpoint}_latency_p95")
+        self._endpoint = f"GET devices/{endpoint}"
+
+    @property
+    def native_value(self):
+        stats = self.coordinator.api.metrics.endpoints.get(self._endpoint)
+        return None if stats is None else stats.latency.as_dict()["p95_ms"]
+
+    @property
+    def extra_state_attributes(self):
+        stats = self.coordinator.api.metrics.endpoints.get(self._endpoint)
+        if stats is None:
+            return None
+        latency = stats.latency.as_dict()
+        decode = stats.decode.as_dict()
+        return {
+            "requests": stats.requests,
+            "errors": stats.errors,
+            "timeouts": stats.timeouts,
+            "p50_ms": latency["p50_ms"],
+            "p99_ms": latency["p99_ms"],
+            "max_ms": latency["max_ms"],
+            "last_response_bytes": stats.last_bytes,
+            "decode_p95_ms": decode["p95_ms"],
+            "last_error": stats.last_error,
+        }
+
+
+class HubCounterSensor(HubDiagnosticBase):
+    """Összesített kérés-, push üzenet-, hiba-, időtúllépés- és adatmennyiség-számláló."""
+
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, coordinator, config_entry, key, unit, device_class, value_fn):
+        super().__init__(coordinator, config_entry, key)
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._value_fn = value_fn
+
+    @property
+    def native_value(self):
+        return self._value_fn(self.coordinator.api.metrics.totals())
+
+
+class HubBudgetUsageSensor(HubDiagnosticBase):
+    """A kérés-keret kihasználtsága az előző percben (%); a részletek attribútumként."""
+
+    _attr_native_unit_of_measurement = "%"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, config_entry):
+        super().__init__(coordinator, config_entry, "request_budget_usage")
+
+    @property
+    def native_value(self):
+        usage = self.coordinator.api.budget.usage
+        return None if usage is None else round(usage * 100, 1)
+
+    @property
+    def extra_state_attributes(self):
+        return self.coordinator.api.budget.as_dict()
+
+
 #----------------------------------------------------------------
 #                  ADDITIONAL SENSOR CLASSES IF NEEDED
 #----------------------------------------------------------------
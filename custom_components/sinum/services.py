@@ -0,0 +1,178 @@
+import asyncio
+import logging
+from contextlib import ExitStack
+
+import voluptuous as vol
+from homeassistant.components.climate import ClimateEntityFeature
+from homeassistant.components.cover import CoverEntityFeature
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.helpers import config_validation as cv
+
+from .const import BULK_COMMAND_PARALLELISM, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_BULK_COMMAND = "bulk_command"
+
+ATTR_COMMANDS = "commands"
+ATTR_ACTION = "action"
+ATTR_VALUE = "value"
+
+
+
+def _supports(feature):
+    """Ellenőrzés: az entitás támogatja-e a funkciót (mint a HA saját szolgáltatásainál)."""
+    def _validate(entity, value):
+        if not (entity.supported_features or 0) & feature:
+            return "is not supported by this entity"
+        return None
+    return _validate
+
+
+def _in_range(low, high, feature=None):
+    """Ellenőrzés: az érték az entitás tartományán belül van (low / high: szám vagy attribútumnév)."""
+    def _validate(entity, value):
+        if feature is not None and (error := _supports(feature)(entity, value)):
+            return error
+        minimum = getattr(entity, low) if isinstance(low, str) else low
+        maximum = getattr(entity, high) if isinstance(high, str) else high
+        if not minimum <= value <= maximum:
+            return f"value {value} is outside {minimum}..{maximum}"
+        return None
+    return _validate
+
+
+def _one_of(attribute):
+    """Ellenőrzés: az érték az entitás választható értékei (pl. options, hvac_modes) között van."""
+    def _validate(entity, value):
+        choices = list(getattr(entity, attribute) or ())
+        if value not in choices:
+            return f"{value} is not one of {choices}"
+        return None
+    return _validate
+
+
+# művelet -> (az entitás metódusa, a 'value' kulcsszavas argumentuma, átalakítás, ellenőrzés)
+# Az entitás metódusát közvetlenül hívjuk, ezért a HA szolgáltatásainak ellenőrzéseit
+# (támogatott funkció, min / max, választható értékek) itt végezzük el
+BULK_ACTIONS = {
+    "turn_on": ("async_turn_on", None, None, None),
+    "turn_off": ("async_turn_off", None, None, None),
+    "open": ("async_open_cover", None, None, _supports(CoverEntityFeature.OPEN)),
+    "close": ("async_close_cover", None, None, _supports(CoverEntityFeature.CLOSE)),
+    "set_position": ("async_set_cover_position", "position", int,
+                     _in_range(0, 100, CoverEntityFeature.SET_POSITION)),
+    "set_temperature": ("async_set_temperature", "temperature", float,
+                        _in_range("min_temp", "max_temp", ClimateEntityFeature.TARGET_TEMPERATURE)),
+    "set_hvac_mode": ("async_set_hvac_mode", "hvac_mode", str, _one_of("hvac_modes")),
+    "set_value": ("async_set_native_value", "value", float, _in_range("native_min_value", "native_max_value")),
+    "select_option": ("async_select_option", "option", str, _one_of("options")),
+}
+
+BULK_COMMAND_SCHEMA = vol.Schema({
+    vol.Required(ATTR_COMMANDS): vol.All(cv.ensure_list, [vol.Schema({
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Required(ATTR_ACTION): vol.In(BULK_ACTIONS),
+        vol.Optional(ATTR_VALUE): vol.Any(vol.Coerce(float), cv.string),
+    })]),
+})
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """A sinum.* szolgáltatások regisztrálása (egyszer, az összes hubra)."""
+
+    async def _async_bulk_command(call: ServiceCall) -> ServiceResponse:
+        return await async_bulk_command(hass, call.data[ATTR_COMMANDS])
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_COMMAND,
+        _async_bulk_command,
+        schema=BULK_COMMAND_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+async def async_bulk_command(hass: HomeAssistant, commands: list) -> dict:
+    """
+    Sok parancs egy hívásban (pl. minden redőny lehúzása, minden relé kikapcsolása).
+
+    A parancsok párhuzamosan futnak, egyszerre legfeljebb BULK_COMMAND_PARALLELISM
+    (a hubonkénti kérés-keret ezen felül is érvényes), így az egész nagyjából egy
+    körút ideje. Minden parancs az entitás saját metódusán megy át (optimista
+    állapot, írás-összevonás); az értékeket előtte az entitás tartománya és
+    funkciói szerint ellenőrizzük. A parancsonkénti visszaolvasás helyett a végén
+    hubonként egyetlen lekérdezés jön, csak az érintett végpontokra, gyorsítás nélkül.
+    :return: {"results": [{"entity_id", "action", "success", ("error")}, ...]}
+    """
+    entities = {
+        entity.entity_id: (coordinator, entity)
+        for coordinator in hass.data.get(DOMAIN, {}).values()
+        for entity in coordinator.device_entities()
+        if entity.entity_id is not None
+    }
+    semaphore = asyncio.Semaphore(BULK_COMMAND_PARALLELISM)
+
+    # Ellenőrzés küldés előtt; a hibás parancsok eredménye azonnal megvan
+    results = []
+    runs = []
+    touched = {}
+    for command in commands:
+        action = command[ATTR_ACTION]
+        for entity_id in command[ATTR_ENTITY_ID]:
+            result = {"entity_id": entity_id, "action": action}
+            results.append(result)
+            prepared = _prepare(entities, entity_id, action, command.get(ATTR_VALUE))
+            if isinstance(prepared, str):
+                result.update(success=False, error=prepared)
+                continue
+            coordinator, entity, method, kwargs = prepared
+            touched.setdefault(coordinator, set()).add((entity._device_class, entity._device_id))
+            runs.append((result, method, kwargs))
+
+    async def _run(result: dict, method, kwargs: dict):
+        async with semaphore:
+            try:
+                response = await method(**kwargs)
+            except Exception as e:  # egy eszköz hibája nem állítja meg a többit
+                _LOGGER.error("Bulk command %s failed for %s: %s", result["action"], result["entity_id"], e)
+                result.update(success=False, error=str(e))
+                return
+        # Az entitás metódusa a hub válaszát adja, hibánál None; az üres válasz (pl. 204) is siker
+        result["success"] = response is not None
+
+    with ExitStack() as stack:
+        for coordinator, keys in touched.items():
+            stack.enter_context(coordinator.suppress_read_backs(keys))
+        await asyncio.gather(*(_run(*run) for run in runs))
+
+    # Egyetlen megerősítő lekérdezés hubonként (nem parancsonként)
+    await asyncio.gather(*(coordinator.async_refresh_devices(keys) for coordinator, keys in touched.items()))
+
+    failed = sum(1 for result in results if not result["success"])
+    if failed:
+        _LOGGER.warning("Bulk command: %d of %d command(s) failed", failed, len(results))
+    return {"results": results}
+
+
+def _prepare(entities: dict, entity_id: str, action: str, value):
+    """
+    Egy parancs előkészítése: (koordinátor, entitás, metódus, kwargs),
+    vagy hibaüzenet, ha az entitás nem ismert, nem támogatja, vagy az érték érvénytelen.
+    """
+    method_name, argument, convert, validate = BULK_ACTIONS[action]
+    coordinator, entity = entities.get(entity_id, (None, None))
+    method = getattr(entity, method_name, None)
+    if method is None:
+        return f"{action} is not supported by this entity"
+    kwargs = {}
+    if argument is not None:
+        try:
+            value = convert(value)
+        except (TypeError, ValueError):
+            return f"{action} needs a valid value"
+        kwargs[argument] = value
+    if validate is not None and (error := validate(entity, value)):
+        return f"{action}: {error}"
+    return coordinator, entity, method, kwargs
@@ -0,0 +1,161 @@
+import itertools
+from types import MappingProxyType
+
+# Minden új pillanatkép egyedi, növekvő generációszámot kap
+_GENERATION = itertools.count(1)
+
+
+def _freeze(devices, device_class: str, overrides=None) -> tuple:
+    """
+    Az API-ból jövő listát csak olvasható eszközökké alakítja.
+    A 'class' mezőt a végpont alapján állítjuk be.
+    Az 'overrides' {(class, id): mezők} még meg nem erősített (optimista) értékeket
+    ír a friss adatok fölé.
+    """
+    frozen = []
+    for dev in devices or []:
+        if not isinstance(dev, dict):
+            continue
+        override = overrides.get((device_class, dev.get("id"))) if overrides else None
+        if override:
+            frozen.append(MappingProxyType({**dev, "class": device_class, **override}))
+        else:
+            frozen.append(MappingProxyType({**dev, "class": device_class}))
+    return tuple(frozen)
+
+
+class SinumSnapshot:
+    """
+    Egy lekérdezési ciklus megosztott, megváltoztathatatlan pillanatképe.
+
+    Minden platform entitásai ebből olvasnak. Frissítéskor új példány készül,
+    a korábbit senki nem módosítja, így a platformok között nincs versenyhelyzet.
+
+    Az index (class, id) szerint egyszer, a létrehozáskor épül (a virtuális
+    eszközök class-a 'virtual'), így az entitások keresése O(1) a korábbi
+    lineáris bejárás helyett.
+
+    A 'changed' halmaz azokat a (class, id) kulcsokat tartalmazza, amelyek
+    adatai az előző pillanatképhez képest megváltoztak (új, módosult vagy
+    eltűnt eszköz). None, ha nincs előző pillanatkép (minden "változott").
+    """
+
+    __slots__ = ("virtual", "sbus_wtp", "generation", "changed", "_index")
+
+    def __init__(self, virtual: tuple, sbus_wtp: tuple, changed: frozenset | None = None,
+                 index: dict | None = None):
+        self.virtual = virtual
+        self.sbus_wtp = sbus_wtp
+        self.generation = next(_GENERATION)
+        if index is None:
+            index = {
+                (dev.get("class"), dev.get("id")): dev
+                for dev in virtual + sbus_wtp
+            }
+        self._index = index
+        self.changed = changed
+
+    @classmethod
+    def from_lists(cls, virtual, sbus, wtp, previous: "SinumSnapshot | None" = None,
+                   overrides: dict | None = None) -> "SinumSnapshot":
+        """
+        Pillanatkép a /devices/virtual, /devices/sbus és /devices/wtp válaszaiból.
+        Ha egy végpont listája None (nem kérdeztük le, vagy a lekérés sikertelen),
+        az előző pillanatkép eszközeit vesszük át változatlanul.
+        """
+        def _endpoint(devices, device_class):
+            if devices is None:
+                return previous.devices_of_class(device_class) if previous is not None else ()
+            return _freeze(devices, device_class, overrides)
+
+        snapshot = cls(
+            _endpoint(virtual, "virtual"),
+            _endpoint(sbus, "sbus") + _endpoint(wtp, "wtp"),
+        )
+        if previous is not None:
+            snapshot.changed = snapshot._diff(previous)
+        return snapshot
+
+    def to_inventory(self) -> dict:
+        """
+        A pillanatkép JSON-ba menthető alakja (eszközlista és utolsó állapot),
+        végpontonként: {"virtual": [...], "sbus": [...], "wtp": [...]}.
+        """
+        inventory = {"virtual": [], "sbus": [], "wtp": []}
+        for dev in self.virtual + self.sbus_wtp:
+            inventory.setdefault(dev.get("class"), []).append(dict(dev))
+        return inventory
+
+    @classmethod
+    def from_inventory(cls, inventory: dict) -> "SinumSnapshot":
+        """Pillanatkép a to_inventory() által mentett adatból."""
+        return cls.from_lists(inventory["virtual"], inventory["sbus"], inventory["wtp"])
+
+    def with_device_fields(self, device_class: str, device_id, fields: dict) -> "SinumSnapshot":
+        """
+        Új pillanatkép, amiben egyetlen eszköz mezői felül vannak írva
+        (pl. egy sikeres parancs után). Ha nincs mit változtatni, önmagát adja vissza.
+        """
+        return self.with_devices_fields({(device_class, device_id): fields})
+
+    def with_devices_fields(self, updates: dict) -> "SinumSnapshot":
+        """
+        Új pillanatkép, amiben több eszköz mezői felül vannak írva: {(class, id): mezők}
+        (pl. egy ütemnyi push esemény). A listákat és az indexet egyszer építjük újra,
+        akárhány eszköz változik. Ha nincs mit változtatni, önmagát adja vissza.
+        """
+        replaced = {}
+        index = None
+        for key, fields in updates.items():
+            old = self._index.get(key)
+            if old is None or all(old.get(k) == v for k, v in fields.items()):
+                continue
+            new = MappingProxyType({**old, **fields})
+            # Az eredeti eszközök élnek (self tartja őket), így az id() stabil kulcs
+            replaced[id(old)] = new
+            if index is None:
+                index = dict(self._index)
+            index[key] = new
+        if not replaced:
+            return self
+
+        def _replace(devices):
+            return tuple(replaced.get(id(dev), dev) for dev in devices)
+
+        changed = frozenset(key for key in updates if index.get(key) is not self._index.get(key))
+        return SinumSnapshot(_replace(self.virtual), _replace(self.sbus_wtp), changed, index)
+
+    def _diff(self, previous: "SinumSnapshot") -> frozenset:
+        """Az előző pillanatképhez képest megváltozott (class, id) kulcsok."""
+        old_index = previous._index
+        # Az átvett (azonos) eszközöket nem kell mezőnként összehasonlítani
+        changed = {
+            key for key, dev in self._index.items()
+            if old_index.get(key) is not dev and old_index.get(key) != dev
+        }
+        changed.update(key for key in old_index if key not in self._index)
+        return frozenset(changed)
+
+    def subset(self, keys) -> "SinumSnapshot":
+        """Pillanatkép csak a megadott (class, id) kulcsú eszközökkel, a hub sorrendjében."""
+        keys = set(keys)
+        return SinumSnapshot(
+            tuple(dev for dev in self.virtual if ("virtual", dev.get("id")) in keys),
+            tuple(dev for dev in self.sbus_wtp if (dev.get("class"), dev.get("id")) in keys),
+        )
+
+    def devices_of_class(self, device_class: str) -> tuple:
+        """Egy végpont ('virtual', 'sbus', 'wtp') eszközei."""
+        if device_class == "virtual":
+            return self.virtual
+        return tuple(dev for dev in self.sbus_wtp if dev.get("class") == device_class)
+
+    def devices_of_type(self, *types):
+        """Az adott típusú SBUS/WTP eszközök a hub sorrendjében."""
+        for dev in self.sbus_wtp:
+            if dev.get("type") in types:
+                yield dev
+
+    def find(self, device_class: str, device_id):
+        """Eszköz keresése (class, id) alapján."""
+        return self._index.get((device_class, device_id))
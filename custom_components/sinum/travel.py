@@ -0,0 +1,86 @@
+import time
+
+from .const import (
+    COVER_DEFAULT_TRAVEL_TIME,
+    COVER_MAX_TRAVEL_TIME,
+    COVER_MIN_LEARN_DISTANCE,
+    COVER_MIN_TRAVEL_TIME,
+    COVER_TRAVEL_LEARNING_RATE,
+)
+
+
+class CoverTravelModel:
+    """
+    Egy redőny mozgásmodellje: a teljes (0..100) út idejéből becsli a helyzetet
+    mozgás közben, így a felület folyamatosan frissül anélkül, hogy a hubot
+    gyakran kérdeznénk.
+
+    - A mozgás akkor indul, amikor a jelentett cél (target_opening) eltér a
+      helyzettől (current_opening); parancs után ez az optimista cél.
+    - Minden jelentett helyzetnél (lekérdezés, push, visszaolvasás) a becslést a
+      jelentett értékhez igazítjuk, és az előző igazítás óta megtett útból
+      tanulunk: a teljes út ideje exponenciálisan simított átlag
+      (COVER_TRAVEL_LEARNING_RATE), COVER_MIN..COVER_MAX_TRAVEL_TIME között.
+    - A mozgás véget ér, ha a jelentett helyzet eléri a célt (vagy nincs cél).
+    """
+
+    def __init__(self, travel_time: float = COVER_DEFAULT_TRAVEL_TIME.total_seconds(), clock=time.monotonic):
+        self._clock = clock
+        # A teljes (0..100) út ideje másodpercben, és a tanuláshoz felhasznált minták száma
+        self.travel_time = travel_time
+        self.samples = 0
+        self._position = None
+        self._since = None
+        self._target = None
+
+    @property
+    def moving(self) -> bool:
+        return self._target is not None
+
+    def observe(self, position, target) -> None:
+        """A hub által jelentett helyzet és cél."""
+        if position is None:
+            return
+        if target is None or position == target:
+            self._target = None
+            return
+        now = self._clock()
+        if self.moving and target == self._target:
+            self._learn(position, now)
+        self._position = float(position)
+        self._since = now
+        self._target = float(target)
+
+    def stop(self) -> None:
+        """A mozgás becslésének befejezése (a jelentett helyzet nem erősítette meg)."""
+        self._target = None
+
+    def _learn(self, position, now: float) -> None:
+        travelled = (position - self._position) * (1 if self._target > self._position else -1)
+        elapsed = now - self._since
+        # Csak a cél felé megtett, elég hosszú szakaszból tanulunk (a motor indulása,
+        # mérési zaj ne torzítson)
+        if travelled < COVER_MIN_LEARN_DISTANCE or elapsed <= 0:
+            return
+        sample = min(
+            COVER_MAX_TRAVEL_TIME.total_seconds(),
+            max(COVER_MIN_TRAVEL_TIME.total_seconds(), elapsed * 100 / travelled),
+        )
+        self.travel_time += COVER_TRAVEL_LEARNING_RATE * (sample - self.travel_time)
+        self.samples += 1
+
+    def estimate(self) -> float | None:
+        """A becsült helyzet most (0..100); None, ha nem mozog."""
+        if not self.moving:
+            return None
+        step = (self._clock() - self._since) * 100 / self.travel_time
+        if self._target > self._position:
+            return min(self._target, self._position + step)
+        return max(self._target, self._position - step)
+
+    def remaining(self) -> float:
+        """A cél eléréséig várhatóan hátralévő idő másodpercben (0, ha nem mozog)."""
+        position = self.estimate()
+        if position is None:
+            return 0.0
+        return abs(self._target - position) * self.travel_time / 100
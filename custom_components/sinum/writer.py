@@ -0,0 +1,96 @@
+import asyncio
+import logging
+
+from .const import MAX_IN_FLIGHT_WRITES_PER_DEVICE, WRITE_COALESCE_WINDOW
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _PendingWrite:
+    """Egy még el nem küldött, összevont írás."""
+
+    __slots__ = ("fields", "send", "future", "timer")
+
+    def __init__(self, future: asyncio.Future):
+        self.fields = {}
+        self.send = None
+        self.future = future
+        self.timer = None
+
+
+class WriteCoalescer:
+    """
+    Eszközönkénti írás-összevonó (pl. csúszka húzásakor).
+
+    - Az azonos (class, id, művelet) kulcsra érkező írásokat WRITE_COALESCE_WINDOW
+      ideig gyűjti, a mezőket összefésüli (a legutóbbi érték nyer), majd egyetlen
+      kérésként küldi el. Így pl. egy virtuális eszköz 'mode' és
+      'target_temperature' módosítása egy PATCH-be kerül.
+    - Eszközönként legfeljebb MAX_IN_FLIGHT_WRITES_PER_DEVICE kérés fut egyszerre;
+      amíg egy kérés fut, a következő írások tovább gyűlnek.
+    - Minden hívó ugyanannak az összevont kérésnek az eredményét kapja vissza.
+    """
+
+    def __init__(self, window: float = WRITE_COALESCE_WINDOW.total_seconds(),
+                 max_in_flight: int = MAX_IN_FLIGHT_WRITES_PER_DEVICE):
+        self._window = window
+        self._max_in_flight = max_in_flight
+        self._pending = {}
+        self._in_flight = {}
+        self._tasks = set()
+        # Statisztika: beérkezett írások és ténylegesen elküldött kérések
+        self.submitted = 0
+        self.sent = 0
+
+    async def submit(self, key: tuple, fields: dict, send):
+        """
+        :param key: (device_class, device_id, művelet)
+        :param fields: a módosítandó mezők
+        :param send: async függvény, ami az összefésült mezőkkel elküldi a kérést
+        :return: a send visszatérési értéke
+        """
+        loop = asyncio.get_running_loop()
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _PendingWrite(loop.create_future())
+            pending.timer = loop.call_later(self._window, self._start_flush, key)
+        pending.fields.update(fields)
+        pending.send = send
+        self.submitted += 1
+        return await asyncio.shield(pending.future)
+
+    def _start_flush(self, key: tuple):
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        task = asyncio.get_running_loop().create_task(self._flush(key, pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, key: tuple, pending: _PendingWrite):
+        device_key = key[:2]
+        semaphore = self._in_flight.get(device_key)
+        if semaphore is None:
+            semaphore = self._in_flight[device_key] = asyncio.Semaphore(self._max_in_flight)
+
+        async with semaphore:
+            self.sent += 1
+            _LOGGER.debug("Sending coalesced write %s: %s", key, pending.fields)
+            try:
+                result = await pending.send(dict(pending.fields))
+            except Exception as err:  # a hívók kapják meg a hibát
+                if not pending.future.done():
+                    pending.future.set_exception(err)
+                return
+        if not pending.future.done():
+            pending.future.set_result(result)
+
+    async def async_flush(self):
+        """Minden várakozó írás azonnali elküldése (pl. az integráció leállításakor)."""
+        for key in list(self._pending):
+            pending = self._pending.get(key)
+            if pending is not None and pending.timer is not None:
+                pending.timer.cancel()
+            self._start_flush(key)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
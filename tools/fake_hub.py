@@ -0,0 +1,426 @@
+"""
+Local fake SINUM hub for exercising the integration without hardware.
+
+Serves the same REST API as the real hub under /api/v1:
+  GET   /devices/virtual | /devices/sbus | /devices/wtp
+  PATCH /devices/{class}/{id}
+  POST  /devices/{class}/{id}/command/{command}
+and an event stream (WebSocket) at /api/v1/events that pushes every device
+change as {"class": ..., "id": ..., "data": {...}}.
+
+Every device type the integration handles is generated (thermostat, relay,
+blind_controller, rgb_controller, analog_output, pulse_width_modulation,
+temperature/humidity/light sensors, motion_sensor, two_state_input_sensor),
+in any number, so scaling problems can be reproduced offline.
+
+Fault injection (all optional):
+  --latency / --jitter   extra response delay in ms (uniform +-jitter)
+  --error-rate           share of REST requests answered with --error-status
+  --encoding             payload encoding: utf-8, utf-8-sig (BOM), cp1250, latin-1
+  --no-charset           omit the charset from Content-Type (like some firmwares)
+
+GET /_stats returns request counters; POST /_stats/reset zeroes them.
+
+Usage: python tools/fake_hub.py [--port 8080] [--devices 1000] [--latency 50]
+Then add the integration with the address "127.0.0.1:8080" and any token
+(with --token, that token).
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+from collections import Counter
+
+from aiohttp import WSMsgType, web
+
+_LOGGER = logging.getLogger("fake_hub")
+
+API_PREFIX = "/api/v1"
+
+# A hub által ismert eszköztípusok és osztályuk (virtual / sbus+wtp)
+VIRTUAL_TYPES = ("thermostat",)
+SBUS_WTP_TYPES = (
+    "relay",
+    "blind_controller",
+    "rgb_controller",
+    "analog_output",
+    "pulse_width_modulation",
+    "temperature_sensor",
+    "humidity_sensor",
+    "light_sensor",
+    "motion_sensor",
+    "two_state_input_sensor",
+)
+DEVICE_TYPES = VIRTUAL_TYPES + SBUS_WTP_TYPES
+
+# Ékezetes nevek, hogy a nem UTF-8 kódolások is kipróbálhatók legyenek
+_ROOMS = ("Nappali", "Hálószoba", "Fürdő", "Előszoba", "Gyerekszoba", "Konyha", "Dolgozószoba", "Kert")
+
+# Az analog_output csak sbus-on érhető el (lásd SinumAPI.set_analog_output_value)
+_SBUS_ONLY = {"analog_output"}
+
+
+def _make_device(device_type: str, device_id: int, rng: random.Random) -> dict:
+    room = rng.choice(_ROOMS)
+    dev = {"id": device_id, "type": device_type, "name": f"{room} {device_type} {device_id}"}
+    if device_type == "thermostat":
+        dev.update(
+            temperature=rng.randint(170, 260),
+            humidity=rng.randint(300, 650),
+            target_temperature=rng.randint(180, 240),
+            target_temperature_minimum=50,
+            target_temperature_maximum=350,
+            mode=rng.choice(("off", "heating", "cooling")),
+        )
+    elif device_type == "relay":
+        dev["state"] = rng.random() < 0.3
+    elif device_type == "blind_controller":
+        opening = rng.choice((0, 25, 50, 100))
+        dev.update(current_opening=opening, target_opening=opening)
+    elif device_type == "rgb_controller":
+        dev.update(
+            state=rng.random() < 0.5,
+            brightness=rng.randint(1, 100),
+            led_color="#%06x" % rng.randrange(0x1000000),
+            white_temperature=rng.choice((2700, 4000, 6500)),
+            color_mode=rng.choice(("rgb", "temperature")),
+            led_strip_type=rng.choice(("rgb", "rgbw", "rgbww")),
+        )
+    elif device_type == "analog_output":
+        dev.update(value=rng.randint(0, 10000), value_minimum=0, value_maximum=10000, unit="V")
+    elif device_type == "pulse_width_modulation":
+        dev["duty_cycle"] = rng.randint(0, 1000)
+    elif device_type == "temperature_sensor":
+        dev["temperature"] = rng.randint(150, 280)
+    elif device_type == "humidity_sensor":
+        dev["humidity"] = rng.randint(300, 700)
+    elif device_type == "light_sensor":
+        dev["illuminance"] = rng.randint(0, 2000)
+    elif device_type == "motion_sensor":
+        dev["motion_detected"] = False
+    elif device_type == "two_state_input_sensor":
+        dev["state"] = rng.random() < 0.5
+
+    # Vezeték nélküli érzékelők: elem és cím (akkumulátor-szenzorhoz)
+    if device_type.endswith("_sensor"):
+        dev.update(battery=rng.randint(5, 100), address=f"{device_id:06x}", software_version=f"1.{device_id % 10}")
+    return dev
+
+
+def generate_devices(count: int, seed: int = 0) -> dict:
+    """
+    'count' eszköz, a típusok között egyenletesen elosztva.
+    A thermostatok a virtual, a többi típus felváltva az sbus/wtp osztályba kerül.
+    :return: {"virtual": {id: dev}, "sbus": {...}, "wtp": {...}}
+    """
+    rng = random.Random(seed)
+    devices = {"virtual": {}, "sbus": {}, "wtp": {}}
+    next_id = {"virtual": 1, "sbus": 1, "wtp": 1}
+    for n in range(count):
+        device_type = DEVICE_TYPES[n % len(DEVICE_TYPES)]
+        if device_type in VIRTUAL_TYPES:
+            device_class = "virtual"
+        elif device_type in _SBUS_ONLY:
+            device_class = "sbus"
+        else:
+            device_class = "sbus" if (n // len(DEVICE_TYPES)) % 2 == 0 else "wtp"
+        device_id = next_id[device_class]
+        next_id[device_class] += 1
+        devices[device_class][device_id] = _make_device(device_type, device_id, rng)
+    return devices
+
+
+# Parancs -> (állapotmező, átalakítás a kérés törzséből)
+_COMMAND_FIELDS = {
+    "set_value": "value",
+    "set_duty_cycle": "duty_cycle",
+    "set_brightness": "brightness",
+    "set_color": "led_color",
+    "set_temperature": "white_temperature",
+}
+
+
+class FakeHub:
+    """In-memory device store + aiohttp application."""
+
+    def __init__(
+        self,
+        devices=None,
+        *,
+        token: str | None = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        encoding: str = "utf-8",
+        send_charset: bool = True,
+        event_interval: float = 5.0,
+        cover_speed: float = 10.0,
+        seed: int | None = None,
+    ):
+        """
+        :param devices: generate_devices() kimenete; alapból 30 eszköz
+        :param token: ha meg van adva, az Authorization fejlécet is ellenőrizzük
+                      (a SinumAPI a tokent előtag nélkül küldi)
+        :param latency: válaszkésleltetés másodpercben
+        :param jitter: a késleltetés véletlen szórása (+-) másodpercben
+        :param error_rate: a REST kérések ekkora hányada 'error_status' hibát kap
+        :param encoding: a JSON válaszok kódolása
+        :param send_charset: küldjünk-e charset-et a Content-Type-ban
+        :param event_interval: spontán szenzorváltozások gyakorisága (0 = kikapcsolva)
+        :param cover_speed: redőny mozgási sebessége százalék / másodpercben
+        """
+        self.devices = devices if devices is not None else generate_devices(30)
+        self.token = token
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.encoding = encoding
+        self.send_charset = send_charset
+        self.event_interval = event_interval
+        self.cover_speed = cover_speed
+        self._rng = random.Random(seed)
+        self._subscribers = set()
+        self._tasks = set()
+        self._movers = {}
+        self.stats = Counter()
+
+        self.app = web.Application(middlewares=[self._fault_middleware])
+        self.app.add_routes([
+            web.get(f"{API_PREFIX}/devices/{{cls}}", self.handle_list),
+            web.get(f"{API_PREFIX}/devices/{{cls}}/{{id}}", self.handle_get),
+            web.patch(f"{API_PREFIX}/devices/{{cls}}/{{id}}", self.handle_patch),
+            web.post(f"{API_PREFIX}/devices/{{cls}}/{{id}}/command/{{command}}", self.handle_command),
+            web.get(f"{API_PREFIX}/events", self.handle_events),
+            web.get("/_stats", self.handle_stats),
+            web.post("/_stats/reset", self.handle_stats_reset),
+        ])
+        self.app.on_startup.append(self._on_startup)
+        self.app.on_cleanup.append(self._on_cleanup)
+
+    @property
+    def device_count(self) -> int:
+        return sum(len(devices) for devices in self.devices.values())
+
+    # ---------- életciklus ----------
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> web.AppRunner:
+        """Indítás a futó event loopban (benchmarkokhoz); a 'port' 0 esetén szabad portot kap."""
+        runner = web.AppRunner(self.app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        self.address = f"{host}:{self.port}"
+        return runner
+
+    async def _on_startup(self, app):
+        if self.event_interval > 0:
+            self._spawn(self._sensor_loop())
+
+    async def _on_cleanup(self, app):
+        for task in list(self._tasks):
+            task.cancel()
+        for ws in list(self._subscribers):
+            await ws.close()
+
+    def _spawn(self, coro):
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    # ---------- hibainjektálás ----------
+
+    @web.middleware
+    async def _fault_middleware(self, request, handler):
+        if not request.path.startswith(API_PREFIX):
+            return await handler(request)
+
+        self.stats["requests"] += 1
+        resource = request.match_info.route.resource
+        self.stats[f"{request.method} {resource.canonical if resource else request.path}"] += 1
+
+        if self.token is not None and request.headers.get("Authorization") != self.token:
+            self.stats["unauthorized"] += 1
+            raise web.HTTPUnauthorized()
+
+        delay = self.latency + self._rng.uniform(-self.jitter, self.jitter) if self.jitter else self.latency
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self.error_rate and request.path != f"{API_PREFIX}/events" and self._rng.random() < self.error_rate:
+            self.stats["injected_errors"] += 1
+            return web.Response(status=self.error_status, text="injected error")
+        return await handler(request)
+
+    def _json(self, payload) -> web.Response:
+        body = json.dumps(payload, ensure_ascii=False).encode(self.encoding)
+        content_type = "application/json"
+        if self.send_charset:
+            # A BOM-os változatot is utf-8-ként hirdeti a hub
+            content_type += "; charset=" + ("utf-8" if self.encoding == "utf-8-sig" else self.encoding)
+        return web.Response(body=body, headers={"Content-Type": content_type})
+
+    # ---------- REST ----------
+
+    def _device(self, request):
+        try:
+            return self.devices[request.match_info["cls"]][int(request.match_info["id"])]
+        except (KeyError, ValueError):
+            raise web.HTTPNotFound()
+
+    async def handle_list(self, request):
+        devices = self.devices.get(request.match_info["cls"])
+        if devices is None:
+            raise web.HTTPNotFound()
+        return self._json({"data": list(devices.values())})
+
+    async def handle_get(self, request):
+        return self._json({"data": self._device(request)})
+
+    async def handle_patch(self, request):
+        dev = self._device(request)
+        body = await request.json()
+        changes = {k: v for k, v in body.items() if k != "id"}
+        device_class = request.match_info["cls"]
+        if dev["type"] == "blind_controller" and "target_opening" in changes:
+            target = int(changes.pop("target_opening"))
+            if not 0 <= target <= 100:
+                raise web.HTTPUnprocessableEntity(text="target_opening out of range")
+            self.update(device_class, dev["id"], {"target_opening": target})
+            self._start_cover(device_class, dev["id"])
+        if changes:
+            self.update(device_class, dev["id"], changes)
+        return self._json({"data": dev})
+
+    async def handle_command(self, request):
+        dev = self._device(request)
+        command = request.match_info["command"]
+        body = await request.json() if request.can_read_body else {}
+        if command == "turn_on":
+            changes = {"state": True}
+        elif command == "turn_off":
+            changes = {"state": False}
+        elif command in _COMMAND_FIELDS:
+            value = body.get(command)
+            if isinstance(value, list):
+                value = value[0] if value else None
+            if value is None:
+                raise web.HTTPUnprocessableEntity(text=f"missing '{command}' in body")
+            changes = {_COMMAND_FIELDS[command]: value}
+            if command == "set_temperature":
+                changes["color_mode"] = "temperature"
+            elif command == "set_color":
+                changes["color_mode"] = "rgb"
+        else:
+            raise web.HTTPUnprocessableEntity(text=f"unknown command {command}")
+        self.update(request.match_info["cls"], dev["id"], changes)
+        return self._json({"data": dev})
+
+    async def handle_stats(self, request):
+        return web.json_response({"devices": self.device_count, "subscribers": len(self._subscribers), **self.stats})
+
+    async def handle_stats_reset(self, request):
+        self.stats.clear()
+        return web.json_response({})
+
+    # ---------- események ----------
+
+    async def handle_events(self, request):
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        self._subscribers.add(ws)
+        try:
+            async for msg in ws:
+                if msg.type == WSMsgType.ERROR:
+                    break
+        finally:
+            self._subscribers.discard(ws)
+        return ws
+
+    def update(self, device_class: str, device_id: int, changes: dict):
+        """Apply a change and push it to every event subscriber."""
+        dev = self.devices[device_class][device_id]
+        changes = {k: v for k, v in changes.items() if dev.get(k) != v}
+        if not changes:
+            return
+        dev.update(changes)
+        self.stats["events"] += 1
+        if self._subscribers:
+            message = json.dumps({"class": device_class, "id": device_id, "data": changes})
+            for ws in list(self._subscribers):
+                self._spawn(ws.send_str(message))
+
+    def _start_cover(self, device_class: str, device_id: int):
+        key = (device_class, device_id)
+        if key not in self._movers or self._movers[key].done():
+            self._movers[key] = self._spawn(self._move_cover(device_class, device_id))
+
+    async def _move_cover(self, device_class: str, device_id: int):
+        """A redőny 'cover_speed' %/s sebességgel halad a cél felé, 0,5 s-onként frissítve."""
+        dev = self.devices[device_class][device_id]
+        step = max(1, round(self.cover_speed / 2))
+        while dev["current_opening"] != dev["target_opening"]:
+            await asyncio.sleep(0.5)
+            current, target = dev["current_opening"], dev["target_opening"]
+            new = min(target, current + step) if target > current else max(target, current - step)
+            self.update(device_class, device_id, {"current_opening": new})
+
+    async def _sensor_loop(self):
+        """Spontán változások: mozgás, kétállapotú bemenetek, hőmérséklet-sodródás."""
+        while True:
+            await asyncio.sleep(self.event_interval)
+            for device_class, devices in self.devices.items():
+                for dev in devices.values():
+                    device_type = dev["type"]
+                    if self._rng.random() >= 0.2:
+                        continue
+                    if device_type == "motion_sensor":
+                        self.update(device_class, dev["id"], {"motion_detected": not dev["motion_detected"]})
+                    elif device_type == "two_state_input_sensor":
+                        self.update(device_class, dev["id"], {"state": not dev["state"]})
+                    elif device_type in ("temperature_sensor", "thermostat"):
+                        self.update(device_class, dev["id"], {"temperature": dev["temperature"] + self._rng.choice((-1, 1))})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake SINUM hub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--devices", type=int, default=30, help="number of devices, spread over every type")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--token", help="require this token in the Authorization header")
+    parser.add_argument("--latency", type=float, default=0.0, help="response delay in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random +- delay in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of failing requests (0..1)")
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--encoding", default="utf-8", choices=("utf-8", "utf-8-sig", "cp1250", "cp1252", "latin-1"))
+    parser.add_argument("--no-charset", action="store_true", help="omit charset from Content-Type")
+    parser.add_argument("--event-interval", type=float, default=5.0,
+                        help="seconds between spontaneous sensor changes (0 = off)")
+    parser.add_argument("--cover-speed", type=float, default=10.0, help="blind travel speed in %%/s")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    hub = FakeHub(
+        generate_devices(args.devices, args.seed),
+        token=args.token,
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        encoding=args.encoding,
+        send_charset=not args.no_charset,
+        event_interval=args.event_interval,
+        cover_speed=args.cover_speed,
+        seed=args.seed,
+    )
+    _LOGGER.info("Serving %d devices on http://%s:%d%s", hub.device_count, args.host, args.port, API_PREFIX)
+    web.run_app(hub.app, host=args.host, port=args.port, access_log=None)
+
+
+if __name__ == "__main__":
+    main()